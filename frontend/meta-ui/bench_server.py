@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Concurrent page load benchmark for the frontend static server.
+
+Starts the previous server (socketserver.TCPServer + SimpleHTTPRequestHandler,
+one connection at a time, HTTP/1.0) and server.py, each in its own process,
+then has N simulated users load pages at the same time. A page load fetches
+the HTML page and every local script/stylesheet it references over one
+connection, as a browser would (reconnecting when the server closes it).
+
+Reports page loads per second and p50/p95/p99 page load time per server,
+for first visits and for repeat visits (If-None-Match revalidation).
+
+Usage:
+    python bench_server.py [--users 50] [--loads 20] [--directory public]
+"""
+
+import argparse
+import http.client
+import http.server
+import multiprocessing
+import os
+import re
+import socket
+import socketserver
+import threading
+import time
+
+from server import DIRECTORY, REWRITES, make_server
+
+PAGES = ("/", "/jobs.html", "/login", "/dashboard.html", "/admin-dashboard.html")
+ASSET_REFERENCE = re.compile(r'(?:src|href)=["\'](assets/[^"\'?#]+)')
+
+
+def serve_legacy(port, directory):
+    """The server as it was: single-threaded TCPServer, SimpleHTTPRequestHandler"""
+
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=directory, **kwargs)
+
+        def do_GET(self):
+            self.path = REWRITES.get(self.path, self.path)
+            return http.server.SimpleHTTPRequestHandler.do_GET(self)
+
+        def log_message(self, format, *args):
+            pass
+
+    with socketserver.TCPServer(("127.0.0.1", port), Handler) as httpd:
+        httpd.serve_forever()
+
+
+def serve_current(port, directory):
+    with make_server(port, directory, "127.0.0.1", quiet=True) as httpd:
+        httpd.serve_forever()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def page_assets(directory):
+    """Local assets referenced by each page"""
+    assets = {}
+    for page in PAGES:
+        path = REWRITES.get(page, page).lstrip("/")
+        with open(os.path.join(directory, path), encoding="utf-8") as f:
+            assets[page] = ["/" + asset for asset in dict.fromkeys(ASSET_REFERENCE.findall(f.read()))]
+    return assets
+
+
+def run_users(port, assets, users, loads, revalidate):
+    """Every user loads `loads` pages; returns (page load times in ms, errors)"""
+    times, errors = [], []
+    lock = threading.Lock()
+    barrier = threading.Barrier(users)
+
+    def user(index):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        etags = {}
+        barrier.wait()
+        for load in range(loads):
+            page = PAGES[(index + load) % len(PAGES)]
+            start = time.perf_counter()
+            try:
+                for path in [page] + assets[page]:
+                    headers = {"Accept-Encoding": "gzip"}
+                    if revalidate and path in etags:
+                        headers["If-None-Match"] = etags[path]
+                    connection.request("GET", path, headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                    if response.status not in (200, 304):
+                        raise RuntimeError(f"{path}: HTTP {response.status}")
+                    if response.getheader("ETag"):
+                        etags[path] = response.getheader("ETag")
+            except Exception as e:  # connection resets under load count as failed loads
+                connection.close()
+                with lock:
+                    errors.append(repr(e))
+                continue
+            with lock:
+                times.append((time.perf_counter() - start) * 1000)
+        connection.close()
+
+    threads = [threading.Thread(target=user, args=(index,)) for index in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return times, errors
+
+
+def percentile(values, fraction):
+    return values[min(int(len(values) * fraction), len(values) - 1)] if values else float("nan")
+
+
+def bench(name, target, args, assets):
+    port = free_port()
+    process = multiprocessing.Process(target=target, args=(port, args.directory), daemon=True)
+    process.start()
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+
+    try:
+        for label, revalidate in (("first visit", False), ("repeat visit", True)):
+            start = time.perf_counter()
+            times, errors = run_users(port, assets, args.users, args.loads, revalidate)
+            elapsed = time.perf_counter() - start
+            times.sort()
+            print(f"  {name:<8} {label:<13} {len(times) / elapsed:8.0f} pages/s   p50 {percentile(times, 0.50):7.1f} ms   "
+                  f"p95 {percentile(times, 0.95):7.1f} ms   p99 {percentile(times, 0.99):7.1f} ms   errors {len(errors)}")
+    finally:
+        process.terminate()
+        process.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent page loads against the static server")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--loads", type=int, default=20, help="page loads per user")
+    parser.add_argument("--directory", default=DIRECTORY)
+    args = parser.parse_args()
+
+    assets = page_assets(args.directory)
+    requests = sum(1 + len(assets[page]) for page in PAGES) / len(PAGES)
+    print(f"🚀 {args.users} users x {args.loads} page loads (~{requests:.1f} requests per page) from {args.directory}")
+    bench("legacy", serve_legacy, args, assets)
+    bench("server", serve_current, args, assets)
+
+
+if __name__ == "__main__":
+    main()
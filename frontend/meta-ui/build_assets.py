@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Build the Meta Portal frontend for production.
+
+Copies public/ to dist/ and:
+1. Gives every JS and CSS file under assets/ a content-hashed name
+   (admin-dashboard.js -> admin-dashboard.1a2b3c4d5e.js) and points the HTML
+   pages at it, so those files can be cached forever (Cache-Control:
+   immutable) and a changed file gets a new URL.
+2. Precompresses text files with gzip and, when the brotli package is
+   installed, Brotli at maximum level (file.js.gz / file.js.br), so the
+   server sends them without compressing on every request.
+3. Writes manifest.json (original path -> hashed path).
+
+Serve the result with FRONTEND_DIR=frontend/meta-ui/dist for the API server,
+or python server.py --directory dist. Re-run after editing public/.
+
+Usage:
+    python build_assets.py [--src public] [--out dist]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+
+try:
+    import brotli
+except ImportError:  # optional: gzip variants only
+    brotli = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Files given content-hashed names
+HASHED_EXTENSIONS = (".js", ".css")
+
+# Files precompressed (when at least MIN_SIZE bytes)
+COMPRESSIBLE_EXTENSIONS = (".html", ".css", ".js", ".json", ".svg", ".txt", ".xml")
+MIN_SIZE = 1024
+
+# src="assets/js/app.js?v=1.2" / href="assets/css/theme.css"
+ASSET_REFERENCE = re.compile(r'((?:src|href)=["\'])(assets/[^"\'?#]+)(?:\?[^"\'#]*)?(["\'])')
+
+
+def hash_assets(out_dir):
+    """Copy hashed JS/CSS files next to the originals; returns {original: hashed} relative paths"""
+    manifest = {}
+    for root, _, files in os.walk(os.path.join(out_dir, "assets")):
+        for name in sorted(files):
+            stem, extension = os.path.splitext(name)
+            if extension not in HASHED_EXTENSIONS:
+                continue
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()[:10]
+            hashed_path = os.path.join(root, f"{stem}.{digest}{extension}")
+            shutil.copy2(path, hashed_path)
+            manifest[os.path.relpath(path, out_dir).replace(os.sep, "/")] = \
+                os.path.relpath(hashed_path, out_dir).replace(os.sep, "/")
+    return manifest
+
+
+def rewrite_references(out_dir, manifest):
+    """Point HTML pages at hashed asset names (dropping ?v= cache busters)"""
+    rewritten = 0
+    for name in os.listdir(out_dir):
+        if not name.endswith(".html"):
+            continue
+        path = os.path.join(out_dir, name)
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+
+        def replace(match):
+            hashed = manifest.get(match.group(2))
+            return f"{match.group(1)}{hashed}{match.group(3)}" if hashed else match.group(0)
+
+        updated = ASSET_REFERENCE.sub(replace, html)
+        if updated != html:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(updated)
+            rewritten += 1
+    return rewritten
+
+
+def precompress(out_dir):
+    """Write .gz (and .br) variants that are smaller than the original; returns (files, bytes before, bytes after)"""
+    files, before, after = 0, 0, 0
+    for root, _, names in os.walk(out_dir):
+        for name in names:
+            if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                data = f.read()
+            if len(data) < MIN_SIZE:
+                continue
+
+            variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                variants[".br"] = brotli.compress(data, quality=11)
+            smallest = len(data)
+            for suffix, compressed in variants.items():
+                if len(compressed) < len(data):
+                    with open(path + suffix, "wb") as f:
+                        f.write(compressed)
+                    smallest = min(smallest, len(compressed))
+            files += 1
+            before += len(data)
+            after += smallest
+    return files, before, after
+
+
+def build(src_dir, out_dir):
+    if os.path.exists(out_dir):
+        shutil.rmtree(out_dir)
+    shutil.copytree(src_dir, out_dir, ignore=shutil.ignore_patterns("*.backup"))
+
+    manifest = hash_assets(out_dir)
+    rewritten = rewrite_references(out_dir, manifest)
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    files, before, after = precompress(out_dir)
+
+    print(f"✅ {len(manifest)} assets hashed, {rewritten} pages updated")
+    print(f"✅ {files} files precompressed ({'br + gzip' if brotli else 'gzip'}): "
+          f"{before / 1024:.0f} KB -> {after / 1024:.0f} KB")
+    print(f"\n🎉 Built {out_dir}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build hashed, precompressed frontend assets")
+    parser.add_argument("--src", default=os.path.join(BASE_DIR, "public"))
+    parser.add_argument("--out", default=os.path.join(BASE_DIR, "dist"))
+    args = parser.parse_args()
+    build(args.src, args.out)
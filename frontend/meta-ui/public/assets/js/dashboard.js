@@ -64,14 +64,10 @@ async function loadApplications() {
   emptyState.style.display = 'none';
   
   try {
-    const response = await fetch('http://localhost:8000/api/applications/me', {
-      headers: {
-        'Authorization': `Bearer ${token}`
-      }
-    });
+    const { response, applications } = await fetchMyApplications();
     
     if (response.ok) {
-      allApplications = await response.json();
+      allApplications = applications;
       
       if (allApplications.length === 0) {
         loadingState.style.display = 'none';
@@ -101,6 +97,30 @@ async function loadApplications() {
   }
 }
 
+// Fetch every page of the user's applications
+// (the API returns one page at a time; X-Total-Count has the total)
+async function fetchMyApplications() {
+  const pageSize = 200;
+  let applications = [];
+  while (true) {
+    const response = await fetch(`http://localhost:8000/api/applications/me?limit=${pageSize}&offset=${applications.length}`, {
+      headers: {
+        'Authorization': `Bearer ${token}`
+      }
+    });
+    if (!response.ok) {
+      return { response, applications };
+    }
+    
+    const page = await response.json();
+    applications = applications.concat(page);
+    const total = parseInt(response.headers.get('X-Total-Count'), 10);
+    if (page.length < pageSize || !(applications.length < total)) {
+      return { response, applications };
+    }
+  }
+}
+
 // Update statistics
 function updateStatistics() {
   const total = allApplications.length;
@@ -72,17 +72,28 @@ async function fetchApplicationsFromAPI() {
       return [];
     }
     
-    const res = await fetch(`${API_BASE}/applications/me`, {
-      headers: { 'Authorization': `Bearer ${token}` }
-    });
-    
-    if (res.ok) {
-      allApplications = await res.json();
-      return allApplications;
-    } else {
-      console.error('Failed to fetch applications:', res.status);
-      return [];
+    // The API returns one page at a time; X-Total-Count has the total
+    const pageSize = 200;
+    let applications = [];
+    while (true) {
+      const res = await fetch(`${API_BASE}/applications/me?limit=${pageSize}&offset=${applications.length}`, {
+        headers: { 'Authorization': `Bearer ${token}` }
+      });
+      
+      if (!res.ok) {
+        console.error('Failed to fetch applications:', res.status);
+        return [];
+      }
+      
+      const page = await res.json();
+      applications = applications.concat(page);
+      const total = parseInt(res.headers.get('X-Total-Count'), 10);
+      if (page.length < pageSize || !(applications.length < total)) {
+        break;
+      }
     }
+    allApplications = applications;
+    return allApplications;
   } catch (error) {
     console.error('Network error fetching applications:', error);
     return [];
@@ -124,7 +124,8 @@ function populateForm(user) {
 // Load application count
 async function loadApplicationCount() {
   try {
-    const response = await fetch('http://localhost:8000/api/applications/me', {
+    // One row is enough: X-Total-Count has the number across all pages
+    const response = await fetch('http://localhost:8000/api/applications/me?limit=1', {
       headers: {
         'Authorization': `Bearer ${token}`
       }
@@ -132,8 +133,8 @@ async function loadApplicationCount() {
     
     if (response.ok) {
       const applications = await response.json();
-      document.getElementById('applicationCount').textContent = applications.length;
-      document.getElementById('applicationCount').textContent = applications.length;
+      const total = response.headers.get('X-Total-Count');
+      document.getElementById('applicationCount').textContent = total !== null ? total : applications.length;
     }
   } catch (error) {
     // Silently fail - application count is not critical
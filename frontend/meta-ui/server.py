@@ -1,23 +1,221 @@
+#!/usr/bin/env python3
+"""
+Static server for the Meta Portal frontend.
+
+Serves public/ (or a build_assets.py dist/) with:
+- one thread per connection and HTTP/1.1 keep-alive (idle connections are
+  closed after KEEP_ALIVE_TIMEOUT seconds)
+- small files from an in-memory cache, larger ones with sendfile (zero-copy)
+- ETag / Last-Modified validation, answered with 304 when unchanged
+- precompressed .br / .gz variants for clients that accept them, and
+  Cache-Control: immutable for content-hashed names (name.<hash>.ext)
+- the /register and /login rewrites, and a 301 to the trailing-slash URL
+  for directories requested without one
+
+Usage:
+    python server.py [--port 8080] [--directory public] [--quiet]
+"""
+
+import argparse
+import email.utils
 import http.server
-import socketserver
 import os
+import re
+import stat
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit
 
 PORT = 8080
-DIRECTORY = "public"
+DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "public")
+
+# Pretty URLs
+REWRITES = {
+    "/": "/index.html",
+    "/register": "/register.html",
+    "/register/": "/register.html",
+    "/login": "/login.html",
+    "/login/": "/login.html",
+}
+
+KEEP_ALIVE_TIMEOUT = 15  # seconds
+CACHE_MAX_FILE_SIZE = 64 * 1024  # larger files are sent with sendfile
+CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+HASHED_FILENAME = re.compile(r"\.[0-9a-f]{8,}\.[A-Za-z0-9]+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Precompressed variant suffix per Content-Encoding, preferred first
+VARIANT_SUFFIXES = (("br", ".br"), ("gzip", ".gz"))
+
+
+class FileCache:
+    """Contents of small files, reloaded when their mtime or size changes (LRU)"""
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._files = OrderedDict()  # path -> (mtime_ns, size, data)
+        self._lock = threading.Lock()
+
+    def read(self, path, stat_result):
+        key = (stat_result.st_mtime_ns, stat_result.st_size)
+        with self._lock:
+            cached = self._files.get(path)
+            if cached and cached[:2] == key:
+                self._files.move_to_end(path)
+                return cached[2]
+
+        with open(path, "rb") as f:
+            data = f.read()
+
+        with self._lock:
+            previous = self._files.pop(path, None)
+            if previous:
+                self.size -= len(previous[2])
+            self._files[path] = key + (data,)
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, (_, _, evicted) = self._files.popitem(last=False)
+                self.size -= len(evicted)
+        return data
+
+
+class StaticHandler(http.server.SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    timeout = KEEP_ALIVE_TIMEOUT
+    disable_nagle_algorithm = True
+    cache = FileCache()
+    quiet = False
 
-class Handler(http.server.SimpleHTTPRequestHandler):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, directory=DIRECTORY, **kwargs)
-    
     def do_GET(self):
-        if self.path == '/':
-            self.path = '/index.html'
-        elif self.path == '/register' or self.path == '/register/':
-            self.path = '/register.html'
-        elif self.path == '/login' or self.path == '/login/':
-            self.path = '/login.html'
-        return http.server.SimpleHTTPRequestHandler.do_GET(self)
-
-with socketserver.TCPServer(("", PORT), Handler) as httpd:
-    print(f"Serving at http://localhost:{PORT}")
-    httpd.serve_forever()
\ No newline at end of file
+        self.serve(send_body=True)
+
+    def do_HEAD(self):
+        self.serve(send_body=False)
+
+    def serve(self, send_body):
+        parts = urlsplit(self.path)
+        path = REWRITES.get(parts.path, parts.path)
+        full_path = self.translate_path(path)
+        stat_result = _stat(full_path)
+
+        if stat_result is not None and stat.S_ISDIR(stat_result.st_mode):
+            if not path.endswith("/"):
+                # Same as SimpleHTTPRequestHandler: relative links need the slash
+                self.send_response(301)
+                self.send_header("Location", urlunsplit(parts._replace(path=parts.path + "/")))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            full_path = os.path.join(full_path, "index.html")
+            stat_result = _stat(full_path)
+        if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+            self.send_error(404, "File not found")
+            return
+
+        encoding, served_path, served_stat = None, full_path, stat_result
+        accepted = self.headers.get("Accept-Encoding", "")
+        has_variants = False
+        for name, suffix in VARIANT_SUFFIXES:
+            variant_stat = _stat(full_path + suffix)
+            if variant_stat is None:
+                continue
+            has_variants = True
+            if encoding is None and _accepts(accepted, name):
+                encoding, served_path, served_stat = name, full_path + suffix, variant_stat
+
+        etag = f'"{served_stat.st_mtime_ns:x}-{served_stat.st_size:x}"'
+        headers = {
+            "Content-Type": self.guess_type(full_path),
+            "ETag": etag,
+            "Last-Modified": email.utils.formatdate(served_stat.st_mtime, usegmt=True),
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL if HASHED_FILENAME.search(os.path.basename(full_path)) else REVALIDATE_CACHE_CONTROL,
+        }
+        if has_variants:
+            headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            headers["Content-Encoding"] = encoding
+
+        if self.is_not_modified(etag, served_stat):
+            self.send_response(304)
+            for name, value in headers.items():
+                if name != "Content-Type":
+                    self.send_header(name, value)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(served_stat.st_size))
+        self.end_headers()
+        if not send_body:
+            return
+
+        if served_stat.st_size <= CACHE_MAX_FILE_SIZE:
+            self.wfile.write(self.cache.read(served_path, served_stat))
+        else:
+            with open(served_path, "rb") as f:
+                self.connection.sendfile(f)  # os.sendfile where available
+
+    def is_not_modified(self, etag, stat_result):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(stat_result.st_mtime) <= since
+        return False
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def _stat(path):
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _accepts(accept_encoding, encoding):
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip() == encoding:
+            return params.strip() not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+class StaticServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # listen backlog for bursts of new connections
+
+
+def make_server(port=PORT, directory=DIRECTORY, bind="", quiet=False):
+    """A ready server (call serve_forever); port 0 picks a free one"""
+    handler = type("Handler", (StaticHandler,), {"quiet": quiet, "cache": FileCache()})
+
+    def factory(*args, **kwargs):
+        return handler(*args, directory=directory, **kwargs)
+
+    return StaticServer((bind, port), factory)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the Meta Portal frontend")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--directory", default=DIRECTORY)
+    parser.add_argument("--bind", default="")
+    parser.add_argument("--quiet", action="store_true", help="do not log requests")
+    args = parser.parse_args()
+
+    with make_server(args.port, args.directory, args.bind, args.quiet) as httpd:
+        print(f"Serving {args.directory} at http://localhost:{httpd.server_address[1]}")
+        httpd.serve_forever()
@@ -0,0 +1,74 @@
+import gzip
+import http.client
+import threading
+
+import pytest
+
+from server import IMMUTABLE_CACHE_CONTROL, make_server
+
+HASHED_SCRIPT = "app.3f2a9c1b.js"
+
+
+@pytest.fixture
+def static_server(tmp_path):
+    (tmp_path / "login.html").write_text("<h1>Login</h1>")
+    (tmp_path / HASHED_SCRIPT).write_text("console.log('app');")
+    (tmp_path / f"{HASHED_SCRIPT}.gz").write_bytes(gzip.compress(b"console.log('app');"))
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "index.html").write_text("<h1>Docs</h1>")
+
+    # Port 0: the OS picks a free one
+    server = make_server(0, str(tmp_path), bind="127.0.0.1", quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def _get(port, path, headers=None):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        connection.request("GET", path, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        connection.close()
+
+
+def test_login_rewrite_and_revalidation(static_server):
+    status, headers, body = _get(static_server, "/login")
+    assert status == 200
+    assert body == b"<h1>Login</h1>"
+    assert headers["Cache-Control"] == "no-cache"
+
+    status, _, body = _get(static_server, "/login", {"If-None-Match": headers["ETag"]})
+    assert status == 304
+    assert body == b""
+
+
+def test_hashed_names_are_immutable_and_served_precompressed(static_server):
+    status, headers, body = _get(static_server, f"/{HASHED_SCRIPT}", {"Accept-Encoding": "gzip, deflate"})
+    assert status == 200
+    assert headers["Content-Encoding"] == "gzip"
+    assert headers["Vary"] == "Accept-Encoding"
+    assert headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+    assert gzip.decompress(body) == b"console.log('app');"
+
+    # Clients that do not accept gzip get the plain file
+    status, headers, body = _get(static_server, f"/{HASHED_SCRIPT}")
+    assert "Content-Encoding" not in headers
+    assert headers["Vary"] == "Accept-Encoding"
+    assert body == b"console.log('app');"
+
+
+def test_directory_without_trailing_slash_redirects(static_server):
+    status, headers, _ = _get(static_server, "/docs?page=2")
+    assert status == 301
+    assert headers["Location"] == "/docs/?page=2"
+
+    status, _, body = _get(static_server, "/docs/")
+    assert status == 200
+    assert body == b"<h1>Docs</h1>"
+
+    assert _get(static_server, "/missing.html")[0] == 404
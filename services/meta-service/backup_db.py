@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Online backup tool for the Meta Portal database.
+
+Snapshots use SQLite's backup API in small steps, so the app can keep
+serving (and writing) while a backup runs. Every snapshot is compressed and
+restore-verified before it is kept.
+
+Usage:
+    python backup_db.py backup                      # take a snapshot
+    python backup_db.py ship-wal                    # archive the WAL (BACKUP_WAL_SHIPPING=true)
+    python backup_db.py list
+    python backup_db.py restore <name> <target.db> [--wal N]   # N = WAL copy, -1 = latest
+
+Point-in-time recovery: run the app with BACKUP_WAL_SHIPPING=true, take a
+snapshot regularly (e.g. daily) and run ship-wal often (e.g. every minute).
+"""
+
+import argparse
+import os
+import sys
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.services.backup_service import backup_service, BackupError
+
+
+def print_backup(manifest):
+    print(f"✅ Snapshot {manifest['name']}")
+    print(f"   {manifest['database_bytes'] / 1024 / 1024:.1f} MB in {manifest['backup_seconds']}s "
+          f"({manifest['throughput_mb_s']} MB/s, {manifest['steps']} steps)")
+    print(f"   Compressed to {manifest['compressed_bytes'] / 1024 / 1024:.1f} MB in {manifest['compress_seconds']}s")
+    print(f"   Verified: integrity {manifest['verified']['integrity']}, "
+          f"{manifest['verified']['rows']:,} rows in {manifest['verified']['tables']} tables")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Online backup and restore for the Meta Portal database")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("backup", help="take a compressed, verified snapshot")
+    commands.add_parser("ship-wal", help="archive the WAL written since the latest snapshot")
+    commands.add_parser("list", help="list kept snapshots")
+    restore_parser = commands.add_parser("restore", help="restore a snapshot to a new file")
+    restore_parser.add_argument("name")
+    restore_parser.add_argument("target")
+    restore_parser.add_argument("--wal", type=int, help="replay WAL copy N (1-based, -1 for the latest)")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "backup":
+            print(f"💾 Backing up {backup_service.database_path}...")
+            print_backup(backup_service.create_backup())
+
+        elif args.command == "ship-wal":
+            result = backup_service.ship_wal()
+            if "snapshot" in result:
+                print("⚠️  No usable WAL chain, took a new snapshot instead")
+                print_backup(result)
+            elif result["shipped"]:
+                print(f"✅ Shipped {result['file']}: {result['wal_bytes']:,} bytes "
+                      f"({result['compressed_bytes']:,} compressed) in {result['seconds']}s")
+            else:
+                print(f"ℹ️  Nothing to ship: {result['reason']}")
+
+        elif args.command == "list":
+            backups = backup_service.list_backups()
+            if not backups:
+                print(f"ℹ️  No backups in {backup_service.backup_dir}")
+            for manifest in backups:
+                wal_copies = len((manifest["wal"] or {}).get("copies", []))
+                print(f"📦 {manifest['name']}  {manifest['created_at']}  "
+                      f"{manifest['compressed_bytes'] / 1024 / 1024:.1f} MB  WAL copies: {wal_copies}")
+
+        elif args.command == "restore":
+            print(f"♻️  Restoring {args.name} to {args.target}...")
+            result = backup_service.restore(args.name, args.target, args.wal)
+            print(f"✅ Restored: integrity {result['integrity']}, {result['rows']:,} rows in {result['tables']} tables")
+
+    except BackupError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""
+API load-test and benchmark suite.
+
+Seeds a synthetic dataset (companies x jobs x users x applications, via
+generate_synthetic_data.py) into a scratch SQLite database, then drives
+a fixed, seeded mix of realistic requests through the app, in-process via
+httpx.ASGITransport and/or over the network against a real uvicorn server.
+Throughput and p50/p95/p99 latency per endpoint are written to a JSON file
+that can be compared between commits.
+
+Usage:
+    python benchmarks/api_benchmark.py                       # both transports, default scale
+    python benchmarks/api_benchmark.py --transport asgi --requests 5000 --concurrency 32
+    python benchmarks/api_benchmark.py --companies 25 --jobs-per-company 200 \\
+        --users-per-company 400 --applications-per-user 5
+    python benchmarks/api_benchmark.py --compare benchmarks/results/api-<commit>.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+
+SERVICE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, SERVICE_DIR)
+
+# Typical mix of a job portal: mostly browsing, some dashboards, few writes.
+# (endpoint name, weight)
+TRAFFIC_MIX = [
+    ("GET /api/jobs/", 35),
+    ("GET /api/users/me", 10),
+    ("GET /api/applications/me", 15),
+    ("POST /api/applications/", 5),
+    ("GET /api/admin/applications", 10),
+    ("GET /api/admin/stats", 5),
+    ("GET /api/admin/jobs", 5),
+    ("GET /api/admin/users", 5),
+    ("GET /api/admin/jobs/analytics", 5),
+    ("POST /api/users/login", 2),
+    ("GET /readyz", 3),
+]
+
+BENCH_PASSWORD = "password123"
+
+
+# ==========================================
+# DATASET
+# ==========================================
+
+def seed_dataset(args, rng: random.Random) -> dict:
+    """Create the schema and synthetic rows; returns ids needed to build requests"""
+    from generate_synthetic_data import SyntheticDataGenerator
+
+    # The password is hashed once; the login endpoint still pays full bcrypt cost on verify
+    generator = SyntheticDataGenerator(seed=rng.randrange(2 ** 32), password=BENCH_PASSWORD)
+    layout = generator.generate(
+        args.companies, args.jobs_per_company, args.users_per_company, args.applications_per_user
+    )
+
+    def account(user_id, email, company_index, is_admin):
+        return user_id, {"email": email, "company_id": layout.company_id(company_index), "is_admin": is_admin}
+
+    admins, users, jobs_by_company = [], [], {}
+    for company_index in range(layout.companies):
+        admins.append(account(*layout.admin(company_index), company_index, True))
+        for user_index in range(layout.users_per_company):
+            users.append(account(*layout.user(company_index, user_index), company_index, False))
+        jobs_by_company[layout.company_id(company_index)] = list(layout.job_ids(company_index))
+
+    return {
+        "admins": admins,
+        "users": users,
+        "jobs_by_company": jobs_by_company,
+        "counts": generator.counts,
+    }
+
+
+# ==========================================
+# TRAFFIC
+# ==========================================
+
+def build_requests(dataset: dict, count: int, rng: random.Random) -> list:
+    """Deterministic list of (endpoint, method, path, headers, json) to replay"""
+    from src.services.auth import create_access_token
+
+    def token_for(user_id, user):
+        token = create_access_token({
+            "sub": user["email"], "company_id": user["company_id"],
+            "user_id": user_id, "is_admin": user["is_admin"],
+        }, expires_delta=24 * 60)
+        return {"Authorization": f"Bearer {token}"}
+
+    tokens = {user_id: token_for(user_id, user) for user_id, user in dataset["admins"] + dataset["users"]}
+    names = [name for name, _ in TRAFFIC_MIX]
+    weights = [weight for _, weight in TRAFFIC_MIX]
+
+    requests = []
+    for name in rng.choices(names, weights=weights, k=count):
+        method, path = name.split(" ", 1)
+        user_id, user = rng.choice(dataset["users"])
+        admin_id, admin = rng.choice(dataset["admins"])
+        headers, body = {}, None
+
+        if path.startswith("/api/admin"):
+            headers = tokens[admin_id]
+        elif name == "POST /api/users/login":
+            body = {"email": user["email"], "password": BENCH_PASSWORD}
+        elif name == "POST /api/applications/":
+            headers = tokens[user_id]
+            body = {
+                "job_id": rng.choice(dataset["jobs_by_company"][user["company_id"]]),
+                "cover_letter": "Benchmark application",
+                "additional_info": None,
+            }
+        elif path.startswith(("/api/users/me", "/api/applications/me")):
+            headers = tokens[user_id]
+        requests.append((name, method, path, headers, body))
+    return requests
+
+
+async def replay(client, requests: list, concurrency: int) -> dict:
+    """Send requests with `concurrency` workers; returns latencies and statuses per endpoint"""
+    latencies = defaultdict(list)
+    statuses = defaultdict(lambda: defaultdict(int))
+    queue = asyncio.Queue()
+    for request in requests:
+        queue.put_nowait(request)
+
+    async def worker():
+        while True:
+            try:
+                name, method, path, headers, body = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, headers=headers, json=body)
+                status = str(response.status_code)
+            except Exception as e:
+                status = type(e).__name__
+            latencies[name].append((time.perf_counter() - start) * 1000)
+            statuses[name][status] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return {"elapsed": time.perf_counter() - start, "latencies": latencies, "statuses": statuses}
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Nearest-rank percentile"""
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(run: dict) -> dict:
+    endpoints = {}
+    total = 0
+    for name, values in sorted(run["latencies"].items()):
+        values.sort()
+        total += len(values)
+        endpoints[name] = {
+            "requests": len(values),
+            "throughput_rps": round(len(values) / run["elapsed"], 2),
+            "p50_ms": round(percentile(values, 0.50), 3),
+            "p95_ms": round(percentile(values, 0.95), 3),
+            "p99_ms": round(percentile(values, 0.99), 3),
+            "mean_ms": round(sum(values) / len(values), 3),
+            "statuses": dict(run["statuses"][name]),
+        }
+    return {
+        "elapsed_s": round(run["elapsed"], 3),
+        "total_requests": total,
+        "throughput_rps": round(total / run["elapsed"], 2),
+        "endpoints": endpoints,
+    }
+
+
+# ==========================================
+# TRANSPORTS
+# ==========================================
+
+async def run_asgi(warmup: list, measured: list, concurrency: int) -> dict:
+    import httpx
+    from src.main import app
+
+    # Record unhandled errors as 500s, as a real server would, instead of raising
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await replay(client, warmup, concurrency)
+        return summarize(await replay(client, measured, concurrency))
+
+
+async def run_uvicorn(warmup: list, measured: list, concurrency: int) -> dict:
+    import httpx
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning", "--no-access-log"],
+        cwd=SERVICE_DIR, env=os.environ.copy()
+    )
+    try:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+            for _ in range(100):
+                try:
+                    if (await client.get("/livez")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("uvicorn did not start")
+            await replay(client, warmup, concurrency)
+            return summarize(await replay(client, measured, concurrency))
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+# ==========================================
+# REPORTING
+# ==========================================
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SERVICE_DIR, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_results(results: dict, baseline: dict = None):
+    for transport, summary in results["transports"].items():
+        print(f"\n📊 {transport}: {summary['total_requests']} requests in {summary['elapsed_s']}s "
+              f"({summary['throughput_rps']} req/s)")
+        print(f"   {'endpoint':<34}{'reqs':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}  statuses")
+        base_endpoints = ((baseline or {}).get("transports", {}).get(transport) or {}).get("endpoints", {})
+        for name, stats in summary["endpoints"].items():
+            delta = ""
+            if name in base_endpoints:
+                change = (stats["p95_ms"] / base_endpoints[name]["p95_ms"] - 1) * 100
+                delta = f"  p95 {change:+.1f}% vs {baseline['commit']}"
+            print(f"   {name:<34}{stats['requests']:>6}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}"
+                  f"{stats['p99_ms']:>10.2f}  {stats['statuses']}{delta}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a synthetic dataset and benchmark the API")
+    parser.add_argument("--companies", type=int, default=5)
+    parser.add_argument("--jobs-per-company", type=int, default=50)
+    parser.add_argument("--users-per-company", type=int, default=100)
+    parser.add_argument("--applications-per-user", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--transport", default="asgi,uvicorn", help="comma-separated: asgi, uvicorn")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="JSON report path (default benchmarks/results/api-<commit>.json)")
+    parser.add_argument("--compare", help="previous JSON report to compare p95 latency against")
+    args = parser.parse_args()
+
+    # Point the app at a scratch database before anything imports it
+    workdir = tempfile.mkdtemp(prefix="meta-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["EMAIL_WORKER_ENABLED"] = "false"
+
+    rng = random.Random(args.seed)
+    print(f"🌱 Seeding dataset in {workdir}...")
+    seed_start = time.perf_counter()
+    dataset = seed_dataset(args, rng)
+    print(f"   {dataset['counts']} in {time.perf_counter() - seed_start:.1f}s")
+
+    requests = build_requests(dataset, args.requests + args.warmup, rng)
+    warmup, measured = requests[:args.warmup], requests[args.warmup:]
+
+    results = {
+        "commit": git_commit(),
+        "created_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "dataset": dataset["counts"],
+        "transports": {},
+    }
+    for transport in [name.strip() for name in args.transport.split(",") if name.strip()]:
+        print(f"🚀 Driving {len(measured)} requests via {transport} (concurrency {args.concurrency})...")
+        runner = {"asgi": run_asgi, "uvicorn": run_uvicorn}[transport]
+        results["transports"][transport] = asyncio.run(runner(warmup, measured, args.concurrency))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    output = args.output or os.path.join(SERVICE_DIR, "benchmarks", "results", f"api-{results['commit']}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✅ Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Application submit burst benchmark.
+
+Seeds one company with jobs and applicants (via generate_synthetic_data.py)
+into a scratch SQLite database, then has every applicant submit an
+application at the same moment, in-process via httpx.ASGITransport. A share
+of applicants "double-click" and send the same application twice at once.
+
+Reports p50/p95/p99 submit latency and checks the outcome: exactly one
+application and one confirmation email per applicant, every duplicate
+rejected with 400, no errors.
+
+Usage:
+    python benchmarks/bench_apply_burst.py [--applicants 1000] [--double-clicks 0.2]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+SERVICE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, SERVICE_DIR)
+
+from api_benchmark import percentile  # noqa: E402
+
+
+def seed(args):
+    """One company, its jobs and applicants (no applications yet), plus email templates"""
+    from generate_synthetic_data import SyntheticDataGenerator
+    from seed_email_templates import create_system_email_templates
+
+    layout = SyntheticDataGenerator(seed=args.seed).generate(1, args.jobs, args.applicants, 0)
+    create_system_email_templates()
+    return layout
+
+
+def build_requests(layout, args) -> list:
+    """(applicant id, headers, body) per request; double-clickers appear twice"""
+    from src.services.auth import create_access_token
+
+    rng = random.Random(args.seed)
+    job_ids = list(layout.job_ids(0))
+    requests = []
+    for index in range(args.applicants):
+        user_id, email = layout.user(0, index)
+        token = create_access_token({
+            "sub": email, "company_id": layout.company_id(0), "user_id": user_id, "is_admin": False
+        }, expires_delta=24 * 60)
+        request = (user_id, {"Authorization": f"Bearer {token}"},
+                   {"job_id": rng.choice(job_ids), "cover_letter": "Burst application", "additional_info": None})
+        requests.append(request)
+        if rng.random() < args.double_clicks:
+            requests.append(request)
+    rng.shuffle(requests)
+    return requests
+
+
+async def burst(requests: list) -> list:
+    """Send all requests at once; returns (status, latency ms) per request"""
+    import httpx
+    from src.main import app
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+
+        async def submit(headers, body):
+            start = time.perf_counter()
+            response = await client.post("/api/applications/", headers=headers, json=body)
+            return response.status_code, (time.perf_counter() - start) * 1000
+
+        return await asyncio.gather(*(submit(headers, body) for _, headers, body in requests))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark a burst of concurrent application submits")
+    parser.add_argument("--applicants", type=int, default=1000)
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--double-clicks", type=float, default=0.2, help="share of applicants submitting twice")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Point the app at a scratch database before anything imports it
+    workdir = tempfile.mkdtemp(prefix="meta-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["EMAIL_WORKER_ENABLED"] = "false"
+
+    print(f"🌱 Seeding {args.applicants} applicants and {args.jobs} jobs in {workdir}...")
+    layout = seed(args)
+    requests = build_requests(layout, args)
+
+    print(f"🚀 Submitting {len(requests)} applications at once ({len(requests) - args.applicants} double clicks)...")
+    start = time.perf_counter()
+    results = asyncio.run(burst(requests))
+    elapsed = time.perf_counter() - start
+
+    statuses = Counter(status for status, _ in results)
+    accepted = sorted(latency for status, latency in results if status == 200)
+    everything = sorted(latency for _, latency in results)
+    print(f"\n📊 {len(results)} submits in {elapsed:.2f}s ({len(results) / elapsed:.0f} req/s), statuses {dict(statuses)}")
+    for label, values in (("accepted", accepted), ("all", everything)):
+        if values:
+            print(f"   {label:<9} p50 {percentile(values, 0.50):8.1f} ms   p95 {percentile(values, 0.95):8.1f} ms   "
+                  f"p99 {percentile(values, 0.99):8.1f} ms")
+
+    from src.config.database import SessionLocal
+    from src.models import Application
+    from src.models.email import Email
+
+    db = SessionLocal()
+    try:
+        applications = db.query(Application).count()
+        emails = db.query(Email).filter(Email.template_name == "job_application_confirmation").count()
+    finally:
+        db.close()
+
+    expected = {200: args.applicants, 400: len(requests) - args.applicants}
+    ok = applications == emails == args.applicants and dict(statuses) == {k: v for k, v in expected.items() if v}
+    print(f"\n{'✅' if ok else '❌'} {applications} applications and {emails} confirmation emails "
+          f"for {args.applicants} applicants")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+List endpoint serialization benchmark.
+
+Seeds a scratch SQLite database (via generate_synthetic_data.py), runs the
+queries behind GET /api/jobs/ and GET /api/admin/applications once, then
+times turning the same rows into a response body three ways:
+
+  response_model   FastAPI's path for routes with a response_model:
+                   validate against list[JobRead], serialize, json.dumps
+  jsonable_encoder FastAPI's path for routes returning plain dicts
+  fast_json        src.utils.fast_json (orjson, and its stdlib fallback)
+
+Times are per 10k rows, next to the time the query itself took.
+
+Usage:
+    python benchmarks/bench_list_serialization.py [--rows 10000] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+SERVICE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, SERVICE_DIR)
+
+
+def best_of(fn, repeat: int) -> float:
+    """Fastest of `repeat` runs, in seconds"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def report(title: str, rows: int, query_seconds: float, results: dict):
+    scale = 10000 / rows
+    print(f"\n{title}: {rows} rows (ms per 10k rows)")
+    print(f"  {'query':<24} {query_seconds * scale * 1000:8.1f}")
+    baseline = next(iter(results.values()))
+    for label, seconds in results.items():
+        print(f"  {label:<24} {seconds * scale * 1000:8.1f}   {baseline / seconds:5.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Point the app at a scratch database before anything imports it
+    workdir = tempfile.mkdtemp(prefix="meta-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+    from sqlalchemy import select
+
+    from generate_synthetic_data import SyntheticDataGenerator
+    from src.config.database import SessionLocal
+    from src.models import Application, Company, Job, User
+    from src.schemas import JobRead
+    from src.utils import fast_json
+
+    print(f"🌱 Seeding {args.rows} jobs and {args.rows} applications in {workdir}...")
+    SyntheticDataGenerator(seed=args.seed).generate(1, args.rows, max(args.rows // 10, 1), 10)
+
+    def fast_json_stdlib(content):
+        orjson, fast_json.orjson = fast_json.orjson, None
+        try:
+            return fast_json.dumps(content)
+        finally:
+            fast_json.orjson = orjson
+
+    db = SessionLocal()
+    try:
+        # GET /api/jobs/ (response_model=list[JobRead])
+        jobs_query = (
+            select(Job.id, Job.title, Company.name.label("company"), Job.department, Job.location, Job.job_type,
+                   Job.experience_level, Job.salary_min, Job.salary_max, Job.description, Job.requirements,
+                   Job.posted_date, Job.is_active)
+            .outerjoin(Company, Company.id == Job.company_id)
+            .order_by(Job.posted_date.desc())
+        )
+        start = time.perf_counter()
+        jobs = fast_json.rows_to_dicts(db.execute(jobs_query))
+        query_seconds = time.perf_counter() - start
+
+        field = create_response_field(name="response", type_=list[JobRead])
+
+        def response_model():
+            content = asyncio.run(serialize_response(field=field, response_content=jobs))
+            JSONResponse(content)
+
+        report("GET /api/jobs/", len(jobs), query_seconds, {
+            "response_model": best_of(response_model, args.repeat),
+            "jsonable_encoder": best_of(lambda: JSONResponse(jsonable_encoder(jobs)), args.repeat),
+            "fast_json (stdlib)": best_of(lambda: fast_json_stdlib(jobs), args.repeat),
+            "fast_json (orjson)" if fast_json.orjson else "fast_json (no orjson)": best_of(lambda: fast_json.dumps(jobs), args.repeat),
+        })
+
+        # GET /api/admin/applications (nested dicts, no response_model)
+        applications_query = (
+            select(Application.id, Application.status, Application.applied_at, Application.cover_letter,
+                   User.id.label("user_id"), User.first_name, User.last_name, User.email, User.phone,
+                   Job.id.label("job_id"), Job.title, Company.name.label("company_name"), Job.department, Job.location)
+            .join(User, User.id == Application.user_id)
+            .join(Job, Job.id == Application.job_id)
+            .outerjoin(Company, Company.id == Job.company_id)
+            .order_by(Application.applied_at.desc())
+            .limit(args.rows)
+        )
+        start = time.perf_counter()
+        rows = db.execute(applications_query).all()
+        query_seconds = time.perf_counter() - start
+        applications = [
+            {
+                "id": row.id, "status": row.status, "applied_at": row.applied_at, "cover_letter": row.cover_letter,
+                "user": {"id": row.user_id, "name": f"{row.first_name} {row.last_name}", "email": row.email, "phone": row.phone},
+                "job": {"id": row.job_id, "title": row.title, "company": row.company_name or "N/A",
+                        "department": row.department, "location": row.location}
+            }
+            for row in rows
+        ]
+
+        report("GET /api/admin/applications", len(applications), query_seconds, {
+            "jsonable_encoder": best_of(lambda: JSONResponse(jsonable_encoder(applications)), args.repeat),
+            "fast_json (stdlib)": best_of(lambda: fast_json_stdlib(applications), args.repeat),
+            "fast_json (orjson)" if fast_json.orjson else "fast_json (no orjson)": best_of(lambda: fast_json.dumps(applications), args.repeat),
+        })
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
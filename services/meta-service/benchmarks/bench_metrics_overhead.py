@@ -0,0 +1,99 @@
+"""
+Metrics instrumentation overhead benchmark.
+
+Calls a minimal FastAPI app directly through ASGI (no HTTP client or server
+in the way) with and without MetricsMiddleware. Reports the per-request cost
+of the instrumentation, and checks that no metric children are created after
+the first request.
+
+Usage:
+    python benchmarks/bench_metrics_overhead.py [--requests 20000]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+from src.utils.metrics import MetricsMiddleware, http_requests_total, http_request_duration_seconds
+
+
+def build_app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/items/{item_id}")
+    async def read_item(item_id: int):
+        return PlainTextResponse("ok")
+
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def drive(app: FastAPI, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/items/1",
+        "raw_path": b"/api/items/1",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 1234),
+        "server": ("testserver", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    # Warm up (builds the middleware stack and preallocates label sets)
+    for _ in range(100):
+        await app(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return time.perf_counter() - start
+
+
+def children_count() -> int:
+    return len(http_requests_total._children) + len(http_request_duration_seconds._children)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    baseline = asyncio.run(drive(build_app(False), args.requests))
+
+    instrumented_app = build_app(True)
+    asyncio.run(drive(instrumented_app, 100))
+    children_before = children_count()
+    instrumented = asyncio.run(drive(instrumented_app, args.requests))
+    children_after = children_count()
+
+    per_request_base = baseline / args.requests * 1e6
+    per_request_metrics = instrumented / args.requests * 1e6
+    print(f"Requests:                 {args.requests}")
+    print(f"Baseline per request:     {per_request_base:8.2f} µs")
+    print(f"With metrics per request: {per_request_metrics:8.2f} µs")
+    print(f"Overhead per request:     {per_request_metrics - per_request_base:8.2f} µs "
+          f"({(per_request_metrics / per_request_base - 1) * 100:.1f}%)")
+    print(f"Metric children created during run: {children_after - children_before}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Email template render benchmark.
+
+Compares rendering a database template the old way (compile subject, HTML and
+text on every send) against the compiled-template cache, and loading the
+filesystem templates in a fresh Jinja environment with and without the
+bytecode cache.
+
+Usage:
+    python benchmarks/bench_template_render.py [--renders 2000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, Template
+
+from src.models.email import EmailTemplate
+from src.services.email_service import EmailConfig, EmailTemplateEngine
+
+HTML_BODY = """
+<h2>Hello {{ user_name }},</h2>
+<p>Your application for <strong>{{ job_title }}</strong> at {{ company_name }} is now
+<strong>{{ new_status }}</strong>.</p>
+{% if interview_date %}<p>Interview on {{ interview_date }}.</p>{% endif %}
+<ul>{% for step in next_steps %}<li>{{ step }}</li>{% endfor %}</ul>
+""" * 4
+
+VARIABLES = {
+    "user_name": "Jane Smith",
+    "job_title": "Software Engineer",
+    "company_name": "Meta",
+    "new_status": "interview",
+    "interview_date": "2025-11-03",
+    "next_steps": ["Prepare", "Attend", "Follow up"],
+}
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return time.perf_counter() - start
+
+
+def bench_db_templates(renders: int):
+    template = EmailTemplate(
+        id=1,
+        version=1,
+        name="application_status_update",
+        subject_template="Update on your {{ job_title }} application",
+        html_content=HTML_BODY,
+        text_content="Hello {{ user_name }}, your status is {{ new_status }}.",
+    )
+    engine = EmailTemplateEngine()
+
+    def uncached():
+        Template(template.subject_template).render(**VARIABLES)
+        Template(template.html_content).render(**VARIABLES)
+        Template(template.text_content).render(**VARIABLES)
+
+    def cached():
+        engine.render_template_from_db(template, VARIABLES)
+
+    before = timed(uncached, renders)
+    after = timed(cached, renders)
+    print(f"Database template, {renders} renders")
+    print(f"  compile every send : {before * 1000:8.1f} ms ({before / renders * 1e6:7.1f} us/render)")
+    print(f"  compiled cache     : {after * 1000:8.1f} ms ({after / renders * 1e6:7.1f} us/render)")
+    print(f"  speedup            : {before / after:8.1f}x")
+
+
+def bench_filesystem_templates():
+    names = [n for n in os.listdir(EmailConfig.TEMPLATE_DIR) if n.endswith(".html")]
+    cache_dir = tempfile.mkdtemp(prefix="jinja_bcc_")
+
+    def cold_load(bytecode_cache):
+        env = Environment(
+            loader=FileSystemLoader(EmailConfig.TEMPLATE_DIR),
+            autoescape=True,
+            bytecode_cache=bytecode_cache,
+        )
+        for name in names:
+            env.get_template(name)
+
+    cold_load(FileSystemBytecodeCache(cache_dir))  # warm the bytecode cache
+    rounds = 50
+    before = timed(lambda: cold_load(None), rounds)
+    after = timed(lambda: cold_load(FileSystemBytecodeCache(cache_dir)), rounds)
+    print(f"Filesystem templates, {len(names)} files loaded by a fresh environment x{rounds}")
+    print(f"  no bytecode cache  : {before * 1000:8.1f} ms")
+    print(f"  bytecode cache     : {after * 1000:8.1f} ms")
+    print(f"  speedup            : {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--renders", type=int, default=2000)
+    args = parser.parse_args()
+    bench_db_templates(args.renders)
+    bench_filesystem_templates()
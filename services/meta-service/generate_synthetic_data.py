@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Fast synthetic data generator for Meta Portal.
+
+Creates companies x jobs x users x applications in the shapes used by
+complete_setup.py, at scales the ORM-based seed scripts cannot reach:
+rows are streamed through executemany in a single transaction, ids are
+assigned up front (no RETURNING round trips) and the password hash is
+computed once and shared by every user. Applications that have moved on
+from "submitted" get their status change logged, and the analytics rollups
+are rebuilt afterwards, as rebuild_application_stats.py does.
+
+The output is deterministic for a given --seed and starting database.
+
+Usage:
+    python generate_synthetic_data.py --companies 100 --jobs-per-company 500 \\
+        --users-per-company 2000 --applications-per-user 5 --seed 42
+    DATABASE_URL=sqlite:////tmp/scale.db python generate_synthetic_data.py ...
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Iterator, Tuple
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from complete_setup import (
+    COMPANY_DATA, JOB_TITLES, LOCATIONS, JOB_TYPES, EXPERIENCES, DESCRIPTIONS, COVER_LETTERS
+)
+from sqlalchemy.orm import Session
+
+from src.config.database import engine as default_engine, init_db
+from src.models import Company
+from src.services.application_history_service import application_history
+from src.services.application_stats_service import application_stats_buckets
+from src.services.auth import hash_password
+
+DEFAULT_PASSWORD = "password123"
+APPLICATION_STATUSES = ["submitted", "in_review", "interview", "accepted", "rejected"]
+APPLICATION_STATUS_WEIGHTS = [0.3, 0.25, 0.2, 0.15, 0.1]
+FIRST_STATUS = APPLICATION_STATUSES[0]
+
+# Same text format SQLAlchemy uses for SQLite DateTime columns
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+class SyntheticLayout:
+    """
+    Where the generated rows live
+    Ids are contiguous per company, so any user, admin or job can be
+    addressed by (company index, position) without querying.
+    """
+
+    def __init__(self, first_company_id: int, first_job_id: int, first_user_id: int,
+                 companies: int, jobs_per_company: int, users_per_company: int, password: str):
+        self.first_company_id = first_company_id
+        self.first_job_id = first_job_id
+        self.first_user_id = first_user_id
+        self.companies = companies
+        self.jobs_per_company = jobs_per_company
+        self.users_per_company = users_per_company
+        self.password = password
+
+    def company_id(self, company_index: int) -> int:
+        return self.first_company_id + company_index
+
+    def job_ids(self, company_index: int) -> range:
+        start = self.first_job_id + company_index * self.jobs_per_company
+        return range(start, start + self.jobs_per_company)
+
+    def admin(self, company_index: int) -> Tuple[int, str]:
+        """(user id, email) of the company's admin"""
+        user_id = self.first_user_id + company_index * (self.users_per_company + 1)
+        return user_id, self.email(user_id)
+
+    def user(self, company_index: int, user_index: int) -> Tuple[int, str]:
+        """(user id, email) of a regular user"""
+        user_id = self.first_user_id + company_index * (self.users_per_company + 1) + 1 + user_index
+        return user_id, self.email(user_id)
+
+    @staticmethod
+    def email(user_id: int) -> str:
+        return f"synthetic-{user_id}@example.com"
+
+
+class SyntheticDataGenerator:
+    """Streams deterministic synthetic rows into the database"""
+
+    def __init__(self, engine=None, seed: int = 42, password: str = DEFAULT_PASSWORD, batch_size: int = 50000):
+        self.engine = engine or default_engine
+        self.rng = random.Random(seed)
+        self.password = password
+        self.batch_size = batch_size
+        self.counts = {}
+
+    def generate(self, companies: int, jobs_per_company: int, users_per_company: int,
+                 applications_per_user: int) -> SyntheticLayout:
+        """
+        Create the schema if needed, insert everything in one transaction,
+        then rebuild the application analytics rollups from it
+        """
+        init_db(self.engine)
+        # One full-cost hash, shared by every generated user
+        password_hash = hash_password(self.password)
+
+        with self.engine.begin() as connection:
+            cursor = connection.connection.driver_connection.cursor()
+            layout = SyntheticLayout(
+                first_company_id=self._next_id(cursor, "companies"),
+                first_job_id=self._next_id(cursor, "jobs"),
+                first_user_id=self._next_id(cursor, "users"),
+                companies=companies,
+                jobs_per_company=jobs_per_company,
+                users_per_company=users_per_company,
+                password=self.password
+            )
+            self._insert(cursor, "companies", (
+                "id", "name", "slug", "domain", "industry", "size", "headquarters", "description", "website", "settings",
+                "is_active"
+            ), self._companies(layout))
+            self._insert(cursor, "jobs", (
+                "id", "company_id", "title", "description", "location", "job_type", "salary_min", "salary_max",
+                "experience_level", "department", "is_active"
+            ), self._jobs(layout))
+            self._insert(cursor, "users", (
+                "id", "company_id", "email", "password_hash", "first_name", "last_name", "phone", "is_admin", "is_active"
+            ), self._users(layout, password_hash))
+            first_application_id = self._next_id(cursor, "applications")
+            self._insert(cursor, "applications", (
+                "user_id", "job_id", "company_id", "cover_letter", "status", "applied_at", "updated_at"
+            ), self._applications(layout, applications_per_user))
+            # One logged change per application past the first status, at its updated_at
+            cursor.execute(
+                "INSERT INTO application_status_changes "
+                "(application_id, company_id, job_id, from_status, to_status, changed_at, seconds_in_stage) "
+                "SELECT id, company_id, job_id, ?, status, updated_at, "
+                "(julianday(updated_at) - julianday(applied_at)) * 86400.0 "
+                "FROM applications WHERE id >= ? AND status != ?",
+                (FIRST_STATUS, first_application_id, FIRST_STATUS)
+            )
+            self.counts["application_status_changes"] = cursor.rowcount
+
+        # Funnel, trend and time-in-stage rollups the app would have kept up to date
+        with Session(self.engine) as db:
+            self.counts["application_stats_buckets"] = application_stats_buckets.rebuild(db)["buckets"]
+            self.counts["application_stage_latency"] = application_history.rebuild_latency(db)["buckets"]
+        return layout
+
+    @staticmethod
+    def _next_id(cursor, table: str) -> int:
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}")
+        return cursor.fetchone()[0]
+
+    def _insert(self, cursor, table: str, columns: Tuple[str, ...], rows: Iterator[tuple]):
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        total = 0
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            cursor.executemany(sql, batch)
+            total += len(batch)
+        self.counts[table] = total
+
+    # ==========================================
+    # ROW GENERATORS
+    # ==========================================
+
+    def _companies(self, layout: SyntheticLayout) -> Iterator[tuple]:
+        # Column default the ORM would have applied
+        settings = json.dumps(Company.__table__.c.settings.default.arg)
+        for index in range(layout.companies):
+            company_id = layout.company_id(index)
+            shape = COMPANY_DATA[index % len(COMPANY_DATA)]
+            domain = f"c{company_id}.{shape['domain']}"
+            yield (
+                company_id, f"{shape['name']} #{company_id}", f"{shape['slug']}-{company_id}", domain,
+                shape["industry"], shape["size"], shape["headquarters"],
+                f"{shape['name']} - {shape['industry']} Company", f"https://{domain}", settings, 1
+            )
+
+    def _jobs(self, layout: SyntheticLayout) -> Iterator[tuple]:
+        rng = self.rng
+        for index in range(layout.companies):
+            company_id = layout.company_id(index)
+            for job_id in layout.job_ids(index):
+                salary_base = rng.randint(50, 200) * 1000
+                yield (
+                    job_id, company_id, rng.choice(JOB_TITLES), rng.choice(DESCRIPTIONS), rng.choice(LOCATIONS),
+                    rng.choice(JOB_TYPES), salary_base, salary_base + rng.randint(20, 50) * 1000,
+                    rng.choice(EXPERIENCES), "Engineering", 1
+                )
+
+    def _users(self, layout: SyntheticLayout, password_hash: str) -> Iterator[tuple]:
+        for index in range(layout.companies):
+            company_id = layout.company_id(index)
+            admin_id, admin_email = layout.admin(index)
+            yield (admin_id, company_id, admin_email, password_hash, "Admin", str(company_id), "+10000000000", 1, 1)
+            for user_index in range(layout.users_per_company):
+                user_id, email = layout.user(index, user_index)
+                yield (user_id, company_id, email, password_hash, "User", str(user_id), "+10000000001", 0, 1)
+
+    def _applications(self, layout: SyntheticLayout, applications_per_user: int) -> Iterator[tuple]:
+        rng = self.rng
+        per_user = min(applications_per_user, layout.jobs_per_company)
+        now = datetime.utcnow().replace(microsecond=0)
+        applied_dates = [now - timedelta(days=days) for days in range(1, 31)]
+        for index in range(layout.companies):
+            company_id = layout.company_id(index)
+            job_ids = layout.job_ids(index)
+            for user_index in range(layout.users_per_company):
+                user_id, _ = layout.user(index, user_index)
+                statuses = rng.choices(APPLICATION_STATUSES, weights=APPLICATION_STATUS_WEIGHTS, k=per_user)
+                for job_id, status in zip(rng.sample(job_ids, per_user), statuses):
+                    applied_at = rng.choice(applied_dates)
+                    # Applications past the first status were reviewed some time before now
+                    updated_at = applied_at if status == FIRST_STATUS else applied_at + timedelta(
+                        seconds=rng.randint(3600, int((now - applied_at).total_seconds()))
+                    )
+                    yield (
+                        user_id, job_id, company_id, rng.choice(COVER_LETTERS), status,
+                        applied_at.strftime(DATETIME_FORMAT), updated_at.strftime(DATETIME_FORMAT)
+                    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic companies, jobs, users and applications")
+    parser.add_argument("--companies", type=int, default=25)
+    parser.add_argument("--jobs-per-company", type=int, default=100)
+    parser.add_argument("--users-per-company", type=int, default=1000)
+    parser.add_argument("--applications-per-user", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="password of every generated user")
+    parser.add_argument("--batch-size", type=int, default=50000)
+    args = parser.parse_args()
+
+    print("🚀 Generating synthetic data...")
+    start = time.perf_counter()
+    generator = SyntheticDataGenerator(seed=args.seed, password=args.password, batch_size=args.batch_size)
+    layout = generator.generate(
+        args.companies, args.jobs_per_company, args.users_per_company, args.applications_per_user
+    )
+    elapsed = time.perf_counter() - start
+
+    total_rows = sum(generator.counts.values())
+    for table, count in generator.counts.items():
+        print(f"   ✅ {table}: {count:,}")
+    print(f"\n🎉 {total_rows:,} rows in {elapsed:.1f}s ({total_rows / elapsed * 60:,.0f} rows/min)")
+    print(f"🔑 Admin login: {layout.admin(0)[1]} / {args.password}")
+    print(f"🔑 User login:  {layout.user(0, 0)[1]} / {args.password}")
+
+
+if __name__ == "__main__":
+    main()
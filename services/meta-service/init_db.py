@@ -6,15 +6,14 @@ Usage:
     python init_db.py
 """
 
-from src.config.database import Base, engine
-from src.models import job, user, application
+from src.config.database import init_db
 
 print("=" * 60)
 print("Database Initialization")
 print("=" * 60)
 
 # Create all tables
-Base.metadata.create_all(bind=engine)
+init_db()
 
 print("✅ Database tables created successfully!")
 print("=" * 60)
@@ -0,0 +1,67 @@
+"""
+Alembic environment for Meta Portal.
+
+Runs against the app's own database URL. Callers that already hold a
+connection (init_db) pass it in config.attributes["connection"].
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine
+
+from src.config.database import Base, SQLALCHEMY_DATABASE_URL
+import src.models  # noqa: F401  (register all tables on Base.metadata)
+
+config = context.config
+
+# Only configure logging when run from the alembic command line
+if config.config_file_name is not None and "connection" not in config.attributes:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    """Emit SQL to stdout instead of running it (alembic upgrade --sql)"""
+    context.configure(
+        url=SQLALCHEMY_DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run(connection)
+        return
+
+    engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    try:
+        with engine.connect() as connection:
+            _run(connection)
+    finally:
+        engine.dispose()
+
+
+def _run(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        # SQLite can only ALTER through table copies; batch mode generates them
+        render_as_batch=True,
+        # Record each revision as it completes, so an interrupted upgrade resumes there
+        transaction_per_migration=True
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,23 @@
+"""Baseline: the schema as created by create_all before Alembic
+
+Databases created by earlier versions of the app (Base.metadata.create_all at
+startup) are stamped at this revision by init_db() and upgraded from here.
+New databases are created from the models and stamped at head directly.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    pass
+
+
+def downgrade():
+    pass
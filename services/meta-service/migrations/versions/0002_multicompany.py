@@ -0,0 +1,108 @@
+"""Multi-company: companies table, company_id columns and their backfill
+
+Replaces migrate_to_multicompany.py. Adding the columns is a schema-only
+change in SQLite; the backfill runs in committed id-range batches, so a live
+database keeps serving writes and an interrupted run can be resumed.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.utils.backfill import backfill_in_batches
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+TENANT_TABLES = ("users", "jobs", "applications")
+
+DEFAULT_COMPANY_SETTINGS = {
+    "job_posting_approval_required": False,
+    "allow_external_applications": True,
+    "email_notifications": True,
+    "branding_color": "#007bff",
+    "logo_url": None,
+    "custom_application_fields": []
+}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table("companies"):
+        op.create_table(
+            "companies",
+            sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+            sa.Column("name", sa.String(200), nullable=False),
+            sa.Column("domain", sa.String(100), nullable=True),
+            sa.Column("slug", sa.String(50), nullable=False),
+            sa.Column("description", sa.Text, nullable=True),
+            sa.Column("industry", sa.String(100), nullable=True),
+            sa.Column("website", sa.String(255), nullable=True),
+            sa.Column("headquarters", sa.String(200), nullable=True),
+            sa.Column("size", sa.String(50), nullable=True),
+            sa.Column("settings", sa.JSON, nullable=True),
+            sa.Column("admin_user_id", sa.Integer, sa.ForeignKey("users.id"), nullable=True),
+            sa.Column("is_active", sa.Boolean, nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+        op.create_index("ix_companies_id", "companies", ["id"])
+        op.create_index("ix_companies_name", "companies", ["name"], unique=True)
+        op.create_index("ix_companies_domain", "companies", ["domain"], unique=True)
+        op.create_index("ix_companies_slug", "companies", ["slug"], unique=True)
+
+    for table in TENANT_TABLES:
+        if "company_id" not in {column["name"] for column in inspector.get_columns(table)}:
+            op.add_column(table, sa.Column("company_id", sa.Integer, nullable=True))
+            op.create_index(f"ix_{table}_company_id", table, ["company_id"])
+
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        if not any(_has_unassigned_rows(connection, table) for table in TENANT_TABLES):
+            return
+        default_company_id = _get_or_create_default_company(connection)
+        params = {"default_company_id": default_company_id}
+
+        backfill_in_batches(connection, "users", "company_id = :default_company_id", "company_id IS NULL", params)
+        backfill_in_batches(connection, "jobs", "company_id = :default_company_id", "company_id IS NULL", params)
+        # Applications belong to their job's company
+        backfill_in_batches(
+            connection, "applications",
+            "company_id = COALESCE((SELECT jobs.company_id FROM jobs WHERE jobs.id = applications.job_id), "
+            ":default_company_id)",
+            "company_id IS NULL", params
+        )
+
+        # The default company's first admin becomes its primary admin
+        connection.execute(sa.text(
+            "UPDATE companies SET admin_user_id = ("
+            "SELECT MIN(id) FROM users WHERE is_admin = 1 AND company_id = :default_company_id"
+            ") WHERE id = :default_company_id AND admin_user_id IS NULL"
+        ), params)
+
+
+def downgrade():
+    raise NotImplementedError("The multi-company migration cannot be reversed; restore a backup instead")
+
+
+def _has_unassigned_rows(connection, table: str) -> bool:
+    return connection.execute(sa.text(f"SELECT 1 FROM {table} WHERE company_id IS NULL LIMIT 1")).first() is not None
+
+
+def _get_or_create_default_company(connection) -> int:
+    company_id = connection.execute(sa.text("SELECT id FROM companies WHERE slug = 'default'")).scalar()
+    if company_id is None:
+        company_id = connection.execute(sa.text(
+            "INSERT INTO companies (name, slug, description, industry, settings, is_active) "
+            "VALUES ('Default Company', 'default', 'Default company for migrated data', 'General', :settings, 1) "
+            "RETURNING id"
+        ), {"settings": json.dumps(DEFAULT_COMPANY_SETTINGS)}).scalar()
+    return company_id
@@ -0,0 +1,32 @@
+"""Jobs: benefits and remote_options columns
+
+Both are plain ADD COLUMNs. remote_options gets a constant default, which
+SQLite returns for existing rows without rewriting them, so no backfill or
+table copy is needed.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("jobs")}
+    if "benefits" not in columns:
+        op.add_column("jobs", sa.Column("benefits", sa.Text, nullable=True))
+    if "remote_options" not in columns:
+        op.add_column("jobs", sa.Column("remote_options", sa.String(50), nullable=True, server_default="On-site"))
+
+
+def downgrade():
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.drop_column("remote_options")
+        batch_op.drop_column("benefits")
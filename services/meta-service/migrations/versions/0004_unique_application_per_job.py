@@ -0,0 +1,60 @@
+"""Applications: one application per user and job
+
+Adds a unique index on (user_id, job_id), so duplicate submissions are
+rejected by the INSERT itself (ON CONFLICT DO NOTHING) instead of by a
+check-then-insert that concurrent requests can both pass.
+
+Duplicates left behind by that race are merged into the earliest
+application first: emails, digest items and resumes pointing at a later
+copy are repointed, then the later copies are deleted.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "uq_applications_user_job"
+
+# Tables with an application_id reference
+REFERENCING_TABLES = ("emails", "email_digest_items", "resumes")
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if INDEX_NAME in {index["name"] for index in inspector.get_indexes("applications")}:
+        return
+
+    duplicates = [dict(row._mapping) for row in bind.execute(sa.text("""
+        SELECT a.id AS duplicate_id, k.keep_id
+        FROM applications a
+        JOIN (
+            SELECT user_id, job_id, MIN(id) AS keep_id
+            FROM applications
+            GROUP BY user_id, job_id
+            HAVING COUNT(*) > 1
+        ) k ON a.user_id = k.user_id AND a.job_id = k.job_id AND a.id <> k.keep_id
+    """))]
+    if duplicates:
+        tables = set(inspector.get_table_names())
+        for table in REFERENCING_TABLES:
+            if table in tables:
+                bind.execute(
+                    sa.text(f"UPDATE {table} SET application_id = :keep_id WHERE application_id = :duplicate_id"),
+                    duplicates
+                )
+        bind.execute(sa.text("DELETE FROM applications WHERE id = :duplicate_id"), duplicates)
+
+    op.create_index(INDEX_NAME, "applications", ["user_id", "job_id"], unique=True)
+
+
+def downgrade():
+    op.drop_index(INDEX_NAME, table_name="applications")
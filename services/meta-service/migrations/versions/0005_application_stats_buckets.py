@@ -0,0 +1,48 @@
+"""Applications: daily analytics buckets
+
+Adds application_stats_buckets, which holds per-day counts of received
+applications and status changes (and first-review wait times) per company
+and job. The table starts empty; fill it from existing applications with
+python rebuild_application_stats.py.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+TABLE_NAME = "application_stats_buckets"
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table(TABLE_NAME):
+        return
+
+    op.create_table(
+        TABLE_NAME,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("day", sa.DateTime, nullable=False),
+        sa.Column("company_id", sa.Integer, nullable=False),
+        sa.Column("job_id", sa.Integer, nullable=False),
+        sa.Column("from_status", sa.String(50), nullable=False),
+        sa.Column("to_status", sa.String(50), nullable=False),
+        sa.Column("event_count", sa.Integer, nullable=False),
+        sa.Column("review_count", sa.Integer, nullable=False),
+        sa.Column("review_seconds", sa.Float, nullable=False),
+        sa.UniqueConstraint(
+            "day", "company_id", "job_id", "from_status", "to_status",
+            name="uq_application_stats_buckets_bucket"
+        ),
+    )
+    op.create_index(f"ix_{TABLE_NAME}_id", TABLE_NAME, ["id"])
+
+
+def downgrade():
+    op.drop_table(TABLE_NAME)
@@ -0,0 +1,64 @@
+"""Applications: status change log and time-in-stage histograms
+
+Adds application_status_changes, an append-only log of status changes
+indexed by (company_id, changed_at) and (application_id, changed_at), and
+application_stage_latency, per-day histograms of time spent in a status
+before each change. Both start empty: earlier changes were not recorded.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "application_status_changes" not in tables:
+        op.create_table(
+            "application_status_changes",
+            sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+            sa.Column("application_id", sa.Integer, sa.ForeignKey("applications.id"), nullable=False),
+            sa.Column("company_id", sa.Integer, sa.ForeignKey("companies.id"), nullable=True),
+            sa.Column("job_id", sa.Integer, sa.ForeignKey("jobs.id"), nullable=True),
+            sa.Column("changed_by", sa.Integer, sa.ForeignKey("users.id"), nullable=True),
+            sa.Column("from_status", sa.String(50), nullable=False),
+            sa.Column("to_status", sa.String(50), nullable=False),
+            sa.Column("changed_at", sa.DateTime, nullable=False),
+            sa.Column("seconds_in_stage", sa.Float, nullable=True),
+        )
+        op.create_index("ix_application_status_changes_id", "application_status_changes", ["id"])
+        op.create_index("ix_application_status_changes_company_changed", "application_status_changes", ["company_id", "changed_at"])
+        op.create_index("ix_application_status_changes_application_changed", "application_status_changes", ["application_id", "changed_at"])
+
+    if "application_stage_latency" not in tables:
+        op.create_table(
+            "application_stage_latency",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("day", sa.DateTime, nullable=False),
+            sa.Column("company_id", sa.Integer, nullable=False),
+            sa.Column("job_id", sa.Integer, nullable=False),
+            sa.Column("from_status", sa.String(50), nullable=False),
+            sa.Column("to_status", sa.String(50), nullable=False),
+            sa.Column("bin", sa.Integer, nullable=False),
+            sa.Column("change_count", sa.Integer, nullable=False),
+            sa.Column("total_seconds", sa.Float, nullable=False),
+            sa.UniqueConstraint(
+                "day", "company_id", "job_id", "from_status", "to_status", "bin",
+                name="uq_application_stage_latency_bucket"
+            ),
+        )
+        op.create_index("ix_application_stage_latency_id", "application_stage_latency", ["id"])
+
+
+def downgrade():
+    op.drop_table("application_stage_latency")
+    op.drop_table("application_status_changes")
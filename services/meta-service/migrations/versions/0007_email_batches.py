@@ -0,0 +1,65 @@
+"""Emails: bulk send batches
+
+Adds email_batches, which tracks the progress of a bulk send, and
+emails.batch_id, which points each queued email at its batch. SQLite can add
+a nullable column with a REFERENCES clause in place, so emails is altered
+without copying the table.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table("email_batches"):
+        op.create_table(
+            "email_batches",
+            sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+            sa.Column("batch_id", sa.String(64), nullable=False),
+            sa.Column("template_name", sa.String(100), nullable=False),
+            sa.Column("status", sa.String(20), nullable=False),
+            sa.Column("total_requested", sa.Integer, nullable=False),
+            sa.Column("emails_queued", sa.Integer, nullable=False),
+            sa.Column("failed_count", sa.Integer, nullable=False),
+            sa.Column("failed_recipients", sa.JSON, nullable=True),
+            sa.Column("error_message", sa.Text, nullable=True),
+            sa.Column("company_id", sa.Integer, sa.ForeignKey("companies.id"), nullable=True),
+            sa.Column("created_by", sa.Integer, sa.ForeignKey("users.id"), nullable=True),
+            sa.Column("started_at", sa.DateTime, nullable=True),
+            sa.Column("completed_at", sa.DateTime, nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        )
+        op.create_index("ix_email_batches_id", "email_batches", ["id"])
+        op.create_index("ix_email_batches_batch_id", "email_batches", ["batch_id"], unique=True)
+        op.create_index("ix_email_batches_status", "email_batches", ["status"])
+        op.create_index("ix_email_batches_company_id", "email_batches", ["company_id"])
+
+    if "batch_id" not in {column["name"] for column in inspector.get_columns("emails")}:
+        # A plain ADD COLUMN, not a table copy of emails. Alembic would add the
+        # foreign key with a separate ALTER, which SQLite lacks, but SQLite
+        # accepts it inline as a REFERENCES clause.
+        if op.get_bind().dialect.name == "sqlite":
+            op.execute("ALTER TABLE emails ADD COLUMN batch_id VARCHAR(64) REFERENCES email_batches (batch_id)")
+        else:
+            op.add_column("emails", sa.Column("batch_id", sa.String(64), sa.ForeignKey("email_batches.batch_id"), nullable=True))
+        op.create_index("ix_emails_batch_id", "emails", ["batch_id"])
+
+
+def downgrade():
+    # SQLite cannot drop a column that has a foreign key, so this one copies the table
+    op.drop_index("ix_emails_batch_id", "emails")
+    with op.batch_alter_table("emails") as batch_op:
+        batch_op.drop_column("batch_id")
+    op.drop_table("email_batches")
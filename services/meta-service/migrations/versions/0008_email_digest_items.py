@@ -0,0 +1,49 @@
+"""Emails: digest items
+
+Adds email_digest_items, the notifications buffered for users who receive
+daily or weekly digests, with an index for the scheduler's lookup of
+pending items by user.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+TABLE_NAME = "email_digest_items"
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table(TABLE_NAME):
+        return
+
+    op.create_table(
+        TABLE_NAME,
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("company_id", sa.Integer, sa.ForeignKey("companies.id"), nullable=True),
+        sa.Column("recipient_email", sa.String(255), nullable=False),
+        sa.Column("template_name", sa.String(100), nullable=False),
+        sa.Column("subject", sa.String(500), nullable=False),
+        sa.Column("text_content", sa.Text, nullable=True),
+        sa.Column("application_id", sa.Integer, sa.ForeignKey("applications.id"), nullable=True),
+        sa.Column("job_id", sa.Integer, sa.ForeignKey("jobs.id"), nullable=True),
+        sa.Column("digest_email_id", sa.Integer, sa.ForeignKey("emails.id"), nullable=True),
+        sa.Column("delivered_at", sa.DateTime, nullable=True),
+        sa.Column("created_at", sa.DateTime, nullable=False),
+    )
+    op.create_index(f"ix_{TABLE_NAME}_id", TABLE_NAME, ["id"])
+    op.create_index(f"ix_{TABLE_NAME}_user_id", TABLE_NAME, ["user_id"])
+    op.create_index(f"ix_{TABLE_NAME}_company_id", TABLE_NAME, ["company_id"])
+    op.create_index(f"ix_{TABLE_NAME}_pending", TABLE_NAME, ["digest_email_id", "user_id", "created_at"])
+
+
+def downgrade():
+    op.drop_table(TABLE_NAME)
@@ -0,0 +1,84 @@
+"""Emails: statistics rollups
+
+Adds email_stats_rollups, the hourly and daily email counts per company,
+template and status that email statistics are read from, and fills it from
+the emails table (hourly rows only for the retention window), the same
+counts as rebuild_email_stats.py. The backfill runs in committed id-range
+batches of emails whose counts are added to the rows earlier batches wrote,
+so a live database keeps serving writes. An interrupted run starts the
+backfill over.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19
+"""
+
+from datetime import datetime, timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.utils.backfill import run_in_batches
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+TABLE_NAME = "email_stats_rollups"
+
+# Matches EmailStatsRollups.HOURLY_RETENTION_DAYS
+HOURLY_RETENTION_DAYS = 8
+
+# Same text format SQLAlchemy uses for SQLite DateTime columns
+BUCKET_FORMATS = {
+    "hour": "%Y-%m-%d %H:00:00.000000",
+    "day": "%Y-%m-%d 00:00:00.000000",
+}
+
+
+def upgrade():
+    if not sa.inspect(op.get_bind()).has_table(TABLE_NAME):
+        op.create_table(
+            TABLE_NAME,
+            sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+            sa.Column("granularity", sa.String(10), nullable=False),
+            sa.Column("bucket_start", sa.DateTime, nullable=False),
+            sa.Column("company_id", sa.Integer, nullable=False),
+            sa.Column("template_name", sa.String(100), nullable=False),
+            sa.Column("status", sa.String(9), nullable=False),
+            sa.Column("email_count", sa.Integer, nullable=False),
+            sa.UniqueConstraint(
+                "granularity", "bucket_start", "company_id", "template_name", "status",
+                name="uq_email_stats_rollups_bucket"
+            ),
+        )
+        op.create_index(f"ix_{TABLE_NAME}_id", TABLE_NAME, ["id"])
+
+    hourly_cutoff = datetime.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(days=HOURLY_RETENTION_DAYS)
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        # Left over from an interrupted run
+        connection.execute(sa.text(f"DELETE FROM {TABLE_NAME}"))
+
+        for granularity, bucket_format in BUCKET_FORMATS.items():
+            where_clause = "created_at >= :hourly_cutoff" if granularity == "hour" else "1 = 1"
+            run_in_batches(connection, "emails", f"""
+                INSERT INTO {TABLE_NAME} (granularity, bucket_start, company_id, template_name, status, email_count)
+                SELECT :granularity, strftime(:bucket_format, created_at), COALESCE(company_id, 0),
+                       COALESCE(template_name, ''), status, COUNT(id)
+                FROM emails
+                WHERE id >= :batch_start AND id < :batch_end AND {where_clause}
+                GROUP BY strftime(:bucket_format, created_at), COALESCE(company_id, 0),
+                         COALESCE(template_name, ''), status
+                ON CONFLICT (granularity, bucket_start, company_id, template_name, status)
+                DO UPDATE SET email_count = email_count + excluded.email_count
+            """, where_clause, {
+                "granularity": granularity,
+                "bucket_format": bucket_format,
+                "hourly_cutoff": hourly_cutoff.isoformat(sep=" ")
+            })
+
+
+def downgrade():
+    op.drop_table(TABLE_NAME)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Rebuild application statistics buckets for Meta Portal.
+Backfills application_stats_buckets (funnel and trend analytics) from the
+applications table, and the time-in-stage histograms from the status change
+log, in a single pass each. Run once after upgrading, or any time
+the buckets need to be recomputed.
+
+Usage:
+    python rebuild_application_stats.py
+"""
+
+import sys
+import os
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.config.database import SessionLocal, engine, Base
+from src.models.application import ApplicationStatsBucket, ApplicationStageLatency
+from src.services.application_history_service import application_history
+from src.services.application_stats_service import application_stats_buckets
+
+def rebuild_application_stats():
+    """Recompute daily buckets and stage time histograms from existing data"""
+    db = SessionLocal()
+
+    try:
+        # Make sure the bucket tables exist
+        Base.metadata.create_all(bind=engine, tables=[ApplicationStatsBucket.__table__, ApplicationStageLatency.__table__])
+
+        counts = application_stats_buckets.rebuild(db)
+        latency_counts = application_history.rebuild_latency(db)
+
+        print(f"✅ Applications counted: {counts['applications']}")
+        print(f"✅ Daily bucket rows: {counts['buckets']}")
+        print(f"✅ Status changes counted: {latency_counts['changes']}")
+        print(f"✅ Stage time histogram rows: {latency_counts['buckets']}")
+        print("\n🎉 Application stats buckets rebuilt!")
+
+    except Exception as e:
+        print(f"❌ Error rebuilding application stats: {str(e)}")
+        db.rollback()
+        raise
+
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    print("🚀 Rebuilding application stats buckets...")
+    rebuild_application_stats()
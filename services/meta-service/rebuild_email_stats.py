@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Rebuild email statistics rollups for Meta Portal.
+Backfills email_stats_rollups from the emails table. Run once after
+upgrading, or any time the rollups need to be recomputed.
+
+Usage:
+    python rebuild_email_stats.py
+"""
+
+import sys
+import os
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.config.database import SessionLocal, engine, Base
+from src.models.email import EmailStatsRollup
+from src.services.email_stats_service import email_stats_rollups
+
+def rebuild_email_stats():
+    """Recompute hourly and daily rollups from existing emails"""
+    db = SessionLocal()
+
+    try:
+        # Make sure the rollup table exists
+        Base.metadata.create_all(bind=engine, tables=[EmailStatsRollup.__table__])
+
+        counts = email_stats_rollups.rebuild(db)
+
+        print(f"✅ Hourly rollup rows: {counts['hour']}")
+        print(f"✅ Daily rollup rows: {counts['day']}")
+        print("\n🎉 Email stats rollups rebuilt!")
+
+    except Exception as e:
+        print(f"❌ Error rebuilding email stats: {str(e)}")
+        db.rollback()
+        raise
+
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    print("🚀 Rebuilding email stats rollups...")
+    rebuild_email_stats()
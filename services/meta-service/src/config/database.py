@@ -6,8 +6,10 @@ SQLite is a simple database that stores data in a single file.
 """
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 import os
 
 # Get the path to our project root (5 levels up to get to WorkdayJobApplicationAutomation/)
@@ -15,15 +17,45 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(o
 database_path = os.path.join(project_root, "databases", "meta.db")
 
 # Create the database URL - SQLite uses file:// format
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{database_path}"
+# DATABASE_URL overrides it (e.g. benchmarks point it at a scratch database)
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{database_path}")
+
+# Create tables and run pending migrations when the app starts. Off by
+# default: every worker process would run them at once, so deploys run
+# `alembic upgrade head` (or init_db.py) as their own step. Turn it on only
+# for a single-process development server.
+AUTO_CREATE_TABLES = os.getenv("DB_AUTO_CREATE_TABLES", "false").lower() == "true"
+
+# Connection pool limits (file databases and servers; in-memory SQLite uses a
+# single-connection pool that takes no limits). A request gets a connection
+# for its queries and gives it back when its transaction ends: dependencies
+# that query release it before the endpoint runs (release_connection), sync
+# endpoints release it before their response is validated in another thread
+# (utils/db_route.py), and get_db closes the session without waiting for a
+# worker thread. So no request holds a connection while it waits for a
+# thread, and a bounded pool cannot starve the threadpool.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+
+# How long a SQLite writer waits for the write lock before "database is locked"
+# (bursts of submissions queue up behind one writer at a time)
+DB_BUSY_TIMEOUT_SECONDS = float(os.getenv("DB_BUSY_TIMEOUT_SECONDS", "30"))
+
+def _engine_options(url: str) -> dict:
+    """connect_args and pool limits that apply to this database URL"""
+    options = {}
+    if url.startswith("sqlite"):
+        # check_same_thread=False allows multiple threads to use the same connection 
+        # this being able to have multiple users access the database at the same time
+        options["connect_args"] = {"check_same_thread": False, "timeout": DB_BUSY_TIMEOUT_SECONDS}
+    parsed_url = make_url(url)
+    if issubclass(parsed_url.get_dialect().get_pool_class(parsed_url), QueuePool):
+        options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT_SECONDS)
+    return options
 
 # Create the database engine
-# check_same_thread=False allows multiple threads to use the same connection 
-# this being able to have multiple users access the database at the same time
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}
-)
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **_engine_options(SQLALCHEMY_DATABASE_URL))
 
 # Create a session factory
 # Sessions are how we talk to the database
@@ -33,13 +65,73 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # All our database tables will inherit from this
 Base = declarative_base()
 
-def get_db():
+# Alembic revision of databases created by create_all before migrations existed
+BASELINE_REVISION = "0001"
+
+# services/meta-service, where alembic.ini and migrations/ live
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def init_db(bind=None):
+    """
+    Bring the database schema up to date.
+    - New database: create all tables from the models and stamp the latest migration
+    - Database from before Alembic: stamp the baseline, then run the migrations
+    - Otherwise: run any pending migrations
+    This is an explicit step (app startup, init_db.py) rather than something
+    that happens on import, so importing the app never touches the database.
+    """
+    from alembic import command
+    from sqlalchemy import inspect
+    from .. import models  # noqa: F401  (register all tables on Base.metadata)
+
+    with (bind or engine).connect() as connection:
+        inspector = inspect(connection)
+        versioned = inspector.has_table("alembic_version")
+        empty = not inspector.has_table("users")
+        # Alembic only manages transactions it starts itself
+        connection.commit()
+
+        config = _alembic_config(connection)
+        if not versioned and empty:
+            Base.metadata.create_all(bind=connection)
+            connection.commit()
+            command.stamp(config, "head")
+            return
+        if not versioned:
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, "head")
+
+def _alembic_config(connection):
+    """Alembic config that runs migrations on an existing connection"""
+    from alembic.config import Config
+
+    config = Config(os.path.join(SERVICE_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(SERVICE_DIR, "migrations"))
+    config.attributes["connection"] = connection
+    return config
+
+async def get_db():
     """
     This function creates a database session for each request.
     It's like opening a conversation with the database.
+    It is async so that closing the session (which hands its connection
+    back to the pool) does not have to wait for a free worker thread.
     """
     db = SessionLocal()
     try:
         yield db  # Give the session to whoever needs it
     finally:
         db.close()  # Always close the session when done
+
+def release_connection(db: Session):
+    """
+    End the session's read-only transaction so its connection goes back to
+    the pool, keeping loaded objects attached and unexpired.
+    Dependencies that query call this before returning, and sync endpoints
+    after returning (utils/db_route.py): FastAPI runs the next step in another
+    worker thread, and a request waiting for that thread must not hold a
+    connection meanwhile. The next query checks one out again.
+    """
+    transaction = db.get_transaction()
+    if transaction is not None and not (db.new or db.dirty or db.deleted):
+        transaction.close()
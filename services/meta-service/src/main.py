@@ -3,11 +3,11 @@
 # This is the entry point for our backend server.
 #
 # Flow:
-# 1. Creates all database tables from your models (User, Job, Application).
-# 2. Sets up the FastAPI app instance.
-# 3. Adds CORS middleware so your frontend (React, etc.) can call the backend API.
-# 4. Includes the user router, which enables /api/register and /api/login endpoints.
-# 5. Adds a health check endpoint for server status.
+# 1. Sets up the FastAPI app instance.
+# 2. Adds CORS middleware so your frontend (React, etc.) can call the backend API.
+# 3. Includes the user router, which enables /api/register and /api/login endpoints.
+# 4. Adds a health check endpoint for server status.
+# 5. Creates any missing database tables at startup (not at import time).
 
 
 # Import FastAPI and CORS middleware
@@ -16,13 +16,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from fastapi import status
-from fastapi.staticfiles import StaticFiles
 from pathlib import Path
+import os
 
-# Import database engine and Base for table creation
-from src.config.database import engine, Base
-# Import all models so tables are created
-from src.models import user, job, application, company, email, file_upload
+# Import database engine and the startup table-creation step
+from src.config.database import engine, init_db, AUTO_CREATE_TABLES
 
 
 # Import user, job, application, admin, email, and file_upload routers
@@ -33,11 +31,30 @@ from src.routes import admin as admin_routes
 from src.routes import email as email_routes
 from src.routes import file_upload as file_upload_routes
 from src.routes import resume as resume_routes
+from src.routes import monitoring as monitoring_routes
+from src.routes import backup as backup_routes
 
+# SQL statement counting / timing per request
+from src.utils.query_stats import install_query_hooks, QueryStatsMiddleware
+# Prometheus metrics (served at /metrics)
+from src.utils.metrics import MetricsMiddleware, instrument_pool
+# Sampling profiler (per-request opt-in via X-Profile header)
+from src.utils.profiler import ProfilingMiddleware
+# Brotli/gzip for dynamic responses, precompressed variants for static files
+from src.utils.compression import CompressionMiddleware
+from src.utils.static_files import PrecompressedStaticFiles
+# WAL mode without auto-checkpoints when WAL shipping is enabled
+from src.services.backup_service import install_wal_shipping
+
+# Background email worker (digests + queue), opt-in via EMAIL_WORKER_ENABLED
+from src.services.email_service import EmailConfig
+from src.services.email_worker import email_worker
 
-# Create all database tables from models (run once at startup)
-# This reads your SQLAlchemy models and creates the tables in the database if they don't exist.
-Base.metadata.create_all(bind=engine)
+
+# Time every SQL statement so requests can report their query count and DB time
+install_query_hooks(engine)
+instrument_pool(engine)
+install_wal_shipping(engine)
 
 
 # Create the FastAPI app instance
@@ -88,8 +105,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allow all HTTP methods
     allow_headers=["*"],  # Allow all headers
+    expose_headers=["X-Total-Count"],  # Paginated lists (e.g. /api/applications/me)
 )
 
+# Compress responses above COMPRESSION_MIN_SIZE (already-encoded ones pass through)
+app.add_middleware(CompressionMiddleware)
+
+# Record per-request query stats (Server-Timing header + per-route aggregates)
+app.add_middleware(QueryStatsMiddleware)
+
+# Profile requests that carry X-Profile: <PROFILER_HEADER_TOKEN>
+app.add_middleware(ProfilingMiddleware)
+
+# Request rate, latency and in-flight metrics (outermost, so it times everything)
+app.add_middleware(MetricsMiddleware)
+
 
 # Register the user, job, application, admin, email, and file_upload routers
 app.include_router(user_routes.router)
@@ -99,6 +129,28 @@ app.include_router(admin_routes.router)
 app.include_router(email_routes.router, prefix="/api", tags=["email"])
 app.include_router(file_upload_routes.router)
 app.include_router(resume_routes.router)
+app.include_router(monitoring_routes.router)
+app.include_router(backup_routes.router)
+
+# Create missing tables before anything else runs (only with DB_AUTO_CREATE_TABLES=true)
+# This reads your SQLAlchemy models and creates the tables in the database if they don't exist.
+@app.on_event("startup")
+def create_tables():
+    if AUTO_CREATE_TABLES:
+        init_db()
+
+
+# Start the in-process email worker when enabled
+@app.on_event("startup")
+async def start_email_worker():
+    if EmailConfig.WORKER_ENABLED:
+        email_worker.start()
+
+
+@app.on_event("shutdown")
+async def stop_email_worker():
+    await email_worker.stop()
+
 
 # Health check endpoint (define BEFORE static mount so it isn't shadowed)
 # You can visit http://localhost:8000/api/health to check if the server is running.
@@ -107,6 +159,8 @@ def root():
     return {"message": "Meta Portal API is running!"}
 
 # Mount static files for frontend LAST so API routes take precedence
-# Resolve absolute path to the frontend public directory regardless of CWD
-FRONTEND_DIR = Path(__file__).resolve().parents[3] / "frontend" / "meta-ui" / "public"
-app.mount("/", StaticFiles(directory=str(FRONTEND_DIR), html=True), name="static")
+# Resolve absolute path to the frontend public directory regardless of CWD.
+# Set FRONTEND_DIR to the output of frontend/meta-ui/build_assets.py (dist/)
+# to serve content-hashed, precompressed assets.
+FRONTEND_DIR = Path(os.getenv("FRONTEND_DIR") or Path(__file__).resolve().parents[3] / "frontend" / "meta-ui" / "public")
+app.mount("/", PrecompressedStaticFiles(directory=str(FRONTEND_DIR), html=True), name="static")
@@ -1,17 +1,17 @@
 # This file makes the models directory a Python package
 from .user import User
 from .job import Job
-from .application import Application
+from .application import Application, ApplicationStatsBucket, ApplicationStatusChange, ApplicationStageLatency
 from .company import Company
-from .email import Email, EmailTemplate, EmailPreference, EmailQueue, EmailStatus, EmailPriority
+from .email import Email, EmailTemplate, EmailPreference, EmailQueue, EmailBatch, EmailDigestItem, EmailStatsRollup, EmailStatus, EmailPriority
 from .file_upload import (
     FileUpload, Resume, ResumeProcessingLog, FileAccessLog,
     ResumeStatus, UploadStatus, ScanStatus, StorageBackend, AccessLevel
 )
 
 __all__ = [
-    "User", "Job", "Application", "Company", 
-    "Email", "EmailTemplate", "EmailPreference", "EmailQueue", "EmailStatus", "EmailPriority",
+    "User", "Job", "Application", "ApplicationStatsBucket", "ApplicationStatusChange", "ApplicationStageLatency", "Company", 
+    "Email", "EmailTemplate", "EmailPreference", "EmailQueue", "EmailBatch", "EmailDigestItem", "EmailStatsRollup", "EmailStatus", "EmailPriority",
     "FileUpload", "Resume", "ResumeProcessingLog", "FileAccessLog",
     "ResumeStatus", "UploadStatus", "ScanStatus", "StorageBackend", "AccessLevel"
 ]
@@ -4,7 +4,7 @@ Application model for Meta Portal.
 This tracks job applications submitted by users.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from src.config.database import Base
@@ -49,10 +49,120 @@ class Application(Base):
     # Resume relationship - resume submitted with this application
     resume = relationship("Resume", back_populates="application", uselist=False)
 
+    # One application per user and job, enforced by the database
+    # (submissions use INSERT ... ON CONFLICT DO NOTHING against this index)
+    __table_args__ = (
+        Index("uq_applications_user_job", "user_id", "job_id", unique=True),
+    )
+
     def __repr__(self):
         return f"<Application(id={self.id}, user_id={self.user_id}, job_id={self.job_id}, status='{self.status}')>"
 
 
+class ApplicationStatsBucket(Base):
+    """
+    Precomputed application activity per day, company, job and status change
+    Kept current with deltas as applications are submitted and change
+    status, so funnel and trend analytics never scan the applications table.
+    Rows with job_id 0 hold the company-wide total of each day.
+    """
+    __tablename__ = "application_stats_buckets"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Bucket
+    day = Column(DateTime, nullable=False)  # UTC midnight
+
+    # Dimensions (0 / '' stand in for "none" so the unique key works)
+    company_id = Column(Integer, nullable=False, default=0)
+    job_id = Column(Integer, nullable=False, default=0)  # 0: all jobs of the company
+    from_status = Column(String(50), nullable=False, default="")  # '': newly received
+    to_status = Column(String(50), nullable=False)
+
+    # Measures
+    event_count = Column(Integer, nullable=False, default=0)
+    # First reviews (moves out of "submitted") and their summed wait since applied_at
+    review_count = Column(Integer, nullable=False, default=0)
+    review_seconds = Column(Float, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "day", "company_id", "job_id", "from_status", "to_status",
+            name="uq_application_stats_buckets_bucket"
+        ),
+    )
+
+    def __repr__(self):
+        return f"<ApplicationStatsBucket({self.day}, company={self.company_id}, job={self.job_id}, '{self.from_status}'->'{self.to_status}', count={self.event_count})>"
+
+
+class ApplicationStatusChange(Base):
+    """
+    Append-only log of application status changes
+    Written in the same transaction as the change itself; seconds_in_stage
+    is how long the application had been in from_status.
+    """
+    __tablename__ = "application_status_changes"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+
+    application_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=True)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=True)
+    changed_by = Column(Integer, ForeignKey("users.id"), nullable=True)  # None: system or unknown
+
+    from_status = Column(String(50), nullable=False)
+    to_status = Column(String(50), nullable=False)
+    changed_at = Column(DateTime, nullable=False)  # UTC
+    seconds_in_stage = Column(Float, nullable=True)
+
+    __table_args__ = (
+        Index("ix_application_status_changes_company_changed", "company_id", "changed_at"),
+        Index("ix_application_status_changes_application_changed", "application_id", "changed_at"),
+    )
+
+    def __repr__(self):
+        return f"<ApplicationStatusChange(application_id={self.application_id}, '{self.from_status}'->'{self.to_status}', at={self.changed_at})>"
+
+
+class ApplicationStageLatency(Base):
+    """
+    Histogram of time spent in a status before each change, per day, company,
+    job and status change
+    bin is an index into LATENCY_BIN_SECONDS (application_history_service),
+    so medians and percentiles per job can be estimated from a few rows
+    without reading the status change log. Rows with job_id 0 hold the
+    company-wide histogram.
+    """
+    __tablename__ = "application_stage_latency"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Bucket
+    day = Column(DateTime, nullable=False)  # UTC midnight of the change
+
+    # Dimensions (0 stands in for "none" so the unique key works)
+    company_id = Column(Integer, nullable=False, default=0)
+    job_id = Column(Integer, nullable=False, default=0)  # 0: all jobs of the company
+    from_status = Column(String(50), nullable=False)
+    to_status = Column(String(50), nullable=False)
+    bin = Column(Integer, nullable=False)
+
+    # Measures
+    change_count = Column(Integer, nullable=False, default=0)
+    total_seconds = Column(Float, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "day", "company_id", "job_id", "from_status", "to_status", "bin",
+            name="uq_application_stage_latency_bucket"
+        ),
+    )
+
+    def __repr__(self):
+        return f"<ApplicationStageLatency({self.day}, company={self.company_id}, job={self.job_id}, '{self.from_status}'->'{self.to_status}', bin={self.bin}, count={self.change_count})>"
+
+
 # CREATE  TABLE applications(
 #     id INTEGER PRIMARY KEY AUTOINCREMENT,
 #     FOREING KEY(user_id) REFERENCES users(id),
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, ForeignKey, Enum, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .base import Base
@@ -64,6 +64,7 @@ class Email(Base):
     tracking_enabled = Column(Boolean, default=False, nullable=False)
     tracking_id = Column(String(100), nullable=True, unique=True, index=True)
     external_message_id = Column(String(255), nullable=True)  # SMTP message ID
+    batch_id = Column(String(64), ForeignKey("email_batches.batch_id"), nullable=True, index=True)  # Bulk send batch
     
     # Audit fields
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -76,6 +77,7 @@ class Email(Base):
     creator = relationship("User", foreign_keys=[created_by])
     application = relationship("Application", back_populates="emails")
     job = relationship("Job", back_populates="emails")
+    batch = relationship("EmailBatch", back_populates="emails")
 
     def __repr__(self):
         return f"<Email(id={self.id}, recipient='{self.recipient_email}', subject='{self.subject[:50]}...', status='{self.status.value}')>"
@@ -204,4 +206,110 @@ class EmailQueue(Base):
     email = relationship("Email", backref="queue_entries")
 
     def __repr__(self):
-        return f"<EmailQueue(id={self.id}, email_id={self.email_id}, status='{self.status}', queue='{self.queue_name}')>"
\ No newline at end of file
+        return f"<EmailQueue(id={self.id}, email_id={self.email_id}, status='{self.status}', queue='{self.queue_name}')>"
+
+class EmailBatch(Base):
+    """
+    Bulk email batch tracking model
+    Records the progress of a bulk send so it can be polled by batch_id
+    """
+    __tablename__ = "email_batches"
+
+    id = Column(Integer, primary_key=True, index=True)
+    batch_id = Column(String(64), nullable=False, unique=True, index=True)
+
+    # Batch Details
+    template_name = Column(String(100), nullable=False)
+    status = Column(String(20), default="queued", nullable=False, index=True)  # queued, processing, completed, failed
+    total_requested = Column(Integer, default=0, nullable=False)
+    emails_queued = Column(Integer, default=0, nullable=False)
+    failed_count = Column(Integer, default=0, nullable=False)
+    failed_recipients = Column(JSON, nullable=True)  # First few render/insert failures
+    error_message = Column(Text, nullable=True)
+
+    # Relationships
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=True, index=True)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+
+    # Timestamps
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    emails = relationship("Email", back_populates="batch")
+
+    def __repr__(self):
+        return f"<EmailBatch(batch_id='{self.batch_id}', status='{self.status}', queued={self.emails_queued}/{self.total_requested})>"
+
+
+class EmailDigestItem(Base):
+    """
+    Buffered notification waiting for a user's daily or weekly digest
+    Items are coalesced into one digest email per user per window
+    """
+    __tablename__ = "email_digest_items"
+
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Recipient
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=True, index=True)
+    recipient_email = Column(String(255), nullable=False)
+    
+    # Rendered notification
+    template_name = Column(String(100), nullable=False)
+    subject = Column(String(500), nullable=False)
+    text_content = Column(Text, nullable=True)
+    
+    # Context
+    application_id = Column(Integer, ForeignKey("applications.id"), nullable=True)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=True)
+    
+    # Delivery (set once the item has gone out in a digest email)
+    digest_email_id = Column(Integer, ForeignKey("emails.id"), nullable=True)
+    delivered_at = Column(DateTime, nullable=True)
+    
+    # Audit fields
+    created_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        # Pending items are looked up by "digest_email_id IS NULL", grouped by user
+        Index("ix_email_digest_items_pending", "digest_email_id", "user_id", "created_at"),
+    )
+
+    def __repr__(self):
+        return f"<EmailDigestItem(id={self.id}, user_id={self.user_id}, template='{self.template_name}', delivered={self.digest_email_id is not None})>"
+
+
+class EmailStatsRollup(Base):
+    """
+    Precomputed email counts per time bucket, company, template and status
+    Kept current with +1/-1 deltas as emails are created and change status,
+    so statistics never have to scan the emails table.
+    """
+    __tablename__ = "email_stats_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Bucket
+    granularity = Column(String(10), nullable=False)  # hour, day
+    bucket_start = Column(DateTime, nullable=False)  # UTC, truncated to the granularity
+    
+    # Dimensions (0 / '' stand in for "none" so the unique key works)
+    company_id = Column(Integer, nullable=False, default=0)
+    template_name = Column(String(100), nullable=False, default="")
+    status = Column(Enum(EmailStatus), nullable=False)
+    
+    # Measure
+    email_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "granularity", "bucket_start", "company_id", "template_name", "status",
+            name="uq_email_stats_rollups_bucket"
+        ),
+    )
+
+    def __repr__(self):
+        return f"<EmailStatsRollup({self.granularity} {self.bucket_start}, company={self.company_id}, template='{self.template_name}', status='{self.status.value}', count={self.email_count})>"
@@ -35,7 +35,8 @@ class Job(Base):
     # Job details (Text allows longer content than String)
     description = Column(Text, nullable=False)
     requirements = Column(Text, nullable=True)
-    # TODO: Add benefits and remote_options columns later via migration
+    benefits = Column(Text, nullable=True)
+    remote_options = Column(String(50), nullable=True, server_default="On-site")  # On-site, Hybrid, Remote
     
     # Timestamps and status
     posted_date = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -3,25 +3,37 @@ Admin routes for Meta Portal.
 Handles admin dashboard, application management, and statistics.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from typing import Optional
+from sqlalchemy import func, desc, select
+from typing import List, Optional
 from datetime import datetime, timedelta
 from src.config.database import get_db
 from src.models.user import User
 from src.models.application import Application
 from src.models.job import Job
 from src.models.company import Company
-from src.routes.user import get_current_user, get_user_company_context
-from src.utils.multitenant import filter_by_company, ensure_company_access, auto_set_company_id
+from src.routes.user import get_current_user, get_user_company_context, get_tenant_db, get_tenant_loader
+from src.utils.multitenant import ensure_company_access, auto_set_company_id, TenantLoader
+from src.utils.fast_json import json_response, rows_to_dicts
+from src.utils.db_route import SessionReleasingRoute
+from src.services.export_service import (
+    EXPORT_FORMATS, applications_export_query, users_export_query, stream_export
+)
+from src.services.application_status_service import (
+    ApplicationStatusConflict, ApplicationStatusError, application_status_service
+)
+from src.services.application_stats_service import application_stats_buckets
+from src.services.application_history_service import application_history
 from pydantic import BaseModel
 
-router = APIRouter(prefix="/api/admin", tags=["admin"])
+router = APIRouter(prefix="/api/admin", tags=["admin"], route_class=SessionReleasingRoute)
 
 
 # Dependency to check if user is admin
-def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+# (no I/O, so async: it runs on the event loop instead of taking a worker thread)
+async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
     """Verify that the current user has admin privileges."""
     if not current_user.is_admin:
         raise HTTPException(
@@ -36,6 +48,19 @@ class ApplicationStatusUpdate(BaseModel):
     status: str
 
 
+# Schema for moving many applications at once (by IDs or by filter)
+class ApplicationFilter(BaseModel):
+    status: Optional[str] = None
+    job_id: Optional[int] = None
+
+
+class BulkApplicationStatusUpdate(BaseModel):
+    status: str
+    application_ids: Optional[List[int]] = None
+    filter: Optional[ApplicationFilter] = None
+    notify: bool = True
+
+
 # Schema for job creation/update
 class JobCreate(BaseModel):
     title: str
@@ -44,11 +69,11 @@ class JobCreate(BaseModel):
     location: str
     description: str
     requirements: Optional[str] = None
-    benefits: Optional[str] = None  # Will be ignored if column doesn't exist
+    benefits: Optional[str] = None
     salary_min: Optional[int] = None
     salary_max: Optional[int] = None
     job_type: str = "Full-time"
-    remote_options: Optional[str] = "On-site"  # Will be ignored if column doesn't exist
+    remote_options: Optional[str] = "On-site"
     is_active: bool = True
 
 
@@ -117,67 +142,92 @@ class CompanySettingsUpdate(BaseModel):
 @router.get("/applications")
 def get_all_applications(
     status: Optional[str] = None,
-    db: Session = Depends(get_db),
-    admin: User = Depends(get_current_admin),
-    company_context: dict = Depends(get_user_company_context)
+    db: Session = Depends(get_tenant_db),
+    admin: User = Depends(get_current_admin)
 ):
-    """Get all applications with user and job information (admin only)."""
-    query = db.query(Application).join(User).join(Job)
-    
-    # Filter by company for multi-tenancy
-    query = filter_by_company(query, Application, company_context['company_id'], company_context['is_admin'])
+    """
+    Get all applications with user and job information (admin only).
+    Applicants, jobs and companies come from one joined query whose rows are
+    written straight to JSON.
+    """
+    # Company filtering is applied by the tenant session
+    query = (
+        select(
+            Application.id, Application.status, Application.applied_at, Application.cover_letter,
+            User.id.label("user_id"), User.first_name, User.last_name, User.email, User.phone,
+            Job.id.label("job_id"), Job.title, Company.name.label("company_name"), Job.department, Job.location
+        )
+        .join(User, User.id == Application.user_id)
+        .join(Job, Job.id == Application.job_id)
+        .outerjoin(Company, Company.id == Job.company_id)
+    )
     
     # Filter by status if provided
     if status and status != "all":
-        query = query.filter(Application.status == status)
+        query = query.where(Application.status == status)
     
-    applications = query.order_by(Application.applied_at.desc()).all()
+    rows = db.execute(query.order_by(Application.applied_at.desc()))
     
     # Build response with user and job details
-    result = []
-    for app in applications:
-        # Get company name from company_id
-        company_name = "N/A"
-        if app.job.company_id:
-            company_obj = db.query(Company).filter(Company.id == app.job.company_id).first()
-            if company_obj:
-                company_name = company_obj.name
-        
-        result.append({
-            "id": app.id,
-            "status": app.status,
-            "applied_at": app.applied_at,
-            "cover_letter": app.cover_letter,
+    return json_response([
+        {
+            "id": row.id,
+            "status": row.status,
+            "applied_at": row.applied_at,
+            "cover_letter": row.cover_letter,
             "user": {
-                "id": app.user.id,
-                "name": f"{app.user.first_name} {app.user.last_name}",
-                "email": app.user.email,
-                "phone": app.user.phone
+                "id": row.user_id,
+                "name": f"{row.first_name} {row.last_name}",
+                "email": row.email,
+                "phone": row.phone
             },
             "job": {
-                "id": app.job.id,
-                "title": app.job.title,
-                "company": company_name,
-                "department": app.job.department,
-                "location": app.job.location
+                "id": row.job_id,
+                "title": row.title,
+                "company": row.company_name or "N/A",
+                "department": row.department,
+                "location": row.location
             }
-        })
-    
-    return result
+        }
+        for row in rows
+    ])
+
+
+def _export_response(query, key_column, name: str, export_format: str, gzip: bool) -> StreamingResponse:
+    """Stream an export (ordered by key_column) as a file download"""
+    filename = f"{name}-{datetime.utcnow():%Y%m%d-%H%M%S}.{export_format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        stream_export(query, key_column, export_format, compress=gzip),
+        media_type="application/gzip" if gzip else EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+# Export applications (streamed, constant memory)
+@router.get("/applications/export")
+def export_applications(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    gzip: bool = False,
+    status: Optional[str] = None,
+    admin: User = Depends(get_current_admin),
+    company_context: dict = Depends(get_user_company_context)
+):
+    """Stream all applications as CSV or NDJSON, optionally gzip-compressed (admin only)."""
+    query = applications_export_query(company_context['company_id'], company_context['is_admin'], status)
+    return _export_response(query, Application.id, "applications", format, gzip)
 
 
 # Get admin dashboard statistics
 @router.get("/stats")
 def get_admin_stats(
-    db: Session = Depends(get_db),
-    admin: User = Depends(get_current_admin),
-    company_context: dict = Depends(get_user_company_context)
+    db: Session = Depends(get_tenant_db),
+    admin: User = Depends(get_current_admin)
 ):
     """Get statistics for admin dashboard."""
-    # Base queries with company filtering
-    app_query = filter_by_company(db.query(Application), Application, company_context['company_id'], company_context['is_admin'])
-    job_query = filter_by_company(db.query(Job), Job, company_context['company_id'], company_context['is_admin'])
-    user_query = filter_by_company(db.query(User), User, company_context['company_id'], company_context['is_admin'])
+    # Base queries (company filtering is applied by the tenant session)
+    app_query = db.query(Application)
+    job_query = db.query(Job)
+    user_query = db.query(User)
     
     total_applications = app_query.count()
     total_jobs = job_query.filter(Job.is_active == True).count()
@@ -209,27 +259,73 @@ def get_admin_stats(
 def update_application_status(
     app_id: int,
     status_update: ApplicationStatusUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_tenant_db),
     admin: User = Depends(get_current_admin),
     company_context: dict = Depends(get_user_company_context)
 ):
-    """Update the status of a specific application (admin only)."""
+    """
+    Update the status of a specific application (admin only).
+    Goes through the same transition rules and history log as the bulk update.
+    """
     # Ensure admin can only access applications from their company
-    application = ensure_company_access(db, Application, app_id, company_context['company_id'], company_context['is_admin'])
+    ensure_company_access(db, Application, app_id, company_context['company_id'], company_context['is_admin'])
     
-    # Validate status
-    valid_statuses = ["submitted", "in_review", "interview", "accepted", "rejected"]
-    if status_update.status not in valid_statuses:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
-        )
+    try:
+        application_status_service.update_one(db, None, app_id, status_update.status, changed_by=admin.id)
+    except ApplicationStatusConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ApplicationStatusError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    application.status = status_update.status
-    db.commit()
-    db.refresh(application)
-    
-    return {"message": "Application status updated successfully", "status": application.status}
+    return {"message": "Application status updated successfully", "status": status_update.status}
+
+
+# Status history of an application
+@router.get("/applications/{app_id}/history")
+def get_application_history(
+    app_id: int,
+    db: Session = Depends(get_tenant_db),
+    admin: User = Depends(get_current_admin),
+    company_context: dict = Depends(get_user_company_context)
+):
+    """Get every status change of an application with its time in the previous stage (admin only)."""
+    application = ensure_company_access(db, Application, app_id, company_context['company_id'], company_context['is_admin'])
+    return {
+        "application_id": application.id,
+        "status": application.status,
+        "applied_at": application.applied_at,
+        "history": application_history.get_history(db, application.id)
+    }
+
+
+# Update the status of many applications
+@router.patch("/applications/status")
+def bulk_update_application_status(
+    status_update: BulkApplicationStatusUpdate,
+    db: Session = Depends(get_tenant_db),
+    loader: TenantLoader = Depends(get_tenant_loader),
+    admin: User = Depends(get_current_admin)
+):
+    """
+    Move applications (listed by ID, or matching a filter) to a new status (admin only).
+    Transitions are validated per application, applied in one UPDATE and
+    notified in one batch; the response has a result for every ID.
+    """
+    if (status_update.application_ids is None) == (status_update.filter is None):
+        raise HTTPException(status_code=400, detail="Provide either application_ids or filter")
+    
+    criteria = status_update.filter or ApplicationFilter()
+    try:
+        return application_status_service.bulk_update(
+            db, loader, status_update.status,
+            application_ids=status_update.application_ids,
+            current_status=criteria.status,
+            job_id=criteria.job_id,
+            notify=status_update.notify,
+            changed_by=admin.id
+        )
+    except ApplicationStatusError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 # ==================== JOB MANAGEMENT ENDPOINTS ====================
@@ -237,55 +333,39 @@ def update_application_status(
 # Get all jobs (admin view)
 @router.get("/jobs")
 def get_all_jobs(
-    db: Session = Depends(get_db),
-    admin: User = Depends(get_current_admin),
-    company_context: dict = Depends(get_user_company_context)
+    db: Session = Depends(get_tenant_db),
+    admin: User = Depends(get_current_admin)
 ):
-    """Get all jobs with application counts (admin only)."""
-    # Filter jobs by company
-    job_query = filter_by_company(db.query(Job), Job, company_context['company_id'], company_context['is_admin'])
-    jobs = job_query.order_by(Job.posted_date.desc()).all()
-    
-    # Add application count for each job
-    result = []
-    for job in jobs:
-        # Filter application count by company as well
-        app_query = filter_by_company(db.query(Application), Application, company_context['company_id'], company_context['is_admin'])
-        app_count = app_query.filter(Application.job_id == job.id).count()
-        
-        # Get company name from company_id
-        company_name = "N/A"
-        if job.company_id:
-            company_obj = db.query(Company).filter(Company.id == job.company_id).first()
-            if company_obj:
-                company_name = company_obj.name
-        
-        result.append({
-            "id": job.id,
-            "title": job.title,
-            "company": company_name,
-            "department": job.department,
-            "location": job.location,
-            "description": job.description,
-            "requirements": job.requirements,
-            "benefits": getattr(job, 'benefits', None),  # Default if column doesn't exist
-            "salary_min": job.salary_min,
-            "salary_max": job.salary_max,
-            "job_type": job.job_type,
-            "remote_options": getattr(job, 'remote_options', 'On-site'),  # Default if column doesn't exist
-            "is_active": job.is_active,
-            "posted_date": job.posted_date,
-            "application_count": app_count
-        })
-    
-    return result
+    """
+    Get all jobs with application counts (admin only).
+    Company names and counts are joined into one query whose rows are
+    written straight to JSON.
+    """
+    # Application counts for all jobs at once
+    app_counts = (
+        select(Application.job_id, func.count(Application.id).label("application_count"))
+        .group_by(Application.job_id)
+        .subquery()
+    )
+    query = (
+        select(
+            Job.id, Job.title, func.coalesce(Company.name, "N/A").label("company"), Job.department, Job.location,
+            Job.description, Job.requirements, Job.benefits, Job.salary_min, Job.salary_max, Job.job_type,
+            Job.remote_options, Job.is_active, Job.posted_date,
+            func.coalesce(app_counts.c.application_count, 0).label("application_count")
+        )
+        .outerjoin(Company, Company.id == Job.company_id)
+        .outerjoin(app_counts, app_counts.c.job_id == Job.id)
+        .order_by(Job.posted_date.desc())
+    )
+    return json_response(rows_to_dicts(db.execute(query)))
 
 
 # Create new job
 @router.post("/jobs")
 def create_job(
     job_data: JobCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_tenant_db),
     admin: User = Depends(get_current_admin),
     company_context: dict = Depends(get_user_company_context)
 ):
@@ -297,18 +377,14 @@ def create_job(
         location=job_data.location,
         description=job_data.description,
         requirements=job_data.requirements,
+        benefits=job_data.benefits,
         salary_min=job_data.salary_min,
         salary_max=job_data.salary_max,
         job_type=job_data.job_type,
+        remote_options=job_data.remote_options,
         is_active=job_data.is_active
     )
     
-    # Add benefits and remote_options if columns exist
-    if hasattr(Job, 'benefits'):
-        new_job.benefits = job_data.benefits
-    if hasattr(Job, 'remote_options'):
-        new_job.remote_options = job_data.remote_options
-    
     # Set company_id for multi-tenancy
     auto_set_company_id(db, new_job, company_context['company_id'])
     
@@ -324,7 +400,7 @@ def create_job(
 def update_job(
     job_id: int,
     job_data: JobUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_tenant_db),
     admin: User = Depends(get_current_admin),
     company_context: dict = Depends(get_user_company_context)
 ):
@@ -346,7 +422,7 @@ def update_job(
 @router.delete("/jobs/{job_id}")
 def delete_job(
     job_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_tenant_db),
     admin: User = Depends(get_current_admin)
 ):
     """Delete a job posting (admin only)."""
@@ -374,7 +450,7 @@ def delete_job(
 def toggle_job_status(
     job_id: int,
     status_update: JobStatusUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_tenant_db),
     admin: User = Depends(get_current_admin)
 ):
     """Toggle job active status (admin only)."""
@@ -394,7 +470,8 @@ def toggle_job_status(
 # Get job analytics
 @router.get("/jobs/analytics")
 def get_job_analytics(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_tenant_db),
+    loader: TenantLoader = Depends(get_tenant_loader),
     admin: User = Depends(get_current_admin)
 ):
     """Get job performance analytics (admin only)."""
@@ -419,18 +496,15 @@ def get_job_analytics(
     inactive_jobs = db.query(Job).filter(Job.is_active == False).count()
     
     # Build response with company names
+    companies = loader.load_many(Company, [job.company_id for job in top_jobs_query])
     top_jobs_result = []
     for job in top_jobs_query:
-        company_name = "N/A"
-        if job.company_id:
-            company_obj = db.query(Company).filter(Company.id == job.company_id).first()
-            if company_obj:
-                company_name = company_obj.name
+        company = companies.get(job.company_id)
         
         top_jobs_result.append({
             "id": job.id,
             "title": job.title,
-            "company": company_name,
+            "company": company.name if company else "N/A",
             "application_count": job.app_count
         })
     
@@ -443,54 +517,116 @@ def get_job_analytics(
     }
 
 
+# ==================== APPLICATION ANALYTICS ENDPOINTS ====================
+
+# Application funnel
+@router.get("/analytics/funnel")
+def get_application_funnel(
+    days: int = Query(30, ge=1, le=366),
+    job_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+    company_context: dict = Depends(get_user_company_context)
+):
+    """
+    Applications received over the last `days` days, how many reached each
+    status and the average time to first review (admin only).
+    Answered from daily buckets; optionally limited to one job.
+    """
+    return application_stats_buckets.get_funnel(db, company_context['company_id'], job_id, days)
+
+
+# Daily application trend
+@router.get("/analytics/trends")
+def get_application_trends(
+    days: int = Query(30, ge=1, le=366),
+    job_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+    company_context: dict = Depends(get_user_company_context)
+):
+    """Per-day received applications, status changes and time to first review (admin only)."""
+    return {
+        "days": days,
+        "trend": application_stats_buckets.get_trend(db, company_context['company_id'], job_id, days)
+    }
+
+
+# Time spent in each stage
+@router.get("/analytics/stage-times")
+def get_application_stage_times(
+    days: int = Query(30, ge=1, le=366),
+    job_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+    company_context: dict = Depends(get_user_company_context)
+):
+    """
+    Average, median and 90th percentile time spent in a status before each
+    kind of status change over the last `days` days (admin only).
+    Answered from time-in-stage histograms; optionally limited to one job.
+    """
+    return {
+        "days": days,
+        "stages": application_history.get_stage_times(db, company_context['company_id'], job_id, days)
+    }
+
+
 # ==================== USER MANAGEMENT ENDPOINTS ====================
 
 # Get all users (admin view)
 @router.get("/users")
 def get_all_users(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_tenant_db),
+    admin: User = Depends(get_current_admin)
+):
+    """
+    Get all users with application counts and statistics (admin only).
+    Per-user counts and latest application dates are joined into one query
+    whose rows are written straight to JSON.
+    """
+    # Application count and latest application date per user (company-filtered)
+    app_stats = (
+        select(
+            Application.user_id,
+            func.count(Application.id).label("application_count"),
+            func.max(Application.applied_at).label("latest_application")
+        )
+        .group_by(Application.user_id)
+        .subquery()
+    )
+    query = (
+        select(
+            User.id, User.email, User.first_name, User.last_name,
+            (User.first_name + " " + User.last_name).label("full_name"),
+            User.phone, User.is_admin, User.is_active, User.created_at,
+            func.coalesce(app_stats.c.application_count, 0).label("application_count"),
+            app_stats.c.latest_application
+        )
+        .outerjoin(app_stats, app_stats.c.user_id == User.id)
+        .order_by(User.created_at.desc())
+    )
+    return json_response(rows_to_dicts(db.execute(query)))
+
+
+# Export users (declared before /users/{user_id} so "export" is not taken as an id)
+@router.get("/users/export")
+def export_users(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    gzip: bool = False,
     admin: User = Depends(get_current_admin),
     company_context: dict = Depends(get_user_company_context)
 ):
-    """Get all users with application counts and statistics (admin only)."""
-    # Filter users by company
-    user_query = filter_by_company(db.query(User), User, company_context['company_id'], company_context['is_admin'])
-    users = user_query.order_by(User.created_at.desc()).all()
-    
-    # Add application count and statistics for each user
-    result = []
-    for user in users:
-        # Filter applications by company as well
-        app_query = filter_by_company(db.query(Application), Application, company_context['company_id'], company_context['is_admin'])
-        app_count = app_query.filter(Application.user_id == user.id).count()
-        
-        # Get user's latest application date (company-filtered)
-        latest_app = app_query.filter(Application.user_id == user.id)\
-                      .order_by(Application.applied_at.desc())\
-                      .first()
-        
-        result.append({
-            "id": user.id,
-            "email": user.email,
-            "first_name": user.first_name,
-            "last_name": user.last_name,
-            "full_name": f"{user.first_name} {user.last_name}",
-            "phone": user.phone,
-            "is_admin": user.is_admin,
-            "is_active": getattr(user, 'is_active', True),  # Default to active if column doesn't exist
-            "created_at": user.created_at,
-            "application_count": app_count,
-            "latest_application": latest_app.applied_at if latest_app else None
-        })
-    
-    return result
+    """Stream all users with application counts as CSV or NDJSON, optionally gzip-compressed (admin only)."""
+    query = users_export_query(company_context['company_id'], company_context['is_admin'])
+    return _export_response(query, User.id, "users", format, gzip)
 
 
 # Get user details
 @router.get("/users/{user_id}")
 def get_user_details(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_tenant_db),
     admin: User = Depends(get_current_admin),
     company_context: dict = Depends(get_user_company_context)
 ):
@@ -499,7 +635,7 @@ def get_user_details(
     user = ensure_company_access(db, User, user_id, company_context['company_id'], company_context['is_admin'])
     
     # Get user's applications with job details (company-filtered)
-    app_query = filter_by_company(db.query(Application), Application, company_context['company_id'], company_context['is_admin'])
+    app_query = db.query(Application)
     applications = app_query.join(Job)\
                      .filter(Application.user_id == user_id)\
                      .order_by(Application.applied_at.desc())\
@@ -523,7 +659,7 @@ def get_user_details(
         "last_name": user.last_name,
         "phone": user.phone,
         "is_admin": user.is_admin,
-        "is_active": getattr(user, 'is_active', True),
+        "is_active": user.is_active,
         "created_at": user.created_at,
         "updated_at": user.updated_at,
         "application_count": len(user_applications),
@@ -539,7 +675,7 @@ def get_user_details(
 def toggle_user_status(
     user_id: int,
     status_update: UserStatusUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_tenant_db),
     admin: User = Depends(get_current_admin),
     company_context: dict = Depends(get_user_company_context)
 ):
@@ -570,7 +706,7 @@ def toggle_user_status(
 def toggle_user_admin(
     user_id: int,
     admin_update: UserAdminUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_tenant_db),
     admin: User = Depends(get_current_admin),
     company_context: dict = Depends(get_user_company_context)
 ):
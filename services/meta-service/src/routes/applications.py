@@ -3,114 +3,122 @@ Application routes for Meta Portal.
 Handles job application submission and retrieval for users.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
-from src.config.database import get_db
 from src.models.application import Application
+from src.models.company import Company
 from src.models.user import User
 from src.models.job import Job
 from src.schemas import ApplicationCreate, ApplicationRead
-from src.routes.user import get_current_user, get_user_company_context
-from src.utils.multitenant import filter_by_company, ensure_company_access, auto_set_company_id
+from src.routes.user import get_current_user, get_user_company_context, get_tenant_db
+from src.services.application_stats_service import application_stats_buckets
+from src.services.application_status_service import (
+    ApplicationStatusConflict, ApplicationStatusError, application_status_service
+)
+from src.services.digest_service import digest_scheduler, Notification
+from src.services.my_applications_service import my_applications_service, MyApplicationsConfig
+from src.utils.multitenant import ensure_company_access
+from src.utils.db_route import SessionReleasingRoute
 
-router = APIRouter(prefix="/api/applications", tags=["applications"])
+CONFIRMATION_TEMPLATE_NAME = "job_application_confirmation"
+
+router = APIRouter(prefix="/api/applications", tags=["applications"], route_class=SessionReleasingRoute)
 
 @router.post("/", response_model=ApplicationRead)
 def apply_to_job(
     application: ApplicationCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_tenant_db),
     current_user: User = Depends(get_current_user),
     company_context: dict = Depends(get_user_company_context)
 ):
     """
     Submit a new job application for the current user.
-    Prevents duplicate applications for the same job.
+    Duplicates are rejected by the unique (user_id, job_id) index within the
+    INSERT itself, so concurrent double submits cannot both succeed.
     """
     # Ensure the job exists and user can apply to it
     job = ensure_company_access(db, Job, application.job_id, company_context['company_id'], company_context['is_admin'])
     
-    # Check if already applied
-    existing = db.query(Application).filter_by(user_id=current_user.id, job_id=application.job_id).first()
-    if existing:
+    # Insert unless already applied (company_id is inherited from the job)
+    app = db.scalars(
+        sqlite_insert(Application)
+        .values(
+            user_id=current_user.id,
+            job_id=job.id,
+            company_id=job.company_id if job.company_id is not None else company_context['company_id'],
+            cover_letter=application.cover_letter,
+            additional_info=application.additional_info,
+            status="submitted"
+        )
+        .on_conflict_do_nothing(index_elements=["user_id", "job_id"])
+        .returning(Application)
+    ).first()
+    if app is None:
         raise HTTPException(status_code=400, detail="Already applied to this job")
+    application_stats_buckets.record_received(db, [app])
     
-    app = Application(
+    # Queue the confirmation email in the same transaction
+    company = db.get(Company, job.company_id) if job.company_id else None
+    digest_scheduler.notify_users(db, [Notification(
         user_id=current_user.id,
-        job_id=application.job_id,
-        cover_letter=application.cover_letter,
-        additional_info=application.additional_info
-    )
-    
-    # Set company_id (inherit from job)
-    auto_set_company_id(db, app, company_context['company_id'], Job, application.job_id)
+        template_name=CONFIRMATION_TEMPLATE_NAME,
+        template_data={
+            "user_name": f"{current_user.first_name} {current_user.last_name}",
+            "job_title": job.title,
+            "company_name": company.name if company else "",
+            "job_location": job.location,
+            "application_date": app.applied_at.strftime("%B %d, %Y"),
+            "application_id": app.id
+        },
+        category="job_application_confirmations",
+        company_id=app.company_id,
+        application_id=app.id,
+        job_id=job.id
+    )])
     
-    db.add(app)
+    # Serialized before the commit expires the instance (saves a refresh query)
+    result = ApplicationRead.model_validate(app)
     db.commit()
-    db.refresh(app)
-    return app
+    my_applications_service.invalidate([result.user_id])
+    return result
 
 @router.get("/me")
 def get_my_applications(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    company_context: dict = Depends(get_user_company_context)
+    limit: int = Query(MyApplicationsConfig.DEFAULT_LIMIT, ge=1, le=MyApplicationsConfig.MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_tenant_db),
+    current_user: User = Depends(get_current_user)
 ):
     """
-    Get all job applications submitted by the current user with job details.
-    Returns applications with embedded job information for dashboard display.
+    Get job applications submitted by the current user with job details, newest first.
+    Returns applications with embedded job information for dashboard display;
+    the X-Total-Count header has the number of applications across all pages.
     """
-    # Filter applications by user and company
-    app_query = filter_by_company(db.query(Application), Application, company_context['company_id'], company_context['is_admin'])
-    applications = app_query.filter_by(user_id=current_user.id).all()
-    
-    # Enrich applications with job details
-    result = []
-    for app in applications:
-        job = db.query(Job).filter_by(id=app.job_id).first()
-        result.append({
-            "id": app.id,
-            "job_id": app.job_id,
-            "cover_letter": app.cover_letter,
-            "additional_info": app.additional_info,
-            "status": app.status,
-            "applied_at": app.applied_at.isoformat(),
-            "updated_at": app.updated_at.isoformat() if app.updated_at else None,
-            "job": {
-                "id": job.id,
-                "title": job.title,
-                "company": job.company,
-                "location": job.location,
-                "department": job.department,
-                "job_type": job.job_type,
-                "salary_min": job.salary_min,
-                "salary_max": job.salary_max,
-                "description": job.description
-            } if job else None
-        })
-    
-    return result
+    body, total = my_applications_service.get_page(db, current_user.id, current_user.company_id, limit, offset)
+    return Response(content=body, media_type="application/json", headers={"X-Total-Count": str(total)})
 
 @router.patch("/{application_id}/status")
 def update_application_status(
     application_id: int,
     status: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_tenant_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Update application status (for testing/admin purposes).
-    Valid statuses: submitted, in_review, interview, rejected, accepted
+    Valid statuses: submitted, in_review, interview, rejected, accepted;
+    transitions follow the same rules as the admin status updates.
     """
-    app = db.query(Application).filter_by(id=application_id, user_id=current_user.id).first()
+    app = db.query(Application.id).filter_by(id=application_id, user_id=current_user.id).first()
     if not app:
         raise HTTPException(status_code=404, detail="Application not found")
     
-    valid_statuses = ["submitted", "in_review", "interview", "rejected", "accepted"]
-    if status not in valid_statuses:
-        raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {valid_statuses}")
-    
-    app.status = status
-    db.commit()
-    db.refresh(app)
+    try:
+        application_status_service.update_one(db, None, application_id, status, changed_by=current_user.id)
+    except ApplicationStatusConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ApplicationStatusError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return {"message": "Status updated successfully", "application_id": app.id, "new_status": app.status}
+    return {"message": "Status updated successfully", "application_id": application_id, "new_status": status}
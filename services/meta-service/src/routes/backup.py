@@ -0,0 +1,52 @@
+"""
+Backup routes for Meta Portal.
+Lets super admins take online database snapshots, ship the WAL between
+them and list what is available for restore. Snapshots cover every
+company's data, so company admins cannot use these routes. Restores are
+done offline with backup_db.py.
+"""
+
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from src.models.user import User
+from src.services.backup_service import backup_service, BackupError
+from src.utils.auth import get_current_super_admin_user
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/admin/backups", tags=["backups"])
+
+
+@router.get("")
+def list_backups(current_user: User = Depends(get_current_super_admin_user)):
+    """Kept snapshots with their size, throughput and WAL copies, newest first (Super admin only)"""
+    try:
+        return {"backups": backup_service.list_backups()}
+    except BackupError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("")
+def create_backup(current_user: User = Depends(get_current_super_admin_user)):
+    """Take a compressed, verified online snapshot (Super admin only)"""
+    try:
+        return backup_service.create_backup()
+    except BackupError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        logger.error(f"Backup failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Backup failed: {str(e)}")
+
+
+@router.post("/wal")
+def ship_wal(current_user: User = Depends(get_current_super_admin_user)):
+    """Archive the WAL written since the latest snapshot (Super admin only)"""
+    try:
+        return backup_service.ship_wal()
+    except BackupError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        logger.error(f"WAL shipping failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"WAL shipping failed: {str(e)}")
@@ -3,28 +3,36 @@ Email management API routes for Meta Portal.
 Handles email operations, template management, and notification settings.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
+import asyncio
+import json
 import logging
 
-from ..config.database import get_db
-from ..models.email import Email, EmailTemplate, EmailPreference, EmailQueue, EmailStatus, EmailPriority
+from ..config.database import get_db, SessionLocal
+from ..models.email import Email, EmailTemplate, EmailPreference, EmailQueue, EmailBatch, EmailStatus, EmailPriority
 from ..models.user import User
 from ..models.company import Company
 from ..schemas.email_schemas import (
     EmailResponse, EmailCreate, EmailUpdate,
     EmailTemplateResponse, EmailTemplateCreate, EmailTemplateUpdate,
     EmailPreferenceResponse, EmailPreferenceCreate, EmailPreferenceUpdate,
-    SendEmailRequest, EmailStatsResponse, TestEmailRequest, BulkEmailRequest, BulkEmailResponse
+    SendEmailRequest, EmailStatsResponse, TestEmailRequest, BulkEmailRequest, BulkEmailResponse,
+    EmailBatchResponse
 )
-from ..services.email_service import email_service
-from ..utils.auth import get_current_active_user, get_current_admin_user, get_user_company
+from ..services.email_service import email_service, EmailConfig
+from ..services.email_events import email_event_bus, email_queue_monitor
+from ..services.digest_service import digest_scheduler
+from ..services.auth import create_scoped_token
+from ..utils.auth import get_current_user, get_current_active_user, get_current_admin_user, get_user_company, get_user_from_scoped_token
 from ..utils.multitenant import get_company_stats
+from ..utils.db_route import SessionReleasingRoute
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=SessionReleasingRoute)
 
 # ==========================================
 # EMAIL MANAGEMENT ENDPOINTS (ADMIN)
@@ -132,44 +140,80 @@ async def send_bulk_emails(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
-    """Send emails to multiple recipients (Admin only)"""
+    """
+    Send emails to multiple recipients (Admin only)
+    Creates a batch and queues the emails in the background; poll the
+    returned batch_id for progress.
+    """
     try:
         company = get_user_company(db, current_user)
         company_id = company.id if company else None
         
-        emails_queued = 0
-        failed_validations = []
-        
-        for recipient in bulk_request.recipients:
-            try:
-                await email_service.send_email_async(
-                    db=db,
-                    recipient_email=recipient,
-                    template_name=bulk_request.template_name,
-                    template_data=bulk_request.template_data,
-                    priority=bulk_request.priority,
-                    scheduled_at=bulk_request.scheduled_at,
-                    company_id=company_id
-                )
-                emails_queued += 1
-            
-            except Exception as e:
-                failed_validations.append({
-                    "email": recipient,
-                    "error": str(e)
-                })
+        template = email_service.get_active_template(db, bulk_request.template_name)
+        if not template:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Template '{bulk_request.template_name}' not found or inactive"
+            )
         
-        return BulkEmailResponse(
+        batch = email_service.create_bulk_batch(
+            db=db,
+            template_name=bulk_request.template_name,
             total_requested=len(bulk_request.recipients),
-            emails_queued=emails_queued,
-            failed_validations=failed_validations,
-            batch_id=f"bulk_{datetime.utcnow().timestamp()}"
+            company_id=company_id,
+            created_by=current_user.id
+        )
+        
+        background_tasks.add_task(
+            email_service.run_bulk_batch,
+            batch.batch_id,
+            list(bulk_request.recipients),
+            template_name=bulk_request.template_name,
+            template_data=bulk_request.template_data,
+            priority=EmailPriority(bulk_request.priority.value),
+            scheduled_at=bulk_request.scheduled_at,
+            company_id=company_id
+        )
+        
+        return BulkEmailResponse(
+            total_requested=batch.total_requested,
+            emails_queued=0,
+            failed_validations=[],
+            batch_id=batch.batch_id,
+            status=batch.status
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error sending bulk emails: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to send bulk emails: {str(e)}")
 
+@router.get("/admin/emails/batches/{batch_id}", response_model=EmailBatchResponse)
+async def get_bulk_email_batch(
+    batch_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Get progress of a bulk email batch (Admin only)"""
+    try:
+        batch = db.query(EmailBatch).filter(EmailBatch.batch_id == batch_id).first()
+        if not batch:
+            raise HTTPException(status_code=404, detail="Email batch not found")
+        
+        # Check company access
+        company = get_user_company(db, current_user)
+        if company and batch.company_id != company.id:
+            raise HTTPException(status_code=404, detail="Email batch not found")
+        
+        return email_service.get_bulk_batch_progress(db, batch)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching email batch {batch_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch email batch")
+
 @router.post("/admin/emails/test")
 async def send_test_email(
     test_request: TestEmailRequest,
@@ -214,20 +258,7 @@ async def get_email_statistics(
         company = get_user_company(db, current_user)
         company_id = company.id if company else None
         
-        stats = email_service.get_email_stats(db, company_id)
-        
-        # Add popular templates
-        query = db.query(EmailTemplate.name, EmailTemplate.usage_count)
-        if company_id:
-            query = query.filter(EmailTemplate.company_id == company_id)
-        
-        popular_templates = query.order_by(EmailTemplate.usage_count.desc()).limit(5).all()
-        stats["popular_templates"] = [
-            {"name": name, "usage_count": count} 
-            for name, count in popular_templates
-        ]
-        
-        return stats
+        return email_service.get_email_stats(db, company_id, days)
     
     except Exception as e:
         logger.error(f"Error fetching email stats: {str(e)}")
@@ -334,6 +365,7 @@ async def update_email_template(
         
         db.commit()
         db.refresh(template)
+        email_service.template_engine.invalidate_template(template_id)
         
         logger.info(f"Email template {template_id} updated by user {current_user.id}")
         return template
@@ -380,6 +412,7 @@ async def delete_email_template(
         
         db.delete(template)
         db.commit()
+        email_service.template_engine.invalidate_template(template_id)
         
         logger.info(f"Email template {template_id} deleted by user {current_user.id}")
         return {"message": "Template deleted successfully"}
@@ -485,6 +518,75 @@ async def get_email_queue_status(
         logger.error(f"Error fetching email queue: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch email queue")
 
+# Audience of the tokens that open the queue event stream
+QUEUE_STREAM_TOKEN_AUDIENCE = "email-queue-stream"
+
+@router.post("/admin/email-queue/stream-token")
+async def create_email_queue_stream_token(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Issue a token for opening the email queue event stream (Admin only)
+    EventSource cannot send an Authorization header, so the stream takes its
+    token in the URL, where it can end up in access logs. This token expires
+    within QUEUE_STREAM_TOKEN_SECONDS and is rejected everywhere else.
+    """
+    token = create_scoped_token(
+        {"sub": current_user.email, "user_id": current_user.id, "company_id": current_user.company_id},
+        QUEUE_STREAM_TOKEN_AUDIENCE,
+        EmailConfig.QUEUE_STREAM_TOKEN_SECONDS
+    )
+    return {"token": token, "expires_in": EmailConfig.QUEUE_STREAM_TOKEN_SECONDS}
+
+@router.get("/admin/email-queue/stream")
+async def stream_email_queue_events(
+    request: Request,
+    token: str = Query(..., description="Stream token from POST /admin/email-queue/stream-token")
+):
+    """
+    Stream email queue and delivery events as server-sent events (Admin only)
+    The first event carries the current queue counters; every later event
+    carries the updated counters, so the dashboard never has to poll.
+    """
+    # Authenticate with a short-lived session so the stream does not hold a
+    # database connection for as long as the dashboard stays open
+    db = SessionLocal()
+    try:
+        get_current_admin_user(get_current_active_user(
+            get_user_from_scoped_token(token, QUEUE_STREAM_TOKEN_AUDIENCE, db)
+        ))
+        email_queue_monitor.load(db)
+    finally:
+        db.close()
+    
+    queue = email_event_bus.subscribe()
+    
+    async def event_stream():
+        try:
+            yield _format_sse({"type": "snapshot", "counts": email_queue_monitor.snapshot()})
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=EmailConfig.QUEUE_STREAM_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _format_sse(event)
+        finally:
+            email_event_bus.unsubscribe(queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _format_sse(event: Dict[str, Any]) -> str:
+    """Serialize an event as a server-sent event frame"""
+    return f"data: {json.dumps(event, default=str)}\n\n"
+
 @router.post("/admin/email-queue/process")
 async def process_email_queue_manually(
     background_tasks: BackgroundTasks,
@@ -501,4 +603,20 @@ async def process_email_queue_manually(
     
     except Exception as e:
         logger.error(f"Error triggering email queue processing: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to process email queue")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to process email queue")
+
+@router.post("/admin/email-digests/process")
+async def process_email_digests_manually(
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Manually trigger sending of due notification digests (Admin only)"""
+    try:
+        # Add background task to queue due digests (it opens its own session)
+        background_tasks.add_task(digest_scheduler.run_due_digests_task)
+        
+        return {"message": "Digest processing started"}
+    
+    except Exception as e:
+        logger.error(f"Error triggering digest processing: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to process email digests")
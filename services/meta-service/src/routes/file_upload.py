@@ -14,8 +14,9 @@ from ..schemas.file_schemas import (
     ResumeListResponse, FileUploadStats, ResumeCreate, ResumeUpdate
 )
 from ..utils.auth import get_current_user, get_current_admin_user
+from ..utils.db_route import SessionReleasingRoute
 
-router = APIRouter(prefix="/api/files", tags=["File Upload"])
+router = APIRouter(prefix="/api/files", tags=["File Upload"], route_class=SessionReleasingRoute)
 file_service = FileUploadService()
 
 @router.post("/upload", response_model=FileUploadResponse)
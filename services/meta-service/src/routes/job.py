@@ -4,14 +4,17 @@ Handles job listing endpoints.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from src.config.database import get_db
 from src import schemas, models
 from src.routes.user import get_current_user, get_user_company_context
 from src.utils.multitenant import filter_by_company, auto_set_company_id
+from src.utils.fast_json import json_response, rows_to_dicts
+from src.utils.db_route import SessionReleasingRoute
 from typing import Optional
 
-router = APIRouter(prefix="/api/jobs", tags=["Job"])
+router = APIRouter(prefix="/api/jobs", tags=["Job"], route_class=SessionReleasingRoute)
 
 
 @router.get("/", dependencies=[], response_model=list[schemas.JobRead])
@@ -19,11 +22,24 @@ def list_jobs(
     db: Session = Depends(get_db),
     company_id: Optional[int] = Query(default=None, description="Optional company filter")
 ):
-    """List active jobs. Public endpoint returns all active jobs; can filter by company_id if provided."""
-    query = db.query(models.job.Job).filter(models.job.Job.is_active == True)
+    """
+    List active jobs. Public endpoint returns all active jobs; can filter by company_id if provided.
+    Selects exactly the JobRead columns (company name joined in) and writes
+    the rows straight to JSON, skipping response_model re-validation.
+    """
+    Job, Company = models.job.Job, models.company.Company
+    query = (
+        select(
+            Job.id, Job.title, Company.name.label("company"), Job.department, Job.location, Job.job_type,
+            Job.experience_level, Job.salary_min, Job.salary_max, Job.description, Job.requirements,
+            Job.posted_date, Job.is_active
+        )
+        .outerjoin(Company, Company.id == Job.company_id)
+        .where(Job.is_active == True)
+    )
     if company_id is not None:
-        query = query.filter(models.job.Job.company_id == company_id)
-    return query.order_by(models.job.Job.posted_date.desc()).all()
+        query = query.where(Job.company_id == company_id)
+    return json_response(rows_to_dicts(db.execute(query.order_by(Job.posted_date.desc()))))
 
 # Create a new job
 @router.post("/", response_model=schemas.JobRead)
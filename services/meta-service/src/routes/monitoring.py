@@ -0,0 +1,119 @@
+"""
+Monitoring routes for Meta Portal.
+Exposes runtime diagnostics for operators: liveness/readiness probes,
+Prometheus metrics, per-route SQL statistics and the sampling profiler.
+"""
+
+import asyncio
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+
+from src.config.database import SessionLocal
+from src.models.user import User
+from src.services.email_events import email_queue_monitor, PENDING_QUEUE_STATUSES
+from src.services.health_service import health_checker
+from src.utils.auth import get_current_admin_user
+from src.utils.metrics import registry, email_queue_depth, CONTENT_TYPE
+from src.utils.query_stats import route_query_stats, QueryStatsConfig
+from src.utils.profiler import ProfilerConfig, start_profiler, finish_profiler, get_profile
+
+router = APIRouter(tags=["monitoring"])
+
+def _collect_email_queue_depth():
+    """
+    Refresh queue depth from the incrementally maintained queue counters
+    Only entries still in the queue are depth. The counters follow this
+    process's queue activity, so each process exports its own series
+    (labelled with its pid) rather than claiming a global depth.
+    """
+    db = SessionLocal()
+    try:
+        email_queue_monitor.load(db)  # Only the first scrape queries the table
+    finally:
+        db.close()
+    counts = email_queue_monitor.snapshot()
+    process = str(os.getpid())
+    for status in PENDING_QUEUE_STATUSES:
+        email_queue_depth.labels(status, process).set(counts[status])
+
+
+registry.add_collector(_collect_email_queue_depth)
+
+
+@router.get("/livez", include_in_schema=False)
+async def liveness():
+    """Liveness probe: the process is up and its event loop is responsive"""
+    return {"status": "alive"}
+
+
+@router.get("/readyz", include_in_schema=False)
+async def readiness():
+    """Readiness probe: 503 when a critical dependency is degraded"""
+    result = await health_checker.check_readiness()
+    status_code = 200 if result["status"] == "ready" else 503
+    return JSONResponse(status_code=status_code, content=result)
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Prometheus scrape endpoint"""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
+
+
+@router.get("/api/admin/monitoring/queries")
+def get_query_stats(current_user: User = Depends(get_current_admin_user)):
+    """Per-route SQL statement counts and database time since startup (Admin only)"""
+    return {
+        "slow_query_threshold_ms": QueryStatsConfig.SLOW_QUERY_THRESHOLD_MS,
+        "routes": route_query_stats.snapshot()
+    }
+
+
+@router.delete("/api/admin/monitoring/queries")
+def reset_query_stats(current_user: User = Depends(get_current_admin_user)):
+    """Clear the per-route SQL statistics (Admin only)"""
+    route_query_stats.reset()
+    return {"message": "Query statistics reset"}
+
+
+@router.post("/api/admin/monitoring/profile")
+async def profile_worker(
+    seconds: float = Query(10, gt=0, le=ProfilerConfig.MAX_SECONDS),
+    interval_ms: float = Query(ProfilerConfig.DEFAULT_INTERVAL_MS, ge=1, le=1000),
+    include_idle: bool = False,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Sample this worker's threads for `seconds` and return collapsed stacks (Admin only)
+    The output can be fed to flamegraph.pl or opened in speedscope.
+    """
+    profiler = start_profiler(interval_ms, include_idle)
+    if profiler is None:
+        raise HTTPException(status_code=409, detail="A profile is already running on this worker")
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profile_id = finish_profiler(profiler)
+
+    return _collapsed_response(profile_id, get_profile(profile_id))
+
+
+@router.get("/api/admin/monitoring/profiles/{profile_id}")
+def download_profile(profile_id: str, current_user: User = Depends(get_current_admin_user)):
+    """Download a recent profile, e.g. one captured with the X-Profile header (Admin only)"""
+    collapsed = get_profile(profile_id)
+    if collapsed is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return _collapsed_response(profile_id, collapsed)
+
+
+def _collapsed_response(profile_id: str, collapsed: str) -> PlainTextResponse:
+    return PlainTextResponse(
+        collapsed,
+        headers={
+            "Content-Disposition": f'attachment; filename="profile-{profile_id}.collapsed"',
+            "X-Profile-Id": profile_id
+        }
+    )
@@ -11,8 +11,9 @@ from src.config.database import get_db
 from src.models.file_upload import FileUpload, Resume
 from src.models.user import User
 from src.routes.user import get_current_user
+from src.utils.db_route import SessionReleasingRoute
 
-router = APIRouter(prefix="/api/resumes", tags=["resumes"])
+router = APIRouter(prefix="/api/resumes", tags=["resumes"], route_class=SessionReleasingRoute)
 
 
 def _resume_to_summary(resume: Resume) -> dict:
@@ -2,13 +2,15 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from src.models.user import User
 from src.models.company import Company
-from src.config.database import get_db
+from src.config.database import get_db, release_connection
 from sqlalchemy.orm import Session
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from src.config.database import get_db
 from src import schemas, models
 from src.services import auth
+from src.utils.multitenant import set_tenant_context, TenantLoader
+from src.utils.db_route import SessionReleasingRoute
 # OAuth2 scheme for extracting token from Authorization header
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/users/login")
 
@@ -48,11 +50,15 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # The endpoint runs in another worker thread; don't hold the connection until then
+    release_connection(db)
     return user
 
 
 # Helper function to get company context from JWT token
-def get_user_company_context(token: str = Depends(oauth2_scheme)) -> dict:
+# (this and the tenant dependencies below do no I/O, so they are async and run
+# on the event loop instead of taking a worker thread each)
+async def get_user_company_context(token: str = Depends(oauth2_scheme)) -> dict:
     """Extract company context from JWT token without database query."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -70,6 +76,24 @@ def get_user_company_context(token: str = Depends(oauth2_scheme)) -> dict:
         )
 
 
+# Dependency to get a database session scoped to the caller's company
+async def get_tenant_db(
+    db: Session = Depends(get_db),
+    company_context: dict = Depends(get_user_company_context)
+) -> Session:
+    """Same session as get_db (cached per request), restricted to the token's company."""
+    return set_tenant_context(db, company_context['company_id'], company_context['is_admin'])
+
+
+# Dependency to get a batching record loader, memoized for the current request
+async def get_tenant_loader(
+    db: Session = Depends(get_tenant_db),
+    company_context: dict = Depends(get_user_company_context)
+) -> TenantLoader:
+    """Batches and caches company-scoped lookups by ID (see utils/multitenant.TenantLoader)."""
+    return TenantLoader(db, company_context['company_id'], company_context['is_admin'])
+
+
 """
 User routes for Meta Portal API.
 Handles user registration and login endpoints.
@@ -78,7 +102,7 @@ Handles user registration and login endpoints.
 
 
 # starting with /api and user tag name
-router = APIRouter(prefix="/api/users", tags=["User"])
+router = APIRouter(prefix="/api/users", tags=["User"], route_class=SessionReleasingRoute)
 
 @router.post("/register", response_model=schemas.UserRead, status_code=201)
 def register_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
@@ -9,7 +9,7 @@ from .email_schemas import (
     EmailTemplateResponse, EmailTemplateCreate, EmailTemplateUpdate,
     EmailPreferenceResponse, EmailPreferenceCreate, EmailPreferenceUpdate,
     SendEmailRequest, EmailStatsResponse, TestEmailRequest, 
-    BulkEmailRequest, BulkEmailResponse
+    BulkEmailRequest, BulkEmailResponse, EmailBatchResponse
 )
 
 __all__ = [
@@ -22,5 +22,5 @@ __all__ = [
     "EmailTemplateResponse", "EmailTemplateCreate", "EmailTemplateUpdate",
     "EmailPreferenceResponse", "EmailPreferenceCreate", "EmailPreferenceUpdate",
     "SendEmailRequest", "EmailStatsResponse", "TestEmailRequest", 
-    "BulkEmailRequest", "BulkEmailResponse"
+    "BulkEmailRequest", "BulkEmailResponse", "EmailBatchResponse"
 ]
\ No newline at end of file
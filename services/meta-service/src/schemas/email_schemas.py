@@ -251,4 +251,22 @@ class BulkEmailResponse(BaseModel):
     total_requested: int
     emails_queued: int
     failed_validations: List[Dict[str, str]]
-    batch_id: str
\ No newline at end of file
+    batch_id: str
+    status: str = "queued"
+
+class EmailBatchResponse(BaseModel):
+    """Schema for bulk email batch progress"""
+    batch_id: str
+    template_name: str
+    status: str
+    total_requested: int
+    emails_queued: int
+    failed_count: int
+    failed_recipients: List[Dict[str, str]]
+    error_message: Optional[str]
+    sent: int
+    failed: int
+    pending: int
+    created_at: datetime
+    started_at: Optional[datetime]
+    completed_at: Optional[datetime]
@@ -0,0 +1,252 @@
+"""
+Application History Service for Meta Portal.
+Appends every application status change to application_status_changes and
+keeps a per-day histogram of time spent in each status, so time-in-stage
+statistics (e.g. median time from submitted to in_review per job) are read
+from a few histogram rows instead of the whole change log.
+"""
+
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from ..models.application import ApplicationStatusChange, ApplicationStageLatency
+from .application_stats_service import application_stats_buckets
+from .rollup_table import Deltas, RollupTable
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# Upper bounds (seconds) of the time-in-stage histogram bins; bin i covers
+# [LATENCY_BIN_SECONDS[i - 1], LATENCY_BIN_SECONDS[i])
+LATENCY_BIN_SECONDS = (
+    15 * 60, HOUR, 2 * HOUR, 4 * HOUR, 8 * HOUR, 12 * HOUR,
+    DAY, 2 * DAY, 3 * DAY, 5 * DAY, 7 * DAY, 10 * DAY, 14 * DAY, 21 * DAY,
+    30 * DAY, 45 * DAY, 60 * DAY, 90 * DAY, 180 * DAY, math.inf
+)
+
+# (day, company_id, job_id, from_status, to_status, bin)
+LatencyKey = Tuple[datetime, int, int, str, str, int]
+
+
+class ApplicationHistory:
+    """
+    Status change log plus time-in-stage histograms
+    record_transitions is the single place status changes are recorded:
+    it appends to the log, updates the histograms and the daily stats
+    buckets, all in the caller's transaction.
+    """
+
+    latency = RollupTable(
+        ApplicationStageLatency,
+        key_columns=("day", "company_id", "job_id", "from_status", "to_status", "bin"),
+        measure_columns=("change_count", "total_seconds")
+    )
+
+    # ==========================================
+    # WRITES
+    # ==========================================
+
+    def record_transitions(
+        self,
+        db: Session,
+        applications: Iterable[Any],
+        new_status: str,
+        changed_by: Optional[int] = None,
+        now: datetime = None
+    ) -> int:
+        """
+        Record status changes to new_status (does not commit)
+        applications must still carry their previous status, plus id,
+        applied_at, updated_at, company_id and job_id; unchanged ones are
+        skipped.
+        Returns: number of changes recorded
+        """
+        now = now or datetime.utcnow()
+        changed = [application for application in applications if application.status != new_status]
+        if not changed:
+            return 0
+
+        entered_at = self._entered_at(db, changed)
+        changes = [
+            {
+                "application_id": application.id,
+                "company_id": application.company_id,
+                "job_id": application.job_id,
+                "changed_by": changed_by,
+                "from_status": application.status,
+                "to_status": new_status,
+                "changed_at": now,
+                "seconds_in_stage": max((now - entered_at[application.id]).total_seconds(), 0.0)
+            }
+            for application in changed
+        ]
+        db.execute(insert(ApplicationStatusChange), changes)
+
+        deltas: Deltas = {}
+        for change in changes:
+            self._add(deltas, change)
+        self.latency.apply(db, deltas)
+
+        application_stats_buckets.record_transitions(db, changed, new_status, now)
+        return len(changes)
+
+    def rebuild_latency(self, db: Session) -> Dict[str, int]:
+        """Recompute the time-in-stage histograms from the change log in one pass"""
+        deltas: Deltas = {}
+        changes = 0
+        rows = db.execute(
+            select(ApplicationStatusChange.changed_at, ApplicationStatusChange.company_id, ApplicationStatusChange.job_id,
+                   ApplicationStatusChange.from_status, ApplicationStatusChange.to_status,
+                   ApplicationStatusChange.seconds_in_stage)
+            .where(ApplicationStatusChange.seconds_in_stage.is_not(None))
+            .execution_options(yield_per=5000)
+        )
+        for row in rows:
+            changes += 1
+            self._add(deltas, row._mapping)
+
+        buckets = self.latency.replace(db, deltas)
+        db.commit()
+
+        counts = {"changes": changes, "buckets": buckets}
+        logger.info(f"Rebuilt application stage latency histograms: {counts}")
+        return counts
+
+    @staticmethod
+    def _entered_at(db: Session, applications: List[Any]) -> Dict[int, datetime]:
+        """
+        When each application entered its current status: its latest logged
+        change, else applied_at (still submitted) or updated_at (changed
+        before the log existed)
+        """
+        latest = dict(
+            db.query(ApplicationStatusChange.application_id, func.max(ApplicationStatusChange.changed_at))
+            .filter(ApplicationStatusChange.application_id.in_([application.id for application in applications]))
+            .group_by(ApplicationStatusChange.application_id)
+            .all()
+        )
+        entered_at = {}
+        for application in applications:
+            moment = latest.get(application.id)
+            if moment is None:
+                moment = application.applied_at if application.status == "submitted" else (application.updated_at or application.applied_at)
+            entered_at[application.id] = moment.replace(tzinfo=None)
+        return entered_at
+
+    def _add(self, deltas: Deltas, change: Dict[str, Any]):
+        """Count one change in its histogram bin"""
+        key: LatencyKey = (
+            change["changed_at"].replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None),
+            change["company_id"] or 0,
+            change["job_id"] or 0,
+            change["from_status"],
+            change["to_status"],
+            self._bin(change["seconds_in_stage"])
+        )
+        self.latency.add(deltas, key, 1, change["seconds_in_stage"])
+
+    @staticmethod
+    def _bin(seconds: float) -> int:
+        for index, upper in enumerate(LATENCY_BIN_SECONDS):
+            if seconds < upper:
+                return index
+        return len(LATENCY_BIN_SECONDS) - 1
+
+    # ==========================================
+    # READS
+    # ==========================================
+
+    def get_history(self, db: Session, application_id: int) -> List[Dict[str, Any]]:
+        """Status changes of one application, oldest first"""
+        changes = (
+            db.query(ApplicationStatusChange)
+            .filter(ApplicationStatusChange.application_id == application_id)
+            .order_by(ApplicationStatusChange.changed_at, ApplicationStatusChange.id)
+            .all()
+        )
+        return [
+            {
+                "from_status": change.from_status,
+                "to_status": change.to_status,
+                "changed_at": change.changed_at.isoformat(),
+                "changed_by": change.changed_by,
+                "hours_in_stage": round(change.seconds_in_stage / HOUR, 2) if change.seconds_in_stage is not None else None
+            }
+            for change in changes
+        ]
+
+    def get_stage_times(self, db: Session, company_id: Optional[int] = None, job_id: Optional[int] = None,
+                        days: int = 30, now: datetime = None) -> List[Dict[str, Any]]:
+        """
+        Time spent in a status before each kind of change, for changes made in
+        the last `days` calendar days (today included)
+        Medians and 90th percentiles are estimated within histogram bins;
+        reads at most one row per day, status change and bin.
+        """
+        from .application_status_service import APPLICATION_STATUSES
+
+        now = now or datetime.utcnow()
+        window_start = now.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None) - timedelta(days=days - 1)
+        query = db.query(
+            ApplicationStageLatency.from_status,
+            ApplicationStageLatency.to_status,
+            ApplicationStageLatency.bin,
+            func.sum(ApplicationStageLatency.change_count),
+            func.sum(ApplicationStageLatency.total_seconds)
+        ).filter(
+            ApplicationStageLatency.day >= window_start,
+            ApplicationStageLatency.job_id == (job_id or 0)
+        )
+        if company_id:
+            query = query.filter(ApplicationStageLatency.company_id == company_id)
+        rows = query.group_by(
+            ApplicationStageLatency.from_status, ApplicationStageLatency.to_status, ApplicationStageLatency.bin
+        ).all()
+
+        histograms: Dict[Tuple[str, str], Dict[int, Tuple[int, float]]] = {}
+        for from_status, to_status, latency_bin, count, seconds in rows:
+            histograms.setdefault((from_status, to_status), {})[latency_bin] = (count, seconds)
+
+        order = {status: index for index, status in enumerate(APPLICATION_STATUSES)}
+        stages = []
+        for (from_status, to_status), histogram in sorted(
+            histograms.items(), key=lambda item: (order.get(item[0][0], len(order)), order.get(item[0][1], len(order)))
+        ):
+            count = sum(bin_count for bin_count, _ in histogram.values())
+            seconds = sum(bin_seconds for _, bin_seconds in histogram.values())
+            stages.append({
+                "from": from_status,
+                "to": to_status,
+                "count": count,
+                "avg_hours": round(seconds / count / HOUR, 2),
+                "median_hours": round(self._percentile(histogram, count, 0.5) / HOUR, 2),
+                "p90_hours": round(self._percentile(histogram, count, 0.9) / HOUR, 2)
+            })
+        return stages
+
+    @staticmethod
+    def _percentile(histogram: Dict[int, Tuple[int, float]], total: int, fraction: float) -> float:
+        """Estimate a percentile by interpolating inside the bin that contains it"""
+        target = fraction * total
+        seen = 0
+        for latency_bin in sorted(histogram):
+            count, seconds = histogram[latency_bin]
+            if seen + count >= target:
+                lower = LATENCY_BIN_SECONDS[latency_bin - 1] if latency_bin > 0 else 0
+                upper = LATENCY_BIN_SECONDS[latency_bin]
+                if math.isinf(upper):
+                    return seconds / count  # open-ended last bin: use its mean
+                return lower + (upper - lower) * (target - seen) / count
+            seen += count
+        return 0.0
+
+
+# Global history service instance
+application_history = ApplicationHistory()
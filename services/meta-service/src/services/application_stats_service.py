@@ -0,0 +1,225 @@
+"""
+Application Statistics Buckets for Meta Portal.
+Maintains daily counts of received applications and status changes per
+company and job, plus how long applications waited for their first review,
+and answers funnel and trend queries from those buckets instead of the
+applications table.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..models.application import Application, ApplicationStatsBucket
+from .rollup_table import Deltas, RollupTable
+
+logger = logging.getLogger(__name__)
+
+RECEIVED = ""  # from_status of a newly submitted application
+FIRST_STATUS = "submitted"
+
+# (day, company_id, job_id, from_status, to_status)
+BucketKey = Tuple[datetime, int, int, str, str]
+
+
+class ApplicationStatsBuckets:
+    """
+    Keeps application_stats_buckets in step with the applications table
+    Submits and status changes are recorded in the same transaction as the
+    application change, in the job's row and the company-wide row (see
+    RollupTable), so company analytics read one row per day and status
+    change however many jobs and applications there are.
+    """
+
+    buckets = RollupTable(
+        ApplicationStatsBucket,
+        key_columns=("day", "company_id", "job_id", "from_status", "to_status"),
+        measure_columns=("event_count", "review_count", "review_seconds")
+    )
+
+    # ==========================================
+    # WRITES
+    # ==========================================
+
+    def record_received(self, db: Session, applications: Iterable[Any]):
+        """Count new applications (anything with applied_at, company_id and job_id)"""
+        deltas: Deltas = {}
+        for application in applications:
+            self._add(deltas, self._key(application.applied_at, application, RECEIVED, FIRST_STATUS))
+        self.buckets.apply(db, deltas)
+
+    def record_transitions(self, db: Session, applications: Iterable[Any], new_status: str, now: datetime = None):
+        """
+        Count status changes to new_status
+        applications must still carry their previous status (plus applied_at,
+        company_id and job_id); unchanged ones are skipped. Leaving
+        "submitted" is an application's first review.
+        """
+        now = now or datetime.utcnow()
+        deltas: Deltas = {}
+        for application in applications:
+            if application.status == new_status:
+                continue
+            self._add(deltas, self._key(now, application, application.status, new_status),
+                      self._review_seconds(application.status, application.applied_at, now))
+        self.buckets.apply(db, deltas)
+
+    def rebuild(self, db: Session) -> Dict[str, int]:
+        """
+        Recompute all buckets from the applications table in one pass
+        Applications only keep their current status, so each one that has
+        moved on from "submitted" is counted as a single change to that
+        status on its updated_at day (which is also its first review).
+        """
+        deltas: Deltas = {}
+        applications = 0
+        rows = db.execute(
+            select(Application.applied_at, Application.updated_at, Application.company_id,
+                   Application.job_id, Application.status)
+            .execution_options(yield_per=5000)
+        )
+        for row in rows:
+            applications += 1
+            self._add(deltas, self._key(row.applied_at, row, RECEIVED, FIRST_STATUS))
+            if row.status != FIRST_STATUS:
+                changed_at = row.updated_at or row.applied_at
+                self._add(deltas, self._key(changed_at, row, FIRST_STATUS, row.status),
+                          self._review_seconds(FIRST_STATUS, row.applied_at, changed_at))
+
+        buckets = self.buckets.replace(db, deltas)
+        db.commit()
+
+        counts = {"applications": applications, "buckets": buckets}
+        logger.info(f"Rebuilt application stats buckets: {counts}")
+        return counts
+
+    def _add(self, deltas: Deltas, key: BucketKey, review_seconds: Optional[float] = None):
+        """Count one event, and one first review when review_seconds is given"""
+        if review_seconds is None:
+            self.buckets.add(deltas, key, 1, 0, 0.0)
+        else:
+            self.buckets.add(deltas, key, 1, 1, review_seconds)
+
+    def _key(self, moment: datetime, application: Any, from_status: str, to_status: str) -> BucketKey:
+        return (self._day(moment), application.company_id or 0, application.job_id or 0, from_status or "", to_status)
+
+    @staticmethod
+    def _review_seconds(from_status: str, applied_at: Optional[datetime], reviewed_at: datetime) -> Optional[float]:
+        """Wait until the first review, for changes that leave "submitted" (else None)"""
+        if from_status != FIRST_STATUS or applied_at is None:
+            return None
+        return max((reviewed_at.replace(tzinfo=None) - applied_at.replace(tzinfo=None)).total_seconds(), 0.0)
+
+    @staticmethod
+    def _day(moment: datetime) -> datetime:
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+
+    # ==========================================
+    # READS
+    # ==========================================
+
+    def get_funnel(self, db: Session, company_id: Optional[int] = None, job_id: Optional[int] = None,
+                   days: int = 30, now: datetime = None) -> Dict[str, Any]:
+        """
+        Applications received in the last `days` calendar days (today included),
+        how many reached each status, and the average wait for a first review
+        Reads at most one row per day and status change.
+        """
+        from .application_status_service import APPLICATION_STATUSES
+
+        rows = (
+            self._bucket_query(db, self._window_start(days, now), company_id, job_id,
+                               ApplicationStatsBucket.from_status, ApplicationStatsBucket.to_status)
+            .group_by(ApplicationStatsBucket.from_status, ApplicationStatsBucket.to_status)
+            .all()
+        )
+
+        received = sum(row.events for row in rows if row.from_status == RECEIVED)
+        reached = {status: 0 for status in APPLICATION_STATUSES}
+        reached[FIRST_STATUS] = received
+        transitions = []
+        for row in rows:
+            if row.from_status != RECEIVED:
+                reached[row.to_status] = reached.get(row.to_status, 0) + row.events
+                transitions.append({"from": row.from_status, "to": row.to_status, "count": row.events})
+        transitions.sort(key=lambda transition: transition["count"], reverse=True)
+
+        return {
+            "days": days,
+            "received": received,
+            "stages": [
+                {
+                    "status": status,
+                    "count": count,
+                    "rate": round(count / received * 100, 2) if received else 0
+                }
+                for status, count in reached.items()
+            ],
+            "transitions": transitions,
+            "time_to_first_review": self._review_summary(rows)
+        }
+
+    def get_trend(self, db: Session, company_id: Optional[int] = None, job_id: Optional[int] = None,
+                  days: int = 30, now: datetime = None) -> List[Dict[str, Any]]:
+        """Per-day received applications, status changes and first-review waits, oldest first"""
+        window_start = self._window_start(days, now)
+        rows = (
+            self._bucket_query(db, window_start, company_id, job_id, ApplicationStatsBucket.day,
+                               ApplicationStatsBucket.from_status, ApplicationStatsBucket.to_status)
+            .group_by(ApplicationStatsBucket.day, ApplicationStatsBucket.from_status, ApplicationStatsBucket.to_status)
+            .all()
+        )
+
+        rows_by_day: Dict[datetime, list] = {}
+        for row in rows:
+            rows_by_day.setdefault(row.day, []).append(row)
+
+        trend = []
+        for offset in range(days):
+            day = window_start + timedelta(days=offset)
+            day_rows = rows_by_day.get(day, [])
+            status_changes: Dict[str, int] = {}
+            for row in day_rows:
+                if row.from_status != RECEIVED:
+                    status_changes[row.to_status] = status_changes.get(row.to_status, 0) + row.events
+            trend.append({
+                "date": day.date().isoformat(),
+                "received": sum(row.events for row in day_rows if row.from_status == RECEIVED),
+                "status_changes": status_changes,
+                "time_to_first_review": self._review_summary(day_rows)
+            })
+        return trend
+
+    def _bucket_query(self, db: Session, since: datetime, company_id: Optional[int], job_id: Optional[int], *group_columns):
+        """Summed measures since a day, for one job or (job_id None) whole companies"""
+        query = db.query(
+            *group_columns,
+            func.sum(ApplicationStatsBucket.event_count).label("events"),
+            func.sum(ApplicationStatsBucket.review_count).label("reviews"),
+            func.sum(ApplicationStatsBucket.review_seconds).label("review_seconds")
+        ).filter(
+            ApplicationStatsBucket.day >= since,
+            ApplicationStatsBucket.job_id == (job_id or 0)
+        )
+        if company_id:
+            query = query.filter(ApplicationStatsBucket.company_id == company_id)
+        return query
+
+    @staticmethod
+    def _review_summary(rows) -> Dict[str, Any]:
+        reviewed = sum(row.reviews for row in rows)
+        seconds = sum(row.review_seconds for row in rows)
+        return {
+            "reviewed": reviewed,
+            "avg_hours": round(seconds / reviewed / 3600, 2) if reviewed else None
+        }
+
+    def _window_start(self, days: int, now: Optional[datetime]) -> datetime:
+        return self._day(now or datetime.utcnow()) - timedelta(days=days - 1)
+
+
+# Global bucket service instance
+application_stats_buckets = ApplicationStatsBuckets()
@@ -0,0 +1,226 @@
+"""
+Application Status Service for Meta Portal.
+Moves many applications to a new status at once: one SELECT to validate
+transitions, one set-based UPDATE per current status and one batch of
+notification emails, committed together.
+"""
+
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional
+
+from sqlalchemy import update, func
+from sqlalchemy.orm import Session
+
+from ..models.application import Application
+from ..models.company import Company
+from ..models.job import Job
+from ..models.user import User
+from ..utils.multitenant import TenantLoader
+from .application_history_service import application_history
+from .digest_service import digest_scheduler, Notification
+from .my_applications_service import my_applications_service
+
+logger = logging.getLogger(__name__)
+
+APPLICATION_STATUSES = ("submitted", "in_review", "interview", "accepted", "rejected")
+
+# Allowed moves: current status -> statuses it may change to
+STATUS_TRANSITIONS = {
+    "submitted": ("in_review", "interview", "rejected"),
+    "in_review": ("interview", "accepted", "rejected"),
+    "interview": ("accepted", "rejected"),
+    "accepted": (),
+    "rejected": ("in_review",),  # reconsidered
+}
+
+STATUS_TEMPLATE_NAME = "application_status_update"
+
+
+class ApplicationStatusConfig:
+    """Bulk status update settings"""
+
+    # Most applications changed by one request
+    MAX_BULK_APPLICATIONS = int(os.getenv("MAX_BULK_APPLICATIONS", "5000"))
+
+
+class ApplicationStatusError(Exception):
+    """Invalid bulk status request"""
+    pass
+
+
+class ApplicationStatusConflict(ApplicationStatusError):
+    """The application changed (or was deleted) while its status was being updated"""
+    pass
+
+
+class ApplicationStatusService:
+    """Validated, set-based application status changes"""
+
+    def bulk_update(
+        self,
+        db: Session,
+        loader: TenantLoader,
+        new_status: str,
+        application_ids: Optional[Iterable[int]] = None,
+        current_status: Optional[str] = None,
+        job_id: Optional[int] = None,
+        notify: bool = True,
+        changed_by: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Move applications, chosen by ID or by filter, to new_status
+
+        db must be a tenant session (see get_tenant_db), which limits both
+        the SELECT and the UPDATE to the caller's company. Applications that
+        cannot make the transition are reported, not failed. Filter
+        selections are capped at MAX_BULK_APPLICATIONS ("has_more" tells
+        the caller to repeat the request). Every change is logged with
+        changed_by (see application_history).
+        Returns: per-ID results and counts
+        """
+        if new_status not in APPLICATION_STATUSES:
+            raise ApplicationStatusError(f"Invalid status. Must be one of: {', '.join(APPLICATION_STATUSES)}")
+        limit = ApplicationStatusConfig.MAX_BULK_APPLICATIONS
+
+        query = db.query(Application.id, Application.status, Application.user_id, Application.job_id, Application.company_id,
+                         Application.applied_at, Application.updated_at)
+        if application_ids is not None:
+            requested = list(dict.fromkeys(application_ids))
+            if not requested:
+                raise ApplicationStatusError("No application IDs given")
+            if len(requested) > limit:
+                raise ApplicationStatusError(f"At most {limit} applications per request")
+            rows = {row.id: row for row in query.filter(Application.id.in_(requested))}
+            has_more = False
+        else:
+            if current_status:
+                query = query.filter(Application.status == current_status)
+            if job_id:
+                query = query.filter(Application.job_id == job_id)
+            matched = query.order_by(Application.id).limit(limit + 1).all()
+            has_more = len(matched) > limit
+            rows = {row.id: row for row in matched[:limit]}
+            requested = list(rows)
+
+        # Validate every transition before writing anything
+        results = {}
+        movable = []
+        for application_id in requested:
+            row = rows.get(application_id)
+            if row is None:
+                results[application_id] = {"id": application_id, "result": "not_found"}
+            elif row.status == new_status:
+                results[application_id] = {"id": application_id, "result": "unchanged", "status": row.status}
+            elif new_status not in STATUS_TRANSITIONS.get(row.status, ()):
+                results[application_id] = {"id": application_id, "result": "invalid_transition", "status": row.status}
+            else:
+                movable.append(application_id)
+
+        # One UPDATE per current status; the guard skips rows whose status
+        # changed since the SELECT, so each change is logged with the status
+        # it really left
+        movable_by_status: Dict[str, List[int]] = {}
+        for application_id in movable:
+            movable_by_status.setdefault(rows[application_id].status, []).append(application_id)
+        updated_ids = set()
+        for from_status, ids in movable_by_status.items():
+            updated_ids.update(db.scalars(
+                update(Application)
+                .where(Application.id.in_(ids), Application.status == from_status)
+                .values(status=new_status, updated_at=func.now())
+                .returning(Application.id)
+                .execution_options(synchronize_session=False)
+            ))
+        for application_id in movable:
+            if application_id in updated_ids:
+                results[application_id] = {"id": application_id, "result": "updated", "previous_status": rows[application_id].status}
+            else:
+                results[application_id] = {"id": application_id, "result": "conflict"}
+
+        application_history.record_transitions(
+            db, [rows[i] for i in requested if i in updated_ids], new_status, changed_by=changed_by
+        )
+
+        notifications = {"immediate": 0, "digested": 0, "skipped": 0}
+        if notify and updated_ids:
+            notifications = digest_scheduler.notify_users(
+                db, self._notifications(loader, [rows[i] for i in requested if i in updated_ids], new_status)
+            )
+        db.commit()
+        my_applications_service.invalidate(rows[application_id].user_id for application_id in updated_ids)
+
+        counts = {}
+        for result in results.values():
+            counts[result["result"]] = counts.get(result["result"], 0) + 1
+        logger.info(f"Bulk status update to '{new_status}': {counts}")
+
+        return {
+            "status": new_status,
+            "counts": counts,
+            "notifications": notifications,
+            "has_more": has_more,
+            "results": [results[application_id] for application_id in requested]
+        }
+
+    def update_one(
+        self,
+        db: Session,
+        loader: Optional[TenantLoader],
+        application_id: int,
+        new_status: str,
+        notify: bool = False,
+        changed_by: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Move one application to new_status under the same rules as bulk_update
+        (loader is only needed with notify)
+        Returns: its result, "updated" or "unchanged"
+        Raises: ApplicationStatusError for an invalid status or transition,
+        ApplicationStatusConflict if the application changed meanwhile
+        """
+        result = self.bulk_update(
+            db, loader, new_status, application_ids=[application_id], notify=notify, changed_by=changed_by
+        )["results"][0]
+        if result["result"] == "invalid_transition":
+            raise ApplicationStatusError(f"Cannot change status from '{result['status']}' to '{new_status}'")
+        if result["result"] in ("not_found", "conflict"):
+            raise ApplicationStatusConflict("Application was changed by another request; reload and try again")
+        return result
+
+    @staticmethod
+    def _notifications(loader: TenantLoader, rows: List[Any], new_status: str) -> List[Notification]:
+        """Status update notifications, with users, jobs and companies loaded in one query each"""
+        users = loader.load_many(User, [row.user_id for row in rows])
+        jobs = loader.load_many(Job, [row.job_id for row in rows])
+        companies = loader.load_many(Company, [job.company_id for job in jobs.values()])
+        update_date = datetime.utcnow().strftime("%B %d, %Y")
+
+        notifications = []
+        for row in rows:
+            user, job = users.get(row.user_id), jobs.get(row.job_id)
+            if not user or not job:
+                continue
+            company = companies.get(job.company_id)
+            notifications.append(Notification(
+                user_id=row.user_id,
+                template_name=STATUS_TEMPLATE_NAME,
+                template_data={
+                    "user_name": f"{user.first_name} {user.last_name}",
+                    "job_title": job.title,
+                    "company_name": company.name if company else "",
+                    "new_status": new_status.replace("_", " ").title(),
+                    "application_id": row.id,
+                    "update_date": update_date
+                },
+                category="application_status_updates",
+                company_id=row.company_id,
+                application_id=row.id,
+                job_id=row.job_id
+            ))
+        return notifications
+
+
+# Global service instance
+application_status_service = ApplicationStatusService()
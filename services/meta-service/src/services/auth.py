@@ -51,3 +51,19 @@ def create_access_token(data: dict, expires_delta: int = ACCESS_TOKEN_EXPIRE_MIN
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
+
+# Creates a short-lived token that is only good for one purpose (its audience),
+# for places where the token ends up in a URL, e.g. the email queue event
+# stream (EventSource cannot send an Authorization header).
+# Access token checks reject it: they do not accept tokens with an audience.
+# Parameters:
+#   data (dict): The data to encode in the token (e.g., user info).
+#   audience (str): What the token may be used for.
+#   expires_seconds (int): How many seconds until the token expires.
+# Returns:
+#   str: The encoded JWT token as a string.
+def create_scoped_token(data: dict, audience: str, expires_seconds: int):
+    to_encode = data.copy()
+    expire = datetime.utcnow() + timedelta(seconds=expires_seconds)
+    to_encode.update({"exp": expire, "aud": audience})
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
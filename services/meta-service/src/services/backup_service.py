@@ -0,0 +1,376 @@
+"""
+Backup Service for Meta Portal.
+Online backups of the SQLite database using SQLite's backup API.
+
+Pages are copied a few hundred at a time; the read lock is released and the
+service pauses between steps, so writers are never blocked for long. Each
+snapshot is gzip-compressed, restored into a scratch file and integrity
+checked before it is kept.
+
+Optional WAL shipping (BACKUP_WAL_SHIPPING=true) gives point-in-time
+recovery between snapshots: the app runs in WAL mode with automatic
+checkpoints off, and ship_wal() archives the write-ahead log accumulated
+since the last snapshot. Restoring a snapshot plus one of its WAL copies
+recovers the database as of that copy.
+"""
+
+import gzip
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from sqlalchemy import event
+
+from ..config.database import engine
+
+logger = logging.getLogger(__name__)
+
+
+class BackupConfig:
+    """Backup settings - can be overridden by environment variables"""
+
+    # Where snapshots, WAL copies and manifests are written (default: backups/ next to the database)
+    BACKUP_DIR = os.getenv("BACKUP_DIR", "")
+
+    # Pages copied per backup step (the read lock is held only during a step)
+    PAGES_PER_STEP = int(os.getenv("BACKUP_PAGES_PER_STEP", "256"))
+
+    # Pause between steps, letting writers in
+    STEP_PAUSE_MS = float(os.getenv("BACKUP_STEP_PAUSE_MS", "5"))
+
+    # Snapshots kept (older ones are deleted with their WAL copies)
+    KEEP_BACKUPS = int(os.getenv("BACKUP_KEEP_BACKUPS", "7"))
+
+    # Archive the WAL between snapshots for point-in-time recovery
+    WAL_SHIPPING = os.getenv("BACKUP_WAL_SHIPPING", "false").lower() == "true"
+
+    COMPRESS_LEVEL = int(os.getenv("BACKUP_COMPRESS_LEVEL", "6"))
+
+
+class BackupError(Exception):
+    """A backup could not be taken or restored"""
+
+
+# SQLite WAL header: magic, format, page size, checkpoint sequence, salt-1, salt-2
+WAL_HEADER_SIZE = 32
+
+
+def install_wal_shipping(target_engine):
+    """
+    Run the app's SQLite connections in WAL mode without automatic checkpoints
+    Checkpoints reset the WAL, which would break the chain of shipped WAL
+    copies; with shipping enabled only snapshots checkpoint.
+    """
+    if not BackupConfig.WAL_SHIPPING or target_engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(target_engine, "connect")
+    def _configure_wal(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA wal_autocheckpoint=0")
+        cursor.close()
+
+
+class BackupService:
+    """Takes, verifies, lists and restores database snapshots"""
+
+    def __init__(self, database_path: str = None, backup_dir: str = None):
+        self._database_path = database_path
+        self._backup_dir = backup_dir
+        self._lock = threading.Lock()
+
+    @property
+    def database_path(self) -> str:
+        path = self._database_path or (engine.url.database if engine.dialect.name == "sqlite" else None)
+        if not path or path == ":memory:":
+            raise BackupError("Online backups need a file-based SQLite database")
+        return os.path.abspath(path)
+
+    @property
+    def backup_dir(self) -> str:
+        backup_dir = self._backup_dir or BackupConfig.BACKUP_DIR or os.path.join(
+            os.path.dirname(self.database_path), "backups"
+        )
+        os.makedirs(backup_dir, exist_ok=True)
+        return backup_dir
+
+    # ==========================================
+    # SNAPSHOTS
+    # ==========================================
+
+    def create_backup(self) -> Dict[str, Any]:
+        """Take a compressed, verified snapshot; returns its manifest"""
+        if not self._lock.acquire(blocking=False):
+            raise BackupError("A backup is already running")
+        try:
+            return self._create_backup()
+        finally:
+            self._lock.release()
+
+    def _create_backup(self) -> Dict[str, Any]:
+        name = f"meta-{datetime.utcnow():%Y%m%d-%H%M%S-%f}"
+        raw_path = os.path.join(self.backup_dir, f"{name}.db.partial")
+        snapshot_path = os.path.join(self.backup_dir, f"{name}.db.gz")
+
+        source = self._connect_source()
+        try:
+            if BackupConfig.WAL_SHIPPING:
+                # Start a fresh WAL generation: everything so far goes into the snapshot
+                busy, _, _ = source.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+                if busy:
+                    logger.warning("WAL checkpoint before backup was blocked; shipped WAL copies will be larger")
+
+            steps = 0
+            pause = BackupConfig.STEP_PAUSE_MS / 1000
+
+            def progress(status, remaining, total):
+                nonlocal steps
+                steps += 1
+                if remaining and pause:
+                    time.sleep(pause)
+
+            start = time.perf_counter()
+            destination = sqlite3.connect(raw_path)
+            try:
+                source.backup(destination, pages=BackupConfig.PAGES_PER_STEP, progress=progress)
+                page_size = destination.execute("PRAGMA page_size").fetchone()[0]
+                page_count = destination.execute("PRAGMA page_count").fetchone()[0]
+            finally:
+                destination.close()
+            backup_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            self._compress(raw_path, snapshot_path)
+            compress_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            verification = self.verify_backup(snapshot_path)
+            verify_seconds = time.perf_counter() - start
+        except Exception:
+            # Never leave a snapshot behind that has not been verified
+            if os.path.exists(snapshot_path):
+                os.remove(snapshot_path)
+            raise
+        finally:
+            source.close()
+            if os.path.exists(raw_path):
+                os.remove(raw_path)
+
+        database_bytes = page_size * page_count
+        manifest = {
+            "name": name,
+            "snapshot": os.path.basename(snapshot_path),
+            "created_at": datetime.utcnow().isoformat(),
+            "page_size": page_size,
+            "pages": page_count,
+            "steps": steps,
+            "database_bytes": database_bytes,
+            "compressed_bytes": os.path.getsize(snapshot_path),
+            "backup_seconds": round(backup_seconds, 3),
+            "compress_seconds": round(compress_seconds, 3),
+            "verify_seconds": round(verify_seconds, 3),
+            "throughput_mb_s": round(database_bytes / 1024 / 1024 / backup_seconds, 2) if backup_seconds else None,
+            "verified": verification,
+            "wal": {"salt": None, "copies": []} if BackupConfig.WAL_SHIPPING else None
+        }
+        self._write_manifest(manifest)
+        self._prune()
+        logger.info(
+            f"Backup {name}: {database_bytes} bytes in {backup_seconds:.2f}s "
+            f"({manifest['throughput_mb_s']} MB/s), {manifest['compressed_bytes']} bytes compressed"
+        )
+        return manifest
+
+    def verify_backup(self, snapshot_path: str, wal_path: str = None) -> Dict[str, Any]:
+        """Restore into a scratch file and run an integrity check; raises BackupError on failure"""
+        with tempfile.TemporaryDirectory(prefix="meta-verify-") as scratch:
+            restored = os.path.join(scratch, "verify.db")
+            result = self._restore_to(snapshot_path, restored, wal_path)
+        return result
+
+    # ==========================================
+    # WAL SHIPPING
+    # ==========================================
+
+    def ship_wal(self) -> Dict[str, Any]:
+        """
+        Archive the WAL written since the latest snapshot
+        If the WAL was reset by a checkpoint outside this service, the chain
+        is broken and a new snapshot is taken instead.
+        """
+        if not BackupConfig.WAL_SHIPPING:
+            raise BackupError("WAL shipping is disabled (BACKUP_WAL_SHIPPING)")
+        if not self._lock.acquire(blocking=False):
+            raise BackupError("A backup is already running")
+        try:
+            manifests = self.list_backups()
+            if not manifests or manifests[0]["wal"] is None:
+                return self._create_backup()
+            manifest = manifests[0]
+
+            source = self._connect_source()
+            try:
+                # An open read transaction keeps the WAL from being reset while it is copied
+                source.execute("BEGIN")
+                source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+                wal_path = self.database_path + "-wal"
+                header = self._read_wal_header(wal_path)
+                if header is None:
+                    return {"name": manifest["name"], "shipped": False, "reason": "WAL is empty"}
+
+                salt = header[16:24].hex()
+                if manifest["wal"]["salt"] not in (None, salt):
+                    logger.warning("WAL was reset outside the backup service; taking a new snapshot")
+                    source.rollback()
+                    source.close()
+                    source = None
+                    return self._create_backup()
+
+                copy_name = f"{manifest['name']}.wal-{len(manifest['wal']['copies']) + 1:04d}.gz"
+                start = time.perf_counter()
+                wal_bytes = os.path.getsize(wal_path)
+                self._compress(wal_path, os.path.join(self.backup_dir, copy_name))
+                seconds = time.perf_counter() - start
+            finally:
+                if source is not None:
+                    source.rollback()
+                    source.close()
+
+            manifest["wal"]["salt"] = salt
+            manifest["wal"]["copies"].append({
+                "file": copy_name,
+                "shipped_at": datetime.utcnow().isoformat(),
+                "wal_bytes": wal_bytes,
+                "compressed_bytes": os.path.getsize(os.path.join(self.backup_dir, copy_name)),
+                "seconds": round(seconds, 3)
+            })
+            self._write_manifest(manifest)
+            return {"name": manifest["name"], "shipped": True, **manifest["wal"]["copies"][-1]}
+        finally:
+            self._lock.release()
+
+    # ==========================================
+    # RESTORE
+    # ==========================================
+
+    def restore(self, name: str, target_path: str, wal_copy: int = None) -> Dict[str, Any]:
+        """
+        Restore snapshot `name` to target_path, optionally replaying WAL copy
+        number `wal_copy` (1-based; -1 for the latest) for point-in-time recovery
+        """
+        if os.path.exists(target_path):
+            raise BackupError(f"Restore target {target_path} already exists")
+        manifest = self.get_manifest(name)
+        wal_path = None
+        if wal_copy is not None:
+            copies = (manifest["wal"] or {}).get("copies", [])
+            if not copies:
+                raise BackupError(f"Backup {name} has no WAL copies")
+            try:
+                wal_path = os.path.join(self.backup_dir, copies[wal_copy if wal_copy < 0 else wal_copy - 1]["file"])
+            except IndexError:
+                raise BackupError(f"Backup {name} has {len(copies)} WAL copies")
+        return self._restore_to(os.path.join(self.backup_dir, manifest["snapshot"]), target_path, wal_path)
+
+    def _restore_to(self, snapshot_path: str, target_path: str, wal_path: str = None) -> Dict[str, Any]:
+        self._decompress(snapshot_path, target_path)
+        if wal_path:
+            self._decompress(wal_path, target_path + "-wal")
+
+        connection = sqlite3.connect(target_path)
+        try:
+            integrity = connection.execute("PRAGMA integrity_check").fetchone()[0]
+            if integrity != "ok":
+                raise BackupError(f"Integrity check failed for {os.path.basename(snapshot_path)}: {integrity}")
+            # Fold any replayed WAL into the database file
+            connection.execute("PRAGMA journal_mode=DELETE")
+            tables = [row[0] for row in connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+            )]
+            row_counts = {table: connection.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] for table in tables}
+        finally:
+            connection.close()
+        return {"integrity": integrity, "tables": len(tables), "rows": sum(row_counts.values()), "row_counts": row_counts}
+
+    # ==========================================
+    # MANIFESTS
+    # ==========================================
+
+    def list_backups(self) -> List[Dict[str, Any]]:
+        """Manifests of kept snapshots, newest first"""
+        manifests = []
+        for filename in sorted(os.listdir(self.backup_dir), reverse=True):
+            if filename.endswith(".json"):
+                with open(os.path.join(self.backup_dir, filename)) as f:
+                    manifests.append(json.load(f))
+        return manifests
+
+    def get_manifest(self, name: str) -> Dict[str, Any]:
+        path = os.path.join(self.backup_dir, f"{os.path.basename(name)}.json")
+        if not os.path.exists(path):
+            raise BackupError(f"Backup {name} not found")
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest: Dict[str, Any]):
+        path = os.path.join(self.backup_dir, f"{manifest['name']}.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(path + ".tmp", path)
+
+    def _prune(self):
+        for manifest in self.list_backups()[BackupConfig.KEEP_BACKUPS:]:
+            files = [manifest["snapshot"], f"{manifest['name']}.json"]
+            files += [copy["file"] for copy in (manifest["wal"] or {}).get("copies", [])]
+            for filename in files:
+                try:
+                    os.remove(os.path.join(self.backup_dir, filename))
+                except FileNotFoundError:
+                    pass
+            logger.info(f"Pruned backup {manifest['name']}")
+
+    # ==========================================
+    # HELPERS
+    # ==========================================
+
+    def _connect_source(self) -> sqlite3.Connection:
+        if not os.path.exists(self.database_path):
+            raise BackupError(f"Database {self.database_path} does not exist")
+        connection = sqlite3.connect(self.database_path, timeout=30, isolation_level=None)
+        # Never checkpoint from here; only snapshots reset the WAL
+        connection.execute("PRAGMA wal_autocheckpoint=0")
+        return connection
+
+    @staticmethod
+    def _read_wal_header(wal_path: str) -> Optional[bytes]:
+        try:
+            with open(wal_path, "rb") as f:
+                header = f.read(WAL_HEADER_SIZE)
+        except FileNotFoundError:
+            return None
+        return header if len(header) == WAL_HEADER_SIZE else None
+
+    @staticmethod
+    def _compress(source_path: str, target_path: str):
+        with open(source_path, "rb") as source, gzip.open(
+            target_path + ".partial", "wb", compresslevel=BackupConfig.COMPRESS_LEVEL
+        ) as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+        os.replace(target_path + ".partial", target_path)
+
+    @staticmethod
+    def _decompress(source_path: str, target_path: str):
+        with gzip.open(source_path, "rb") as source, open(target_path, "wb") as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+
+
+# Global backup service instance
+backup_service = BackupService()
@@ -0,0 +1,282 @@
+"""
+Digest Service for Meta Portal.
+Routes user notifications according to EmailPreference and coalesces
+daily/weekly notifications into one digest email per user per window.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, NamedTuple
+
+from sqlalchemy import insert, update, func
+from sqlalchemy.orm import Session
+
+from ..config.database import SessionLocal
+from ..models.email import EmailTemplate, EmailPreference, EmailDigestItem
+from ..models.user import User
+from .email_service import email_service, EmailConfig
+
+logger = logging.getLogger(__name__)
+
+DIGEST_FREQUENCIES = ("daily", "weekly")
+DIGEST_TEMPLATE_NAME = "notification_digest"
+
+
+class Notification(NamedTuple):
+    """A templated notification for one user"""
+    user_id: int
+    template_name: str
+    template_data: Dict[str, Any]
+    category: Optional[str] = None  # EmailPreference flag, e.g. "application_status_updates"
+    company_id: Optional[int] = None
+    application_id: Optional[int] = None
+    job_id: Optional[int] = None
+
+
+class DigestScheduler:
+    """Buffers notifications for digest users and sends the digests when due"""
+    
+    def notify_users(self, db: Session, notifications: List[Notification]) -> Dict[str, int]:
+        """
+        Deliver notifications according to each user's email preferences
+        
+        Users, preferences and templates are loaded with one query each.
+        Notifications for "immediate" users are queued as emails; those for
+        daily/weekly users are buffered as digest items. Nothing is committed,
+        so notifications join the caller's transaction.
+        Returns: counts of immediate, digested and skipped notifications
+        """
+        result = {"immediate": 0, "digested": 0, "skipped": 0}
+        if not notifications:
+            return result
+        
+        user_ids = {n.user_id for n in notifications}
+        template_names = {n.template_name for n in notifications}
+        
+        emails = dict(db.query(User.id, User.email).filter(User.id.in_(user_ids)).all())
+        preferences = {
+            preference.user_id: preference
+            for preference in db.query(EmailPreference).filter(EmailPreference.user_id.in_(user_ids))
+        }
+        templates = {
+            template.name: template
+            for template in db.query(EmailTemplate).filter(
+                EmailTemplate.name.in_(template_names),
+                EmailTemplate.is_active == True
+            )
+        }
+        
+        engine = email_service.template_engine
+        now = datetime.utcnow()
+        email_rows = []
+        digest_rows = []
+        
+        for notification in notifications:
+            recipient_email = emails.get(notification.user_id)
+            template = templates.get(notification.template_name)
+            preference = preferences.get(notification.user_id)
+            
+            if not recipient_email or not template:
+                if not template:
+                    logger.warning(f"Notification template '{notification.template_name}' not found or inactive")
+                result["skipped"] += 1
+                continue
+            
+            # Respect per-category opt-outs
+            if preference and notification.category and not getattr(preference, notification.category, True):
+                result["skipped"] += 1
+                continue
+            
+            try:
+                subject, html_content, text_content = engine.render_compiled(
+                    engine.get_compiled_template(template), notification.template_data
+                )
+            except Exception as e:
+                logger.error(f"Error rendering notification {notification.template_name} for user {notification.user_id}: {str(e)}")
+                result["skipped"] += 1
+                continue
+            
+            if self._frequency(preference) in DIGEST_FREQUENCIES:
+                digest_rows.append({
+                    "user_id": notification.user_id,
+                    "company_id": notification.company_id,
+                    "recipient_email": recipient_email,
+                    "template_name": notification.template_name,
+                    "subject": subject,
+                    "text_content": text_content,
+                    "application_id": notification.application_id,
+                    "job_id": notification.job_id,
+                    "created_at": now
+                })
+            else:
+                email_rows.append({
+                    "recipient_email": recipient_email,
+                    "recipient_name": notification.template_data.get('user_name'),
+                    "subject": subject,
+                    "html_content": html_content,
+                    "text_content": text_content,
+                    "template_name": notification.template_name,
+                    "template_data": notification.template_data,
+                    "company_id": notification.company_id,
+                    "user_id": notification.user_id,
+                    "application_id": notification.application_id,
+                    "job_id": notification.job_id
+                })
+        
+        email_service.enqueue_emails(db, email_rows, queue_name="notifications")
+        if digest_rows:
+            db.execute(insert(EmailDigestItem), digest_rows)
+        
+        result["immediate"] = len(email_rows)
+        result["digested"] = len(digest_rows)
+        return result
+    
+    def run_due_digests_task(self) -> Dict[str, int]:
+        """
+        Background task entry point for sending due digests
+        Uses its own session since the request session is gone by the time this runs
+        """
+        db = SessionLocal()
+        try:
+            return self.run_due_digests(db)
+        finally:
+            db.close()
+    
+    def run_due_digests(self, db: Session, now: datetime = None) -> Dict[str, int]:
+        """
+        Send every digest whose window has closed
+        
+        A user's digest is due once their latest delivery slot (preferred_time
+        today for daily, on EmailConfig.DIGEST_WEEKLY_DAY for weekly) has
+        passed and they have items buffered from before that slot. Items
+        created after the slot wait for the next window. Digests are rendered
+        once per user and queued in chunks of users, one commit per chunk.
+        Returns: counts of users, items and digest emails
+        """
+        now = now or datetime.utcnow()
+        result = {"users": 0, "items": 0, "emails": 0}
+        
+        pending = (
+            db.query(
+                EmailDigestItem.user_id,
+                func.min(EmailDigestItem.created_at),
+                EmailPreference.digest_frequency,
+                EmailPreference.preferred_time
+            )
+            .outerjoin(EmailPreference, EmailPreference.user_id == EmailDigestItem.user_id)
+            .filter(EmailDigestItem.digest_email_id.is_(None))
+            .group_by(EmailDigestItem.user_id, EmailPreference.digest_frequency, EmailPreference.preferred_time)
+            .all()
+        )
+        
+        due: Dict[int, tuple[datetime, str]] = {}
+        for user_id, oldest, frequency, preferred_time in pending:
+            frequency = frequency if frequency in DIGEST_FREQUENCIES else "immediate"
+            slot = self.latest_slot(frequency, preferred_time, now)
+            if oldest < slot:
+                due[user_id] = (slot, frequency)
+        
+        if not due:
+            return result
+        
+        digest_template = email_service.template_engine.env.get_template(f"{DIGEST_TEMPLATE_NAME}.html")
+        user_ids = list(due)
+        chunk_size = max(EmailConfig.DIGEST_USER_CHUNK_SIZE, 1)
+        
+        for start in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[start:start + chunk_size]
+            names = {
+                user_id: f"{first_name} {last_name}"
+                for user_id, first_name, last_name in db.query(User.id, User.first_name, User.last_name).filter(User.id.in_(chunk))
+            }
+            items_by_user = defaultdict(list)
+            for item in (
+                db.query(
+                    EmailDigestItem.id, EmailDigestItem.user_id, EmailDigestItem.company_id,
+                    EmailDigestItem.recipient_email, EmailDigestItem.subject,
+                    EmailDigestItem.text_content, EmailDigestItem.created_at
+                )
+                .filter(EmailDigestItem.user_id.in_(chunk), EmailDigestItem.digest_email_id.is_(None))
+                .order_by(EmailDigestItem.user_id, EmailDigestItem.created_at)
+            ):
+                if item.created_at < due[item.user_id][0]:
+                    items_by_user[item.user_id].append(item)
+            
+            email_rows = []
+            digest_items = []
+            for user_id, items in items_by_user.items():
+                frequency = due[user_id][1]
+                count = len(items)
+                subject = f"Your {frequency} update: {count} notification{'' if count == 1 else 's'}"
+                user_name = names.get(user_id, "")
+                html_content = digest_template.render(
+                    subject=subject,
+                    user_name=user_name,
+                    frequency=frequency,
+                    items=items,
+                    current_year=now.year
+                )
+                text_content = "\n\n".join(
+                    f"- {item.subject}\n{item.text_content or ''}".rstrip() for item in items
+                )
+                email_rows.append({
+                    "recipient_email": items[-1].recipient_email,
+                    "recipient_name": user_name,
+                    "subject": subject,
+                    "html_content": html_content,
+                    "text_content": text_content,
+                    "template_name": DIGEST_TEMPLATE_NAME,
+                    "template_data": {"frequency": frequency, "item_count": count},
+                    "company_id": items[-1].company_id,
+                    "user_id": user_id
+                })
+                digest_items.append(items)
+            
+            email_ids = email_service.enqueue_emails(db, email_rows, queue_name="digest")
+            db.execute(
+                update(EmailDigestItem),
+                [
+                    {"id": item.id, "digest_email_id": email_id, "delivered_at": now}
+                    for email_id, items in zip(email_ids, digest_items)
+                    for item in items
+                ]
+            )
+            db.commit()
+            
+            result["users"] += len(email_ids)
+            result["emails"] += len(email_ids)
+            result["items"] += sum(len(items) for items in digest_items)
+        
+        logger.info(f"Queued {result['emails']} digest emails covering {result['items']} notifications")
+        return result
+    
+    @staticmethod
+    def latest_slot(frequency: str, preferred_time: Optional[str], now: datetime) -> datetime:
+        """Most recent delivery slot at or before `now` for a digest frequency"""
+        if frequency not in DIGEST_FREQUENCIES:
+            return now
+        
+        try:
+            hour, minute = (int(part) for part in (preferred_time or EmailConfig.DIGEST_DEFAULT_TIME).split(":"))
+        except ValueError:
+            hour, minute = (int(part) for part in EmailConfig.DIGEST_DEFAULT_TIME.split(":"))
+        
+        slot = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if frequency == "weekly":
+            slot -= timedelta(days=(slot.weekday() - EmailConfig.DIGEST_WEEKLY_DAY) % 7)
+            if slot > now:
+                slot -= timedelta(days=7)
+        elif slot > now:
+            slot -= timedelta(days=1)
+        return slot
+    
+    @staticmethod
+    def _frequency(preference: Optional[EmailPreference]) -> str:
+        if preference is None:
+            return "immediate"
+        return getattr(preference.digest_frequency, "value", preference.digest_frequency)
+
+
+# Global digest scheduler instance
+digest_scheduler = DigestScheduler()
@@ -0,0 +1,153 @@
+"""
+Email Event Bus for Meta Portal.
+In-process publish/subscribe for email queue and delivery events, plus
+queue counters that are maintained incrementally from those events so
+dashboards never have to recount the email_queue table.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Any, Set, Tuple
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from ..models.email import EmailQueue
+
+logger = logging.getLogger(__name__)
+
+QUEUE_STATUSES = ("queued", "processing", "completed", "failed")
+
+# Statuses of entries still in the queue (waiting or being sent)
+PENDING_QUEUE_STATUSES = ("queued", "processing")
+
+# Session.info key for events waiting on their transaction to commit
+PENDING_EVENTS_KEY = "email_queue_events"
+
+
+class EventBus:
+    """
+    Fan-out of events to asyncio subscribers
+    publish() is safe to call from any thread; each subscriber gets a bounded
+    queue and the oldest events are dropped if a slow client falls behind.
+    """
+    
+    def __init__(self, max_queue_size: int = 1000):
+        self.max_queue_size = max_queue_size
+        self._subscribers: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = set()
+        self._lock = threading.Lock()
+    
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+    
+    def subscribe(self) -> asyncio.Queue:
+        """Register a subscriber on the running event loop"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue_size)
+        with self._lock:
+            self._subscribers.add((asyncio.get_running_loop(), queue))
+        return queue
+    
+    def unsubscribe(self, queue: asyncio.Queue):
+        with self._lock:
+            self._subscribers = {entry for entry in self._subscribers if entry[1] is not queue}
+    
+    def publish(self, event: Dict[str, Any]):
+        """Deliver an event to every subscriber without blocking the caller"""
+        if not self._subscribers:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, event)
+            except RuntimeError:
+                # Subscriber's loop has been closed
+                self.unsubscribe(queue)
+    
+    @staticmethod
+    def _offer(queue: asyncio.Queue, event: Dict[str, Any]):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+
+class EmailQueueMonitor:
+    """
+    Email queue counters kept up to date from queue events
+    Counters are seeded with one GROUP BY the first time a dashboard
+    subscribes; after that every change arrives as a delta. Counts cover
+    the queue activity of this process only.
+    """
+    
+    def __init__(self, bus: EventBus):
+        self.bus = bus
+        self._counts: Counter = Counter()
+        self._loaded = False
+        self._lock = threading.Lock()
+    
+    def load(self, db: Session):
+        """Seed counters from the database (only the first call queries)"""
+        if self._loaded:
+            return
+        rows = db.query(EmailQueue.status, func.count(EmailQueue.id)).group_by(EmailQueue.status).all()
+        with self._lock:
+            if not self._loaded:
+                self._counts = Counter(dict(rows))
+                self._loaded = True
+    
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {status: self._counts.get(status, 0) for status in QUEUE_STATUSES}
+    
+    def record(self, event_type: str, changes: Dict[str, int] = None, db: Session = None, **details):
+        """
+        Apply counter deltas and publish the event with the new counts
+        If db has a transaction open, both wait until it commits and are
+        dropped if it rolls back, so subscribers only see committed changes.
+        """
+        if db is not None and db.in_transaction():
+            db.info.setdefault(PENDING_EVENTS_KEY, []).append((self, event_type, changes, details))
+            return
+        self._publish(event_type, changes, details)
+    
+    def _publish(self, event_type: str, changes: Dict[str, int], details: Dict[str, Any]):
+        if changes and self._loaded:
+            with self._lock:
+                self._counts.update(changes)
+        self.bus.publish({
+            "type": event_type,
+            "at": datetime.utcnow().isoformat(),
+            "counts": self.snapshot(),
+            **details
+        })
+    
+    # Convenience wrappers used by the email service
+    
+    def queued(self, count: int = 1, queue_name: str = "default", db: Session = None):
+        self.record("queued", {"queued": count}, db=db, count=count, queue=queue_name)
+    
+    def transition(self, old_status: str, new_status: str, email_id: int = None, db: Session = None):
+        self.record("queue_status", {old_status: -1, new_status: 1}, db=db, email_id=email_id, status=new_status)
+    
+    def delivery(self, email_id: int, status: str, db: Session = None):
+        self.record("delivery", db=db, email_id=email_id, status=status)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_events(session: Session):
+    for monitor, event_type, changes, details in session.info.pop(PENDING_EVENTS_KEY, ()):
+        monitor._publish(event_type, changes, details)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_rolled_back_events(session: Session):
+    session.info.pop(PENDING_EVENTS_KEY, None)
+
+
+# Global event bus and queue monitor
+email_event_bus = EventBus()
+email_queue_monitor = EmailQueueMonitor(email_event_bus)
@@ -9,20 +9,31 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, NamedTuple, TYPE_CHECKING
 import logging
+import tempfile
+import threading
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import cached_property
+from itertools import islice
 import uuid
 import os
 from pathlib import Path
 
-from jinja2 import Environment, FileSystemLoader, Template
+from sqlalchemy import insert, update, func
 from sqlalchemy.orm import Session
 
-from ..config.database import get_db
-from ..models.email import Email, EmailTemplate, EmailQueue, EmailStatus, EmailPriority
+from ..config.database import get_db, SessionLocal
+from ..models.email import Email, EmailTemplate, EmailQueue, EmailBatch, EmailStatus, EmailPriority
 from ..models.user import User
 from ..models.company import Company
+from .email_events import email_queue_monitor
+from .email_stats_service import email_stats_rollups
+
+if TYPE_CHECKING:
+    from jinja2 import Template
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -46,24 +57,64 @@ class EmailConfig:
     
     # Template settings
     TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "templates", "email")
+    TEMPLATE_BYTECODE_CACHE_DIR = os.getenv(
+        "EMAIL_TEMPLATE_BYTECODE_CACHE_DIR",
+        os.path.join(tempfile.gettempdir(), "meta_portal_email_templates")
+    )
+    COMPILED_TEMPLATE_CACHE_SIZE = int(os.getenv("EMAIL_COMPILED_TEMPLATE_CACHE_SIZE", "256"))
     
     # Email limits and retry settings
     MAX_RETRIES = int(os.getenv("EMAIL_MAX_RETRIES", "3"))
     RETRY_DELAY_MINUTES = int(os.getenv("EMAIL_RETRY_DELAY", "30"))
     RATE_LIMIT_PER_MINUTE = int(os.getenv("EMAIL_RATE_LIMIT", "60"))
+    
+    # Bulk send settings
+    BULK_CHUNK_SIZE = int(os.getenv("EMAIL_BULK_CHUNK_SIZE", "1000"))
+    BULK_RENDER_WORKERS = int(os.getenv("EMAIL_BULK_RENDER_WORKERS", "4"))
+    BULK_MAX_FAILURES_RECORDED = 100
+    
+    # Digest settings (times are UTC, weekday 0 = Monday)
+    DIGEST_DEFAULT_TIME = os.getenv("EMAIL_DIGEST_DEFAULT_TIME", "09:00")
+    DIGEST_WEEKLY_DAY = int(os.getenv("EMAIL_DIGEST_WEEKLY_DAY", "0"))
+    DIGEST_USER_CHUNK_SIZE = int(os.getenv("EMAIL_DIGEST_USER_CHUNK_SIZE", "500"))
+    
+    # Background worker settings
+    WORKER_ENABLED = os.getenv("EMAIL_WORKER_ENABLED", "false").lower() == "true"
+    WORKER_POLL_SECONDS = int(os.getenv("EMAIL_WORKER_POLL_SECONDS", "30"))
+    WORKER_BATCH_SIZE = int(os.getenv("EMAIL_WORKER_BATCH_SIZE", "200"))
+    
+    # Dashboard event stream
+    QUEUE_STREAM_HEARTBEAT_SECONDS = int(os.getenv("EMAIL_QUEUE_STREAM_HEARTBEAT_SECONDS", "15"))
+    QUEUE_STREAM_TOKEN_SECONDS = int(os.getenv("EMAIL_QUEUE_STREAM_TOKEN_SECONDS", "60"))
+
+class CompiledEmailTemplate(NamedTuple):
+    """Compiled Jinja templates for one database email template"""
+    subject: "Template"
+    html: Optional["Template"]
+    text: "Template"
 
 class EmailTemplateEngine:
     """Template engine for rendering email content"""
     
     def __init__(self):
+        # Jinja2 is only imported once email rendering is actually needed
+        from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+
         # Create templates directory if it doesn't exist
         os.makedirs(EmailConfig.TEMPLATE_DIR, exist_ok=True)
+        os.makedirs(EmailConfig.TEMPLATE_BYTECODE_CACHE_DIR, exist_ok=True)
         
         # Initialize Jinja2 environment
+        # Bytecode caching lets new worker processes skip re-compiling file templates
         self.env = Environment(
             loader=FileSystemLoader(EmailConfig.TEMPLATE_DIR),
-            autoescape=True
+            autoescape=True,
+            bytecode_cache=FileSystemBytecodeCache(EmailConfig.TEMPLATE_BYTECODE_CACHE_DIR)
         )
+        
+        # Compiled database templates, keyed by (template id, version), LRU order
+        self._compiled_cache: "OrderedDict[tuple[int, int], CompiledEmailTemplate]" = OrderedDict()
+        self._compiled_cache_lock = threading.Lock()
     
     def render_template(self, template_name: str, variables: Dict[str, Any]) -> tuple[str, str]:
         """
@@ -89,27 +140,68 @@ class EmailTemplateEngine:
             logger.error(f"Error rendering template {template_name}: {str(e)}")
             raise Exception(f"Template rendering failed: {str(e)}")
     
+    def compile_db_template(self, template: EmailTemplate) -> CompiledEmailTemplate:
+        """
+        Compile the subject, HTML and text sources of a database template
+        Compile once and reuse the result when rendering for many recipients
+        """
+        from jinja2 import Template
+
+        return CompiledEmailTemplate(
+            subject=Template(template.subject_template),
+            html=Template(template.html_content) if template.html_content else None,
+            text=Template(template.text_content)
+        )
+    
+    def get_compiled_template(self, template: EmailTemplate) -> CompiledEmailTemplate:
+        """
+        Get compiled templates for a database template, compiling on a cache miss
+        Every template edit bumps EmailTemplate.version, so a stale entry can
+        never be returned for an edited template.
+        """
+        if template.id is None:
+            return self.compile_db_template(template)
+        
+        key = (template.id, template.version)
+        with self._compiled_cache_lock:
+            compiled = self._compiled_cache.get(key)
+            if compiled is not None:
+                self._compiled_cache.move_to_end(key)
+                return compiled
+        
+        compiled = self.compile_db_template(template)
+        
+        with self._compiled_cache_lock:
+            self._compiled_cache[key] = compiled
+            self._compiled_cache.move_to_end(key)
+            while len(self._compiled_cache) > EmailConfig.COMPILED_TEMPLATE_CACHE_SIZE:
+                self._compiled_cache.popitem(last=False)
+        
+        return compiled
+    
+    def invalidate_template(self, template_id: int):
+        """Drop every cached version of a database template"""
+        with self._compiled_cache_lock:
+            for key in [key for key in self._compiled_cache if key[0] == template_id]:
+                del self._compiled_cache[key]
+    
+    def render_compiled(self, compiled: CompiledEmailTemplate, variables: Dict[str, Any]) -> tuple[str, str, str]:
+        """
+        Render a compiled database template
+        Returns: (subject, html_content, text_content)
+        """
+        subject = compiled.subject.render(**variables)
+        html_content = compiled.html.render(**variables) if compiled.html else None
+        text_content = compiled.text.render(**variables)
+        return subject, html_content, text_content
+    
     def render_template_from_db(self, template: EmailTemplate, variables: Dict[str, Any]) -> tuple[str, str, str]:
         """
         Render email template from database template
         Returns: (subject, html_content, text_content)
         """
         try:
-            # Render subject
-            subject_template = Template(template.subject_template)
-            subject = subject_template.render(**variables)
-            
-            # Render HTML content
-            html_content = None
-            if template.html_content:
-                html_template = Template(template.html_content)
-                html_content = html_template.render(**variables)
-            
-            # Render text content
-            text_template = Template(template.text_content)
-            text_content = text_template.render(**variables)
-            
-            return subject, html_content, text_content
+            return self.render_compiled(self.get_compiled_template(template), variables)
         
         except Exception as e:
             logger.error(f"Error rendering database template {template.name}: {str(e)}")
@@ -129,6 +221,11 @@ class SMTPEmailSender:
     
     def __init__(self):
         self.config = EmailConfig()
+        
+        # Delivery health, reported by the readiness probe
+        self.consecutive_failures = 0
+        self.last_success_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
     
     def send_email(self, email_data: Dict[str, Any]) -> bool:
         """
@@ -167,18 +264,30 @@ class SMTPEmailSender:
                 server.send_message(msg)
             
             logger.info(f"Email sent successfully to {email_data['recipient_email']}")
+            self.consecutive_failures = 0
+            self.last_success_at = datetime.utcnow()
             return True
         
         except Exception as e:
             logger.error(f"Failed to send email to {email_data['recipient_email']}: {str(e)}")
+            self.consecutive_failures += 1
+            self.last_error = str(e)
             return False
 
 class EmailService:
-    """Main email service class"""
+    """
+    Main email service class
+    The template engine and SMTP sender are created on first use, so
+    importing the service (every worker boot, every test) stays cheap.
+    """
     
-    def __init__(self):
-        self.template_engine = EmailTemplateEngine()
-        self.smtp_sender = SMTPEmailSender()
+    @cached_property
+    def template_engine(self) -> EmailTemplateEngine:
+        return EmailTemplateEngine()
+    
+    @cached_property
+    def smtp_sender(self) -> SMTPEmailSender:
+        return SMTPEmailSender()
     
     async def send_email_async(
         self,
@@ -204,10 +313,7 @@ class EmailService:
         
         try:
             # Get template from database
-            template = db.query(EmailTemplate).filter(
-                EmailTemplate.name == template_name,
-                EmailTemplate.is_active == True
-            ).first()
+            template = self.get_active_template(db, template_name)
             
             if not template:
                 raise Exception(f"Template '{template_name}' not found or inactive")
@@ -239,10 +345,13 @@ class EmailService:
                 job_id=job_id,
                 tracking_enabled=tracking_enabled,
                 tracking_id=tracking_id,
-                status=EmailStatus.PENDING
+                status=EmailStatus.PENDING,
+                created_at=datetime.utcnow()
             )
             
             db.add(email)
+            db.flush()
+            email_stats_rollups.record_email_created(db, email)
             db.commit()
             db.refresh(email)
             
@@ -259,11 +368,280 @@ class EmailService:
             db.rollback()
             raise
     
+    def get_active_template(self, db: Session, template_name: str) -> Optional[EmailTemplate]:
+        """Get an active email template by name"""
+        return db.query(EmailTemplate).filter(
+            EmailTemplate.name == template_name,
+            EmailTemplate.is_active == True
+        ).first()
+    
+    # ==========================================
+    # BULK SENDING
+    # ==========================================
+    
+    def create_bulk_batch(
+        self,
+        db: Session,
+        template_name: str,
+        total_requested: int,
+        company_id: int = None,
+        created_by: int = None
+    ) -> EmailBatch:
+        """Create a batch record that a bulk send reports its progress into"""
+        batch = EmailBatch(
+            batch_id=f"bulk_{uuid.uuid4().hex}",
+            template_name=template_name,
+            status="queued",
+            total_requested=total_requested,
+            company_id=company_id,
+            created_by=created_by
+        )
+        db.add(batch)
+        db.commit()
+        db.refresh(batch)
+        return batch
+    
+    def run_bulk_batch(self, batch_id: str, recipients: List[str], **kwargs):
+        """
+        Background task entry point for bulk sends
+        Uses its own session since the request session is gone by the time this runs
+        """
+        db = SessionLocal()
+        try:
+            self.queue_bulk_emails(db, batch_id, recipients, **kwargs)
+        finally:
+            db.close()
+    
+    def queue_bulk_emails(
+        self,
+        db: Session,
+        batch_id: str,
+        recipients: List[str],
+        template_name: str,
+        template_data: Dict[str, Any] = None,
+        priority: EmailPriority = EmailPriority.NORMAL,
+        scheduled_at: datetime = None,
+        company_id: int = None
+    ) -> EmailBatch:
+        """
+        Render and queue one email per recipient for a bulk batch
+        
+        The template is loaded and compiled once. Chunks of recipients are
+        rendered in a thread pool while the previous chunk is inserted, and
+        every chunk is written as one multi-row insert into emails and
+        email_queue followed by a single commit. Delivery is left to the
+        queue processor, so nothing is sent over SMTP here.
+        """
+        if template_data is None:
+            template_data = {}
+        
+        batch = db.query(EmailBatch).filter(EmailBatch.batch_id == batch_id).first()
+        if not batch:
+            raise Exception(f"Email batch '{batch_id}' not found")
+        
+        try:
+            template = self.get_active_template(db, template_name)
+            if not template:
+                raise Exception(f"Template '{template_name}' not found or inactive")
+            
+            compiled = self.template_engine.get_compiled_template(template)
+            
+            batch.status = "processing"
+            batch.started_at = datetime.utcnow()
+            db.commit()
+            
+            chunk_size = max(EmailConfig.BULK_CHUNK_SIZE, 1)
+            workers = max(EmailConfig.BULK_RENDER_WORKERS, 1)
+            chunks = (recipients[i:i + chunk_size] for i in range(0, len(recipients), chunk_size))
+            failures: List[Dict[str, str]] = []
+            
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="email-render") as pool:
+                # Keep at most `workers` chunks rendered ahead of the inserts
+                in_flight = deque(
+                    pool.submit(self._render_bulk_chunk, compiled, template_data, chunk)
+                    for chunk in islice(chunks, workers)
+                )
+                while in_flight:
+                    rendered, chunk_failures = in_flight.popleft().result()
+                    next_chunk = next(chunks, None)
+                    if next_chunk is not None:
+                        in_flight.append(pool.submit(self._render_bulk_chunk, compiled, template_data, next_chunk))
+                    
+                    self._insert_bulk_chunk(
+                        db, batch, rendered, template_name, template_data,
+                        priority, scheduled_at, company_id
+                    )
+                    failures.extend(chunk_failures)
+                    batch.failed_count += len(chunk_failures)
+                    db.commit()
+            
+            # Usage statistics are bumped once for the whole batch
+            db.execute(
+                update(EmailTemplate)
+                .where(EmailTemplate.id == template.id)
+                .values(
+                    usage_count=EmailTemplate.usage_count + batch.emails_queued,
+                    last_used_at=datetime.utcnow()
+                )
+            )
+            
+            batch.failed_recipients = failures[:EmailConfig.BULK_MAX_FAILURES_RECORDED] or None
+            batch.status = "completed"
+            batch.completed_at = datetime.utcnow()
+            db.commit()
+            
+            logger.info(
+                f"Bulk batch {batch_id} queued {batch.emails_queued}/{batch.total_requested} emails "
+                f"({batch.failed_count} failed)"
+            )
+            return batch
+        
+        except Exception as e:
+            logger.error(f"Error processing bulk batch {batch_id}: {str(e)}")
+            db.rollback()
+            batch.status = "failed"
+            batch.error_message = str(e)
+            batch.completed_at = datetime.utcnow()
+            db.commit()
+            return batch
+    
+    def _render_bulk_chunk(
+        self,
+        compiled: CompiledEmailTemplate,
+        template_data: Dict[str, Any],
+        recipients: List[str]
+    ) -> tuple[List[tuple], List[Dict[str, str]]]:
+        """Render a compiled template for each recipient in a chunk"""
+        rendered = []
+        failures = []
+        for recipient in recipients:
+            try:
+                variables = {**template_data, "recipient_email": recipient}
+                rendered.append((recipient, *self.template_engine.render_compiled(compiled, variables)))
+            except Exception as e:
+                failures.append({"email": recipient, "error": str(e)})
+        return rendered, failures
+    
+    def _insert_bulk_chunk(
+        self,
+        db: Session,
+        batch: EmailBatch,
+        rendered: List[tuple],
+        template_name: str,
+        template_data: Dict[str, Any],
+        priority: EmailPriority,
+        scheduled_at: Optional[datetime],
+        company_id: Optional[int]
+    ):
+        """Insert emails and their queue entries for one rendered chunk"""
+        if not rendered:
+            return
+        
+        execute_after = scheduled_at or datetime.utcnow()
+        email_rows = [
+            {
+                "recipient_email": recipient,
+                "recipient_name": template_data.get('recipient_name'),
+                "subject": subject,
+                "html_content": html_content,
+                "text_content": text_content,
+                "template_name": template_name,
+                "template_data": template_data,
+                "scheduled_at": execute_after,
+                "company_id": company_id,
+                "batch_id": batch.batch_id
+            }
+            for recipient, subject, html_content, text_content in rendered
+        ]
+        email_ids = self.enqueue_emails(db, email_rows, priority=priority, queue_name="bulk")
+        batch.emails_queued += len(email_ids)
+    
+    def enqueue_emails(
+        self,
+        db: Session,
+        email_rows: List[Dict[str, Any]],
+        priority: EmailPriority = EmailPriority.NORMAL,
+        queue_name: str = "default"
+    ) -> List[int]:
+        """
+        Insert already-rendered emails and their queue entries
+        Uses one multi-row insert per table and does not commit, so callers
+        can make the emails part of a larger transaction.
+        Returns: ids of the new emails, in the order of email_rows
+        """
+        if not email_rows:
+            return []
+        
+        now = datetime.utcnow()
+        rows = [
+            {
+                "sender_email": EmailConfig.DEFAULT_FROM_EMAIL,
+                "sender_name": EmailConfig.DEFAULT_FROM_NAME,
+                "priority": priority,
+                "scheduled_at": now,
+                "status": EmailStatus.PENDING,
+                "max_retries": EmailConfig.MAX_RETRIES,
+                "created_at": now,
+                **row
+            }
+            for row in email_rows
+        ]
+        email_ids = db.scalars(
+            insert(Email).returning(Email.id, sort_by_parameter_order=True),
+            rows
+        ).all()
+        
+        priority_score = self._get_priority_score(priority)
+        db.execute(
+            insert(EmailQueue),
+            [
+                {
+                    "email_id": email_id,
+                    "queue_name": queue_name,
+                    "priority_score": priority_score,
+                    "execute_after": row["scheduled_at"],
+                    "status": "queued"
+                }
+                for email_id, row in zip(email_ids, rows)
+            ]
+        )
+        email_stats_rollups.record_created(db, rows)
+        email_queue_monitor.queued(len(email_ids), queue_name=queue_name, db=db)
+        return email_ids
+    
+    def get_bulk_batch_progress(self, db: Session, batch: EmailBatch) -> Dict[str, Any]:
+        """Get a batch's queueing progress plus delivery counts of its emails"""
+        status_counts = dict(
+            db.query(Email.status, func.count(Email.id))
+            .filter(Email.batch_id == batch.batch_id)
+            .group_by(Email.status)
+            .all()
+        )
+        return {
+            "batch_id": batch.batch_id,
+            "template_name": batch.template_name,
+            "status": batch.status,
+            "total_requested": batch.total_requested,
+            "emails_queued": batch.emails_queued,
+            "failed_count": batch.failed_count,
+            "failed_recipients": batch.failed_recipients or [],
+            "error_message": batch.error_message,
+            "sent": status_counts.get(EmailStatus.SENT, 0),
+            "failed": status_counts.get(EmailStatus.FAILED, 0),
+            "pending": status_counts.get(EmailStatus.PENDING, 0) + status_counts.get(EmailStatus.RETRYING, 0),
+            "created_at": batch.created_at,
+            "started_at": batch.started_at,
+            "completed_at": batch.completed_at
+        }
+    
     async def _send_email_now(self, db: Session, email: Email):
         """Send email immediately"""
+        previous_status = email.status
         try:
             email.status = EmailStatus.PENDING
+            email_stats_rollups.record_transition(db, email, previous_status, email.status)
             db.commit()
+            previous_status = email.status
             
             # Prepare email data for SMTP sender
             email_data = {
@@ -291,14 +669,20 @@ class EmailService:
                 if email.retry_count < email.max_retries:
                     await self._schedule_retry(db, email)
             
+            email_stats_rollups.record_transition(db, email, previous_status, email.status)
             db.commit()
+            email_queue_monitor.delivery(email.id, email.status.value)
         
         except Exception as e:
             logger.error(f"Error sending email {email.id}: {str(e)}")
+            # Drop any half-written change so the status and its rollup delta commit together
+            db.rollback()
             email.status = EmailStatus.FAILED
             email.failed_reason = str(e)
             email.retry_count += 1
+            email_stats_rollups.record_transition(db, email, previous_status, email.status)
             db.commit()
+            email_queue_monitor.delivery(email.id, email.status.value)
     
     async def _add_to_queue(self, db: Session, email: Email):
         """Add email to processing queue"""
@@ -313,6 +697,7 @@ class EmailService:
             
             db.add(queue_entry)
             db.commit()
+            email_queue_monitor.queued(1, queue_name=queue_entry.queue_name)
             
             logger.info(f"Email {email.id} added to queue for execution at {email.scheduled_at}")
         
@@ -321,7 +706,11 @@ class EmailService:
             raise
     
     async def _schedule_retry(self, db: Session, email: Email):
-        """Schedule email for retry"""
+        """
+        Schedule email for retry
+        Does not commit: the caller commits the retry together with the
+        email's status change and its stats rollup delta.
+        """
         retry_time = datetime.utcnow() + timedelta(minutes=EmailConfig.RETRY_DELAY_MINUTES)
         
         queue_entry = EmailQueue(
@@ -333,7 +722,7 @@ class EmailService:
         )
         
         db.add(queue_entry)
-        db.commit()
+        email_queue_monitor.queued(1, queue_name=queue_entry.queue_name, db=db)
         
         logger.info(f"Email {email.id} scheduled for retry at {retry_time}")
     
@@ -360,10 +749,14 @@ class EmailService:
             ).limit(limit).all()
             
             for queue_entry in queue_entries:
+                email_id = queue_entry.email_id
+                previous_status = "queued"
                 try:
                     queue_entry.status = "processing"
                     queue_entry.started_at = datetime.utcnow()
                     db.commit()
+                    email_queue_monitor.transition("queued", "processing", email_id)
+                    previous_status = "processing"
                     
                     # Send the email
                     await self._send_email_now(db, queue_entry.email)
@@ -371,42 +764,21 @@ class EmailService:
                     queue_entry.status = "completed"
                     queue_entry.completed_at = datetime.utcnow()
                     db.commit()
+                    email_queue_monitor.transition("processing", "completed", email_id)
                 
                 except Exception as e:
                     logger.error(f"Error processing queue entry {queue_entry.id}: {str(e)}")
                     queue_entry.status = "failed"
                     queue_entry.error_message = str(e)
                     db.commit()
+                    email_queue_monitor.transition(previous_status, "failed", email_id)
         
         except Exception as e:
             logger.error(f"Error processing email queue: {str(e)}")
     
-    def get_email_stats(self, db: Session, company_id: Optional[int] = None) -> Dict[str, Any]:
-        """Get email statistics"""
-        query = db.query(Email)
-        if company_id:
-            query = query.filter(Email.company_id == company_id)
-        
-        total_emails = query.count()
-        sent_emails = query.filter(Email.status == EmailStatus.SENT).count()
-        failed_emails = query.filter(Email.status == EmailStatus.FAILED).count()
-        pending_emails = query.filter(Email.status == EmailStatus.PENDING).count()
-        
-        success_rate = (sent_emails / total_emails * 100) if total_emails > 0 else 0
-        
-        # Recent activity
-        last_24h = query.filter(Email.created_at >= datetime.utcnow() - timedelta(hours=24)).count()
-        last_7d = query.filter(Email.created_at >= datetime.utcnow() - timedelta(days=7)).count()
-        
-        return {
-            "total_emails": total_emails,
-            "sent_emails": sent_emails,
-            "failed_emails": failed_emails,
-            "pending_emails": pending_emails,
-            "success_rate": round(success_rate, 2),
-            "emails_last_24h": last_24h,
-            "emails_last_7d": last_7d
-        }
+    def get_email_stats(self, db: Session, company_id: Optional[int] = None, days: int = 30) -> Dict[str, Any]:
+        """Get email statistics for the last `days` days (served from rollups)"""
+        return email_stats_rollups.get_stats(db, company_id, days)
 
 # Global email service instance
 email_service = EmailService()
\ No newline at end of file
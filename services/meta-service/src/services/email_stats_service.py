@@ -0,0 +1,206 @@
+"""
+Email Statistics Rollups for Meta Portal.
+Maintains hourly and daily email counts per company, template and status,
+and answers statistics queries from those rollups instead of the emails table.
+"""
+
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, func, literal, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..models.email import Email, EmailStatus, EmailStatsRollup
+
+logger = logging.getLogger(__name__)
+
+HOUR = "hour"
+DAY = "day"
+
+# (created_at hour, company_id, template_name, status)
+RollupKey = Tuple[datetime, int, str, EmailStatus]
+
+
+class EmailStatsRollups:
+    """
+    Keeps email_stats_rollups in step with the emails table
+    Every write goes through record_created / record_transition in the same
+    transaction as the email change, so the rollups never drift from the
+    rows they summarize. Hourly rows back the 24h/7d windows and are pruned
+    after HOURLY_RETENTION_DAYS; daily rows are kept for good.
+    """
+
+    HOURLY_RETENTION_DAYS = 8
+
+    # ==========================================
+    # WRITES
+    # ==========================================
+
+    def record_created(self, db: Session, emails: Iterable[Dict[str, Any]]):
+        """Count new emails (dicts with created_at, company_id, template_name, status)"""
+        deltas: Counter = Counter()
+        for email in emails:
+            deltas[self._key(email["created_at"], email.get("company_id"), email.get("template_name"), email["status"])] += 1
+        self._apply(db, deltas)
+
+    def record_email_created(self, db: Session, email: Email):
+        """Count a single new ORM email"""
+        self._apply(db, Counter({
+            self._key(email.created_at, email.company_id, email.template_name, email.status): 1
+        }))
+
+    def record_transition(self, db: Session, email: Email, old_status: EmailStatus, new_status: EmailStatus):
+        """Move one email between status counters (no-op if the status did not change)"""
+        if old_status == new_status:
+            return
+        self._apply(db, Counter({
+            self._key(email.created_at, email.company_id, email.template_name, old_status): -1,
+            self._key(email.created_at, email.company_id, email.template_name, new_status): 1
+        }))
+
+    def prune_hourly(self, db: Session, now: datetime = None) -> int:
+        """Delete hourly rollups older than the retention window"""
+        cutoff = (now or datetime.utcnow()) - timedelta(days=self.HOURLY_RETENTION_DAYS)
+        result = db.execute(
+            delete(EmailStatsRollup).where(
+                EmailStatsRollup.granularity == HOUR,
+                EmailStatsRollup.bucket_start < cutoff
+            )
+        )
+        db.commit()
+        return result.rowcount
+
+    def rebuild(self, db: Session, now: datetime = None) -> Dict[str, int]:
+        """
+        Recompute all rollups from the emails table
+        Used to backfill existing data; runs one GROUP BY per granularity.
+        """
+        now = now or datetime.utcnow()
+        db.execute(delete(EmailStatsRollup))
+
+        counts = {}
+        hourly_cutoff = self._truncate(now, HOUR) - timedelta(days=self.HOURLY_RETENTION_DAYS)
+        for granularity, bucket_format in ((HOUR, "%Y-%m-%d %H:00:00.000000"), (DAY, "%Y-%m-%d 00:00:00.000000")):
+            # Same text format SQLAlchemy uses for SQLite DateTime columns
+            bucket = func.strftime(bucket_format, Email.created_at)
+            company_id = func.coalesce(Email.company_id, 0)
+            template_name = func.coalesce(Email.template_name, "")
+            # Group by the stored keys: NULL and '' are the same rollup row
+            query = select(
+                literal(granularity), bucket, company_id, template_name, Email.status, func.count(Email.id)
+            ).group_by(bucket, company_id, template_name, Email.status)
+            if granularity == HOUR:
+                query = query.where(Email.created_at >= hourly_cutoff)
+
+            result = db.execute(
+                EmailStatsRollup.__table__.insert().from_select(
+                    ["granularity", "bucket_start", "company_id", "template_name", "status", "email_count"],
+                    query
+                )
+            )
+            counts[granularity] = result.rowcount
+
+        db.commit()
+        logger.info(f"Rebuilt email stats rollups: {counts}")
+        return counts
+
+    def _apply(self, db: Session, deltas: Counter):
+        """Upsert hour and day rows for a set of per-hour deltas (does not commit)"""
+        rows: Counter = Counter()
+        for (hour, company_id, template_name, status), delta in deltas.items():
+            if delta:
+                rows[(HOUR, hour, company_id, template_name, status)] += delta
+                rows[(DAY, self._truncate(hour, DAY), company_id, template_name, status)] += delta
+        if not rows:
+            return
+
+        statement = sqlite_insert(EmailStatsRollup).values([
+            {
+                "granularity": granularity,
+                "bucket_start": bucket_start,
+                "company_id": company_id,
+                "template_name": template_name,
+                "status": status,
+                "email_count": delta
+            }
+            for (granularity, bucket_start, company_id, template_name, status), delta in rows.items()
+        ])
+        db.execute(statement.on_conflict_do_update(
+            index_elements=["granularity", "bucket_start", "company_id", "template_name", "status"],
+            set_={"email_count": EmailStatsRollup.email_count + statement.excluded.email_count}
+        ))
+
+    def _key(self, created_at: datetime, company_id: Optional[int], template_name: Optional[str], status: EmailStatus) -> RollupKey:
+        return (self._truncate(created_at, HOUR), company_id or 0, template_name or "", status)
+
+    @staticmethod
+    def _truncate(moment: datetime, granularity: str) -> datetime:
+        moment = moment.replace(minute=0, second=0, microsecond=0, tzinfo=None)
+        return moment.replace(hour=0) if granularity == DAY else moment
+
+    # ==========================================
+    # READS
+    # ==========================================
+
+    def get_stats(self, db: Session, company_id: Optional[int] = None, days: int = 30, now: datetime = None) -> Dict[str, Any]:
+        """
+        Email statistics for the last `days` calendar days (today included)
+        Reads at most one daily row per day, template and status, regardless
+        of how many emails were sent.
+        """
+        now = now or datetime.utcnow()
+        window_start = self._truncate(now, DAY) - timedelta(days=days - 1)
+
+        status_counts = dict(
+            self._rollup_query(db, DAY, window_start, company_id, EmailStatsRollup.status)
+            .group_by(EmailStatsRollup.status)
+            .all()
+        )
+        total_emails = sum(status_counts.values())
+        sent_emails = status_counts.get(EmailStatus.SENT, 0)
+        success_rate = (sent_emails / total_emails * 100) if total_emails > 0 else 0
+
+        current_hour = self._truncate(now, HOUR)
+        last_24h = self._rollup_query(db, HOUR, current_hour - timedelta(hours=23), company_id).scalar()
+        last_7d = self._rollup_query(db, HOUR, current_hour - timedelta(days=7) + timedelta(hours=1), company_id).scalar()
+
+        popular_templates = (
+            self._rollup_query(db, DAY, window_start, company_id, EmailStatsRollup.template_name)
+            .filter(EmailStatsRollup.template_name != "")
+            .group_by(EmailStatsRollup.template_name)
+            .order_by(func.sum(EmailStatsRollup.email_count).desc())
+            .limit(5)
+            .all()
+        )
+
+        return {
+            "total_emails": total_emails,
+            "sent_emails": sent_emails,
+            "failed_emails": status_counts.get(EmailStatus.FAILED, 0),
+            "pending_emails": status_counts.get(EmailStatus.PENDING, 0),
+            "success_rate": round(success_rate, 2),
+            "avg_processing_time_ms": None,
+            "emails_last_24h": last_24h or 0,
+            "emails_last_7d": last_7d or 0,
+            "popular_templates": [
+                {"name": name, "usage_count": count}
+                for name, count in popular_templates
+            ]
+        }
+
+    def _rollup_query(self, db: Session, granularity: str, since: datetime, company_id: Optional[int], *group_columns):
+        """Sum of email_count for one granularity since a bucket, optionally scoped to a company"""
+        query = db.query(*group_columns, func.sum(EmailStatsRollup.email_count)).filter(
+            EmailStatsRollup.granularity == granularity,
+            EmailStatsRollup.bucket_start >= since
+        )
+        if company_id:
+            query = query.filter(EmailStatsRollup.company_id == company_id)
+        return query
+
+
+# Global rollup service instance
+email_stats_rollups = EmailStatsRollups()
@@ -0,0 +1,77 @@
+"""
+Background Email Worker for Meta Portal.
+Periodically sends due digests, drains the email queue and prunes
+expired hourly stats rollups in-process.
+Enabled with EMAIL_WORKER_ENABLED=true.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from ..config.database import SessionLocal
+from .email_service import email_service, EmailConfig
+from .digest_service import digest_scheduler
+from .email_stats_service import email_stats_rollups
+
+logger = logging.getLogger(__name__)
+
+
+class EmailWorker:
+    """Runs digest scheduling and queue processing on a fixed poll interval"""
+    
+    def __init__(self, poll_seconds: int = None, batch_size: int = None):
+        self.poll_seconds = poll_seconds or EmailConfig.WORKER_POLL_SECONDS
+        self.batch_size = batch_size or EmailConfig.WORKER_BATCH_SIZE
+        self._task: Optional[asyncio.Task] = None
+    
+    async def run_once(self):
+        """
+        Send due digests, process one batch of the queue, then prune old rollups
+        Every step does blocking SMTP and database work, so each runs in a
+        worker thread with its own session and the event loop stays free.
+        """
+        await asyncio.to_thread(self._run_step, digest_scheduler.run_due_digests)
+        await asyncio.to_thread(self._run_step, self._process_queue)
+        await asyncio.to_thread(self._run_step, email_stats_rollups.prune_hourly)
+    
+    def _run_step(self, step):
+        db = SessionLocal()
+        try:
+            step(db)
+        except Exception as e:
+            logger.error(f"Email worker step {step.__name__} failed: {str(e)}")
+            db.rollback()
+        finally:
+            db.close()
+    
+    def _process_queue(self, db):
+        # process_email_queue is a coroutine that never yields to the loop
+        # (SMTP and the ORM block), so it gets this thread's own loop
+        asyncio.run(email_service.process_email_queue(db, self.batch_size))
+    
+    async def _run_forever(self):
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.poll_seconds)
+    
+    def start(self):
+        """Start the worker loop on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever())
+            logger.info(f"Email worker started (poll every {self.poll_seconds}s)")
+    
+    async def stop(self):
+        """Cancel the worker loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Email worker stopped")
+
+
+# Global worker instance
+email_worker = EmailWorker()
@@ -0,0 +1,183 @@
+"""
+Export Service for Meta Portal.
+Streams applications and users as CSV or NDJSON.
+
+Rows are selected as plain column tuples (no ORM objects) and fetched in
+keyset-paginated pages, then encoded into ~64 KB chunks, optionally gzip
+compressed on the fly. Memory use stays flat regardless of export size, and
+no transaction stays open while the client downloads.
+"""
+
+import csv
+import io
+import json
+import os
+import zlib
+from datetime import datetime
+from typing import Iterator, Optional
+
+from sqlalchemy import select, func
+
+from ..config.database import SessionLocal, release_connection
+from ..models.application import Application
+from ..models.company import Company
+from ..models.job import Job
+from ..models.user import User
+from ..utils.multitenant import filter_by_company
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class ExportConfig:
+    """Export settings"""
+
+    # Rows fetched from the database per page (one short transaction each)
+    PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", "1000"))
+
+    # Encoded bytes collected before a chunk is sent
+    CHUNK_BYTES = int(os.getenv("EXPORT_CHUNK_BYTES", str(64 * 1024)))
+
+
+def applications_export_query(company_id: Optional[int], is_admin: bool, status: Optional[str] = None):
+    """Applications with their applicant, job and company, flattened to columns"""
+    query = (
+        select(
+            Application.id.label("id"),
+            Application.status.label("status"),
+            Application.applied_at.label("applied_at"),
+            Application.updated_at.label("updated_at"),
+            User.id.label("user_id"),
+            User.email.label("user_email"),
+            User.first_name.label("user_first_name"),
+            User.last_name.label("user_last_name"),
+            User.phone.label("user_phone"),
+            Job.id.label("job_id"),
+            Job.title.label("job_title"),
+            Job.department.label("job_department"),
+            Job.location.label("job_location"),
+            Application.company_id.label("company_id"),
+            Company.name.label("company_name"),
+        )
+        .join(User, User.id == Application.user_id)
+        .join(Job, Job.id == Application.job_id)
+        .outerjoin(Company, Company.id == Job.company_id)
+    )
+    query = filter_by_company(query, Application, company_id, is_admin)
+    if status and status != "all":
+        query = query.filter(Application.status == status)
+    return query.order_by(Application.id)
+
+
+def users_export_query(company_id: Optional[int], is_admin: bool):
+    """Users with their (company-scoped) application count and latest application"""
+    application_stats = filter_by_company(
+        select(
+            Application.user_id.label("user_id"),
+            func.count(Application.id).label("application_count"),
+            func.max(Application.applied_at).label("latest_application"),
+        ),
+        Application, company_id, is_admin
+    ).group_by(Application.user_id).subquery()
+
+    query = (
+        select(
+            User.id.label("id"),
+            User.email.label("email"),
+            User.first_name.label("first_name"),
+            User.last_name.label("last_name"),
+            User.phone.label("phone"),
+            User.is_admin.label("is_admin"),
+            User.is_active.label("is_active"),
+            User.created_at.label("created_at"),
+            User.company_id.label("company_id"),
+            func.coalesce(application_stats.c.application_count, 0).label("application_count"),
+            application_stats.c.latest_application.label("latest_application"),
+        )
+        .outerjoin(application_stats, application_stats.c.user_id == User.id)
+    )
+    return filter_by_company(query, User, company_id, is_admin).order_by(User.id)
+
+
+def stream_export(query, key_column, export_format: str, compress: bool = False) -> Iterator[bytes]:
+    """
+    Run an export query page by page and yield encoded chunks
+    query must be ordered by key_column (a unique column it selects as "id").
+    Each page is read with "key_column > last key ... LIMIT PAGE_SIZE" in its
+    own short transaction, and the connection goes back to the pool before
+    the page is sent: a slow download must not hold a read transaction,
+    which in SQLite's default journal mode blocks every writer.
+    Uses its own session, since the response body is produced after the
+    request handler (and its dependencies) have returned.
+    """
+    encode = _csv_encoder(query) if export_format == "csv" else _ndjson_encoder()
+    compressor = zlib.compressobj(wbits=31) if compress else None  # wbits=31: gzip container
+
+    db = SessionLocal()
+    try:
+        buffer = [encode(None)] if export_format == "csv" else []
+        size = sum(len(part) for part in buffer)
+        last_key = None
+        while True:
+            page = query if last_key is None else query.where(key_column > last_key)
+            rows = db.execute(page.limit(ExportConfig.PAGE_SIZE)).all()
+            release_connection(db)
+            for row in rows:
+                line = encode(row)
+                buffer.append(line)
+                size += len(line)
+            if size >= ExportConfig.CHUNK_BYTES:
+                chunk = b"".join(buffer)
+                buffer, size = [], 0
+                chunk = compressor.compress(chunk) if compressor else chunk
+                if chunk:
+                    yield chunk
+            if len(rows) < ExportConfig.PAGE_SIZE:
+                break
+            last_key = rows[-1].id
+        chunk = b"".join(buffer)
+        if compressor:
+            chunk = compressor.compress(chunk) + compressor.flush()
+        if chunk:
+            yield chunk
+    finally:
+        db.close()
+
+
+def _csv_encoder(query):
+    """Encodes the header (row None) and rows as CSV lines"""
+    header = [column.name for column in query.selected_columns]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def encode(row) -> bytes:
+        writer.writerow(header if row is None else [_csv_value(value) for value in row])
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line.encode()
+
+    return encode
+
+
+def _ndjson_encoder():
+    def encode(row) -> bytes:
+        return (json.dumps(row._asdict(), default=_json_default) + "\n").encode()
+
+    return encode
+
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
@@ -12,6 +12,7 @@ from pathlib import Path
 from typing import Optional, Dict, Any, List, BinaryIO
 import logging
 from datetime import datetime, timedelta
+from functools import cached_property
 
 from fastapi import UploadFile, HTTPException
 from sqlalchemy.orm import Session
@@ -22,9 +23,16 @@ from ..models.file_upload import (
 )
 from ..models.user import User
 from ..config.database import get_db
+from ..utils.metrics import upload_bytes_total, uploads_total, resumes_processed_total
 
 logger = logging.getLogger(__name__)
 
+# Metric children resolved once so uploads only pay for the increment
+_resume_upload_bytes = upload_bytes_total.labels("resume")
+_resume_uploads = uploads_total.labels("resume")
+_resumes_accepted = resumes_processed_total.labels("accepted")
+_resumes_rejected = resumes_processed_total.labels("rejected")
+
 class FileUploadConfig:
     """Configuration for file uploads"""
     
@@ -210,10 +218,14 @@ class FileUploadService:
     """Main file upload service"""
     
     def __init__(self):
-        self.storage_manager = StorageManager()
         self.validator = FileValidator()
         self.virus_scanner = VirusScanner()
     
+    @cached_property
+    def storage_manager(self) -> StorageManager:
+        """Created on first use, so importing the service does not touch the upload directories"""
+        return StorageManager()
+    
     def upload_resume(
         self,
         db: Session,
@@ -285,6 +297,8 @@ class FileUploadService:
             db.add(file_upload)
             db.commit()
             db.refresh(file_upload)
+            _resume_uploads.inc()
+            _resume_upload_bytes.inc(file_upload.file_size)
             
             # Perform virus scan
             scan_status, scan_result = self.virus_scanner.scan_file(str(storage_path))
@@ -298,8 +312,10 @@ class FileUploadService:
             if scan_status == ScanStatus.CLEAN:
                 resume = self._create_resume_record(db, file_upload)
                 # TODO: Start background resume processing
+                _resumes_accepted.inc()
                 logger.info(f"Resume uploaded successfully: {resume.id}")
             else:
+                _resumes_rejected.inc()
                 logger.warning(f"File failed virus scan: {file_upload.id}")
             
             return file_upload
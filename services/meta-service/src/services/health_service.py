@@ -0,0 +1,180 @@
+"""
+Health Check Service for Meta Portal.
+Dependency checks behind the /readyz probe: database round trip, upload
+disk space, email queue lag and SMTP delivery health. Results are cached
+briefly so frequent probes do not add load.
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from sqlalchemy import func
+
+from ..config.database import engine, SessionLocal
+from ..models.email import EmailQueue
+from .email_service import email_service, EmailConfig
+from .file_upload_service import FileUploadConfig
+
+logger = logging.getLogger(__name__)
+
+
+class HealthConfig:
+    """Readiness thresholds - can be overridden by environment variables"""
+
+    # How long a readiness result is reused
+    CACHE_SECONDS = float(os.getenv("HEALTH_CACHE_SECONDS", "5"))
+
+    # Database round trip (including taking the SQLite write lock)
+    DB_MAX_LATENCY_MS = float(os.getenv("HEALTH_DB_MAX_LATENCY_MS", "500"))
+
+    # Free space required under UPLOAD_BASE_DIR
+    MIN_FREE_DISK_MB = int(os.getenv("HEALTH_MIN_FREE_DISK_MB", "500"))
+
+    # Age of the oldest due, unprocessed queue entry
+    MAX_QUEUE_LAG_SECONDS = int(os.getenv("HEALTH_MAX_QUEUE_LAG_SECONDS", "900"))
+
+    # Consecutive SMTP send failures before delivery counts as unhealthy
+    SMTP_MAX_CONSECUTIVE_FAILURES = int(os.getenv("HEALTH_SMTP_MAX_CONSECUTIVE_FAILURES", "5"))
+
+
+class HealthChecker:
+    """
+    Runs readiness checks and caches the combined result
+    Database and disk problems always make the worker unready. Queue lag and
+    SMTP failures only do so on workers that run the email worker, since
+    other workers can still serve traffic; elsewhere they are warnings.
+    """
+
+    def __init__(self):
+        self._cached: Optional[Dict[str, Any]] = None
+        self._cached_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def check_readiness(self) -> Dict[str, Any]:
+        """Return the cached readiness result, refreshing it when stale"""
+        if self._is_fresh():
+            return self._cached
+        async with self._lock:
+            # Another probe may have refreshed while we waited
+            if not self._is_fresh():
+                self._cached = await asyncio.to_thread(self.run_checks)
+                self._cached_at = time.monotonic()
+        return self._cached
+
+    def _is_fresh(self) -> bool:
+        return self._cached is not None and time.monotonic() - self._cached_at < HealthConfig.CACHE_SECONDS
+
+    def run_checks(self) -> Dict[str, Any]:
+        """Run every check now (blocking)"""
+        email_critical = EmailConfig.WORKER_ENABLED
+        checks = {
+            "database": self._guard(self.check_database, critical=True),
+            "upload_disk": self._guard(self.check_upload_disk, critical=True),
+            "email_queue": self._guard(self.check_email_queue, critical=email_critical),
+            "smtp": self._guard(self.check_smtp, critical=email_critical),
+        }
+        ready = all(check["status"] != "fail" for check in checks.values())
+        return {
+            "status": "ready" if ready else "unready",
+            "checked_at": datetime.utcnow().isoformat(),
+            "checks": checks
+        }
+
+    @staticmethod
+    def _guard(check, critical: bool) -> Dict[str, Any]:
+        """Run a check; failures of non-critical checks are downgraded to warnings"""
+        try:
+            result = check()
+        except Exception as e:
+            logger.error(f"Health check {check.__name__} failed: {str(e)}")
+            result = {"healthy": False, "error": str(e)}
+        healthy = result.pop("healthy")
+        result["status"] = "ok" if healthy else ("fail" if critical else "warn")
+        return result
+
+    # ==========================================
+    # CHECKS
+    # ==========================================
+
+    def check_database(self) -> Dict[str, Any]:
+        """Round trip that also takes (and releases) the SQLite write lock"""
+        start = time.perf_counter()
+        connection = engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            if engine.dialect.name == "sqlite":
+                # A plain SELECT succeeds while another writer holds the lock;
+                # BEGIN IMMEDIATE fails fast with "database is locked" instead
+                cursor.execute("PRAGMA busy_timeout")
+                busy_timeout = cursor.fetchone()[0]
+                cursor.execute(f"PRAGMA busy_timeout = {int(HealthConfig.DB_MAX_LATENCY_MS)}")
+                try:
+                    cursor.execute("BEGIN IMMEDIATE")
+                    cursor.execute("ROLLBACK")
+                finally:
+                    cursor.execute(f"PRAGMA busy_timeout = {busy_timeout}")
+            else:
+                cursor.execute("SELECT 1")
+            cursor.close()
+        finally:
+            connection.close()
+        latency_ms = (time.perf_counter() - start) * 1000
+        return {
+            "healthy": latency_ms <= HealthConfig.DB_MAX_LATENCY_MS,
+            "latency_ms": round(latency_ms, 2)
+        }
+
+    def check_upload_disk(self) -> Dict[str, Any]:
+        """Free space and writability of the upload directory"""
+        upload_dir = os.path.abspath(FileUploadConfig.UPLOAD_BASE_DIR)
+        # The directory is created on first upload; check its parent until then
+        existing_dir = upload_dir
+        while not os.path.isdir(existing_dir):
+            existing_dir = os.path.dirname(existing_dir)
+        free_mb = shutil.disk_usage(existing_dir).free // (1024 * 1024)
+        writable = os.access(existing_dir, os.W_OK)
+        return {
+            "healthy": writable and free_mb >= HealthConfig.MIN_FREE_DISK_MB,
+            "free_mb": free_mb,
+            "writable": writable
+        }
+
+    def check_email_queue(self) -> Dict[str, Any]:
+        """Lag of the oldest queue entry that is due but not yet picked up"""
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            oldest_due = db.query(func.min(EmailQueue.execute_after)).filter(
+                EmailQueue.status == "queued",
+                EmailQueue.execute_after <= now
+            ).scalar()
+        finally:
+            db.close()
+        lag_seconds = (now - oldest_due).total_seconds() if oldest_due else 0
+        return {
+            "healthy": lag_seconds <= HealthConfig.MAX_QUEUE_LAG_SECONDS,
+            "lag_seconds": round(lag_seconds, 1)
+        }
+
+    def check_smtp(self) -> Dict[str, Any]:
+        """
+        Delivery health from recent send outcomes
+        Sends open their own SMTP connection, so rather than dialing the
+        server on every probe this reports consecutive failures.
+        """
+        sender = email_service.smtp_sender
+        return {
+            "healthy": sender.consecutive_failures < HealthConfig.SMTP_MAX_CONSECUTIVE_FAILURES,
+            "consecutive_failures": sender.consecutive_failures,
+            "last_success_at": sender.last_success_at.isoformat() if sender.last_success_at else None,
+            "last_error": sender.last_error
+        }
+
+
+# Global health checker instance
+health_checker = HealthChecker()
@@ -0,0 +1,162 @@
+"""
+My Applications Service for Meta Portal.
+Serves a candidate's own applications (the dashboard list) from one joined,
+paginated query, and caches the serialized JSON per user until the user
+applies again or an admin changes one of their applications.
+
+The cache is per process: other workers see changes once their entry
+expires (MY_APPLICATIONS_CACHE_SECONDS).
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from ..models.application import Application
+from ..models.company import Company
+from ..models.job import Job
+from ..utils.fast_json import dumps
+
+logger = logging.getLogger(__name__)
+
+
+class MyApplicationsConfig:
+    """Candidate application list settings"""
+
+    # Page size when none is requested, and the largest allowed
+    DEFAULT_LIMIT = int(os.getenv("MY_APPLICATIONS_DEFAULT_LIMIT", "200"))
+    MAX_LIMIT = int(os.getenv("MY_APPLICATIONS_MAX_LIMIT", "1000"))
+
+    # How long a cached page is served without an invalidation
+    CACHE_SECONDS = float(os.getenv("MY_APPLICATIONS_CACHE_SECONDS", "300"))
+
+    # Users whose pages are kept (least recently used are dropped)
+    CACHE_USERS = int(os.getenv("MY_APPLICATIONS_CACHE_USERS", "10000"))
+
+
+class MyApplicationsService:
+    """Joined, paginated and cached "my applications" listing"""
+
+    def __init__(self):
+        # user_id -> (invalidation stamp, {(company_id, limit, offset): (expires_at, body, total)}), LRU order
+        self._users: "OrderedDict[int, Tuple[int, Dict[tuple, Tuple[float, bytes, int]]]]" = OrderedDict()
+        # Invalidation counter: a page read before a user's last invalidation is not stored.
+        # Users without an entry (never cached or dropped) share the latest stamp given up
+        # for them, so the bookkeeping stays within CACHE_USERS entries.
+        self._clock = 0
+        self._untracked_stamp = 0
+        self._lock = threading.Lock()
+
+    def get_page(self, db: Session, user_id: int, company_id: Optional[int], limit: int, offset: int) -> Tuple[bytes, int]:
+        """
+        One page of the user's applications, newest first
+        Returns: (JSON body, total number of applications)
+        """
+        key = (company_id, limit, offset)
+        now = time.monotonic()
+        with self._lock:
+            started = self._clock
+            entry = self._users.get(user_id)
+            cached = entry[1].get(key) if entry else None
+            if cached and cached[0] > now:
+                self._users.move_to_end(user_id)
+                return cached[1], cached[2]
+
+        body, total = self._query_page(db, user_id, limit, offset)
+
+        with self._lock:
+            entry = self._users.get(user_id)
+            if (entry[0] if entry else self._untracked_stamp) <= started:
+                if entry is None:
+                    entry = self._users[user_id] = (self._untracked_stamp, {})
+                entry[1][key] = (now + MyApplicationsConfig.CACHE_SECONDS, body, total)
+                self._users.move_to_end(user_id)
+                while len(self._users) > MyApplicationsConfig.CACHE_USERS:
+                    _, (stamp, _) = self._users.popitem(last=False)
+                    self._untracked_stamp = max(self._untracked_stamp, stamp)
+        return body, total
+
+    def invalidate(self, user_ids: Iterable[int]):
+        """Drop cached pages of these users (call after their applications change)"""
+        with self._lock:
+            self._clock += 1
+            for user_id in set(user_ids):
+                if user_id in self._users:
+                    self._users[user_id] = (self._clock, {})
+                else:
+                    self._untracked_stamp = self._clock
+
+    def _query_page(self, db: Session, user_id: int, limit: int, offset: int) -> Tuple[bytes, int]:
+        """
+        Applications with their job and company in one query
+        The total comes from a window count on the same rows; only a page
+        past the end needs a separate COUNT.
+        """
+        # Company filtering is applied by the tenant session
+        rows = db.execute(
+            select(
+                Application.id,
+                Application.job_id,
+                Application.cover_letter,
+                Application.additional_info,
+                Application.status,
+                Application.applied_at,
+                Application.updated_at,
+                Job.id.label("job_ref"),
+                Job.title,
+                Job.location,
+                Job.department,
+                Job.job_type,
+                Job.salary_min,
+                Job.salary_max,
+                Job.description,
+                Company.name.label("company_name"),
+                func.count().over().label("total"),
+            )
+            .outerjoin(Job, Job.id == Application.job_id)
+            .outerjoin(Company, Company.id == Job.company_id)
+            .where(Application.user_id == user_id)
+            .order_by(Application.applied_at.desc(), Application.id.desc())
+            .limit(limit)
+            .offset(offset)
+        ).all()
+
+        if rows:
+            total = rows[0].total
+        else:
+            total = db.scalar(select(func.count(Application.id)).where(Application.user_id == user_id))
+
+        items = [
+            {
+                "id": row.id,
+                "job_id": row.job_id,
+                "cover_letter": row.cover_letter,
+                "additional_info": row.additional_info,
+                "status": row.status,
+                "applied_at": row.applied_at.isoformat(),
+                "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+                "job": {
+                    "id": row.job_ref,
+                    "title": row.title,
+                    "company": row.company_name,
+                    "location": row.location,
+                    "department": row.department,
+                    "job_type": row.job_type,
+                    "salary_min": row.salary_min,
+                    "salary_max": row.salary_max,
+                    "description": row.description
+                } if row.job_ref is not None else None
+            }
+            for row in rows
+        ]
+        return dumps(items), total
+
+
+# Global service instance
+my_applications_service = MyApplicationsService()
@@ -0,0 +1,74 @@
+"""
+Rollup Tables for Meta Portal.
+Shared write path of the per-day application rollups (stats buckets and
+stage latency histograms): deltas are summed in memory per row key, counted
+for both the job and the company-wide row, and upserted in one statement,
+or bulk inserted when a rollup is rebuilt from scratch.
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+# Row key (values of key_columns, in order) -> summed measures
+Deltas = Dict[Tuple, List[float]]
+
+COMPANY_WIDE_JOB_ID = 0
+
+
+class RollupTable:
+    """
+    Summed measures per key for one rollup model
+    Rows are keyed by key_columns, which include company_id and job_id.
+    Each delta is added to its own row and to the company-wide row
+    (job_id 0), so company analytics read one row per key however many jobs
+    the company has.
+    """
+
+    INSERT_BATCH_SIZE = 500
+
+    def __init__(self, model: Any, key_columns: Sequence[str], measure_columns: Sequence[str]):
+        self.model = model
+        self.key_columns = tuple(key_columns)
+        self.measure_columns = tuple(measure_columns)
+        self._job_index = self.key_columns.index("job_id")
+
+    def add(self, deltas: Deltas, key: Tuple, *measures: float):
+        """Add measures to the key's row and its company-wide row"""
+        company_key = key[:self._job_index] + (COMPANY_WIDE_JOB_ID,) + key[self._job_index + 1:]
+        for row_key in {key, company_key}:
+            totals = deltas.setdefault(row_key, [0] * len(measures))
+            for index, measure in enumerate(measures):
+                totals[index] += measure
+
+    def apply(self, db: Session, deltas: Deltas):
+        """Upsert rows for a set of deltas, adding to existing measures (does not commit)"""
+        if not deltas:
+            return
+        statement = sqlite_insert(self.model).values(self.values(deltas))
+        db.execute(statement.on_conflict_do_update(
+            index_elements=list(self.key_columns),
+            set_={
+                column: getattr(self.model, column) + getattr(statement.excluded, column)
+                for column in self.measure_columns
+            }
+        ))
+
+    def replace(self, db: Session, deltas: Deltas) -> int:
+        """
+        Replace every row with the given deltas (does not commit)
+        Returns: number of rows written
+        """
+        db.execute(delete(self.model))
+        values = self.values(deltas)
+        for start in range(0, len(values), self.INSERT_BATCH_SIZE):
+            db.execute(self.model.__table__.insert(), values[start:start + self.INSERT_BATCH_SIZE])
+        return len(values)
+
+    def values(self, deltas: Deltas) -> List[Dict[str, Any]]:
+        return [
+            {**dict(zip(self.key_columns, key)), **dict(zip(self.measure_columns, measures))}
+            for key, measures in deltas.items()
+        ]
@@ -2,6 +2,8 @@
 from .multitenant import (
     filter_by_company,
     ensure_company_access,
+    set_tenant_context,
+    TenantLoader,
     get_company_stats,
     validate_company_admin,
     auto_set_company_id
@@ -10,6 +12,8 @@ from .multitenant import (
 __all__ = [
     "filter_by_company",
     "ensure_company_access", 
+    "set_tenant_context",
+    "TenantLoader",
     "get_company_stats",
     "validate_company_admin",
     "auto_set_company_id"
@@ -8,7 +8,7 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from jose import JWTError, jwt
 
-from ..config.database import get_db
+from ..config.database import get_db, release_connection
 from ..models.user import User
 
 # OAuth2 scheme for extracting token from Authorization header
@@ -27,14 +27,30 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     )
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        company_id: int = payload.get("company_id")
-        user_id: int = payload.get("user_id")
-        
-        if email is None:
-            raise credentials_exception
     except JWTError:
         raise credentials_exception
+    user = _get_user_from_payload(payload, db, credentials_exception)
+    # The endpoint runs in another worker thread; don't hold the connection until then
+    release_connection(db)
+    return user
+
+def get_user_from_scoped_token(token: str, audience: str, db: Session) -> User:
+    """Get the user of a token from create_scoped_token, if it was issued for audience"""
+    credentials_exception = HTTPException(
+        status_code=401,
+        detail="Could not validate credentials",
+    )
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], audience=audience)
+    except JWTError:
+        raise credentials_exception
+    return _get_user_from_payload(payload, db, credentials_exception)
+
+def _get_user_from_payload(payload: dict, db: Session, credentials_exception: HTTPException) -> User:
+    email: str = payload.get("sub")
+    company_id: int = payload.get("company_id")
+    if email is None:
+        raise credentials_exception
     
     # Query user by email and validate company_id matches
     user = db.query(User).filter(User.email == email).first()
@@ -70,6 +86,15 @@ def get_current_admin_user(current_user: User = Depends(get_current_active_user)
         )
     return current_user
 
+def get_current_super_admin_user(current_user: User = Depends(get_current_admin_user)) -> User:
+    """Get current super admin (an admin not tied to a company), for instance-wide operations"""
+    if current_user.company_id is not None:
+        raise HTTPException(
+            status_code=403,
+            detail="Not enough permissions. Super admin access required."
+        )
+    return current_user
+
 def get_user_company_context(token: str = Depends(oauth2_scheme)) -> dict:
     """Extract company context from JWT token without database query."""
     try:
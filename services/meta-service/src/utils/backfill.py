@@ -0,0 +1,89 @@
+"""
+Batched backfills for schema migrations.
+
+A single UPDATE (or INSERT ... SELECT) over a large table holds the SQLite
+write lock for the whole statement, blocking every other writer. These
+helpers instead process one primary-key range at a time, commit after each
+batch and pause briefly so request traffic can take the lock in between.
+
+Backfills only touch rows that still match their WHERE clause, so an
+interrupted migration can simply be re-run and picks up where it stopped.
+"""
+
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+
+class BackfillConfig:
+    """Backfill settings"""
+
+    # Rows per UPDATE (one short write transaction each)
+    BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "5000"))
+
+    # Pause between batches, letting other writers in
+    PAUSE_MS = float(os.getenv("MIGRATION_BATCH_PAUSE_MS", "20"))
+
+
+def backfill_in_batches(
+    connection: Connection,
+    table: str,
+    set_clause: str,
+    where_clause: str,
+    params: Optional[Dict[str, Any]] = None,
+    batch_size: int = None,
+    pause_ms: float = None
+) -> int:
+    """
+    Run "UPDATE table SET set_clause WHERE where_clause" in id-range batches
+    The connection must commit each statement on its own (inside Alembic,
+    use op.get_context().autocommit_block()). Returns the rows updated.
+    """
+    statement = (
+        f"UPDATE {table} SET {set_clause} "
+        f"WHERE id >= :batch_start AND id < :batch_end AND ({where_clause})"
+    )
+    return run_in_batches(connection, table, statement, where_clause, params, batch_size, pause_ms)
+
+
+def run_in_batches(
+    connection: Connection,
+    table: str,
+    statement: str,
+    where_clause: str = "1 = 1",
+    params: Optional[Dict[str, Any]] = None,
+    batch_size: int = None,
+    pause_ms: float = None
+) -> int:
+    """
+    Run a statement once per id range of the rows of table matching where_clause
+    The statement limits the rows of table it reads or writes with
+    "id >= :batch_start AND id < :batch_end" (e.g. an INSERT ... SELECT whose
+    ON CONFLICT clause adds up groups that span batches). Same commit rules as
+    backfill_in_batches. Returns the total rowcount.
+    """
+    batch_size = batch_size or BackfillConfig.BATCH_SIZE
+    pause = (BackfillConfig.PAUSE_MS if pause_ms is None else pause_ms) / 1000
+    params = params or {}
+
+    low, high = connection.execute(
+        text(f"SELECT MIN(id), MAX(id) FROM {table} WHERE {where_clause}"), params
+    ).one()
+    if low is None:
+        return 0
+
+    statement = text(statement)
+    affected = 0
+    for batch_start in range(low, high + 1, batch_size):
+        result = connection.execute(statement, {**params, "batch_start": batch_start, "batch_end": batch_start + batch_size})
+        affected += result.rowcount
+        logger.info(f"Backfill from {table}: {affected} rows written (through id {min(batch_start + batch_size - 1, high)} of {high})")
+        if pause:
+            time.sleep(pause)
+    return affected
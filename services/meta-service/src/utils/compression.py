@@ -0,0 +1,181 @@
+"""
+Response compression for Meta Portal.
+
+Compresses dynamic responses (JSON lists, CSV/NDJSON exports, HTML) with
+Brotli when the client accepts it and the brotli package is installed, and
+gzip otherwise. Responses below COMPRESSION_MIN_SIZE, with a content type
+that does not compress (images, archives, gzip exports), server-sent event
+streams and responses that are already encoded (precompressed static files)
+are passed through unchanged.
+Streaming responses are compressed chunk by chunk.
+"""
+
+import os
+import zlib
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional dependency, gzip only without it
+    brotli = None
+
+
+class CompressionConfig:
+    """Response compression settings"""
+
+    # Smaller responses are sent as they are (compression would not pay off)
+    MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+    # Levels for on-the-fly compression (build_assets.py uses the maximum)
+    GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+
+# Content types worth compressing (text/* always is)
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def accepted_encodings(headers: Headers) -> Tuple[str, ...]:
+    """Encodings from Accept-Encoding we can produce, best first (br, gzip)"""
+    accepted = set()
+    for part in headers.get("accept-encoding", "").lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = params.strip()
+        if quality.startswith("q=") and quality[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        accepted.add(name.strip())
+    return tuple(
+        encoding for encoding in ("br", "gzip")
+        if encoding in accepted and (encoding != "br" or brotli is not None)
+    )
+
+
+# Never compressed: a compressor holds back each server-sent event until
+# enough output accumulates, so events would only arrive with the next ones
+# (Starlette's GZipMiddleware skips them for the same reason)
+UNCOMPRESSED_TYPES = (
+    "text/event-stream",
+)
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in UNCOMPRESSED_TYPES:
+        return False
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES
+
+
+class _Compressor:
+    """Incremental gzip or brotli compressor"""
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=CompressionConfig.BROTLI_QUALITY)
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(CompressionConfig.GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip container
+
+    def compress(self, data: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data)
+        return self._zlib.compress(data)
+
+    def finish(self) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """Compress responses for clients that accept br or gzip"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = None):
+        self.app = app
+        self.minimum_size = CompressionConfig.MIN_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http":
+            encodings = accepted_encodings(Headers(scope=scope))
+            if encodings:
+                await _CompressionResponder(self.app, encodings[0], self.minimum_size)(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+class _CompressionResponder:
+    """Holds back the response start until the first body chunk shows whether to compress"""
+
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Send = None
+        self.start_message: Message = None
+        self.compressor: Optional[_Compressor] = None
+        self.started = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        if not self.started:
+            self.started = True
+            await self._start(message)
+        elif self.compressor is not None:
+            await self._send_chunk(message)
+        else:
+            await self.send(message)
+
+    async def _start(self, message: Message):
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if ("content-encoding" in headers or not is_compressible(headers.get("content-type"))
+                or (not more_body and len(body) < self.minimum_size)):
+            await self.send(self.start_message)
+            await self.send(message)
+            return
+
+        self.compressor = _Compressor(self.encoding)
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"  # the encoded body is no longer byte-identical
+        if more_body:
+            del headers["Content-Length"]
+            await self.send(self.start_message)
+            await self._send_chunk(message)
+        else:
+            message["body"] = self.compressor.compress(body) + self.compressor.finish()
+            headers["Content-Length"] = str(len(message["body"]))
+            await self.send(self.start_message)
+            await self.send(message)
+
+    async def _send_chunk(self, message: Message):
+        more_body = message.get("more_body", False)
+        chunk = self.compressor.compress(message.get("body", b""))
+        if not more_body:
+            chunk += self.compressor.finish()
+        elif not chunk:
+            return  # nothing produced yet; wait for more input
+        message["body"] = chunk
+        await self.send(message)
@@ -0,0 +1,46 @@
+"""
+Route class that returns database connections before response validation.
+
+FastAPI runs a sync endpoint in a worker thread, then validates its return
+value against response_model in another one. A request whose endpoint
+leaves a read-only transaction open (any query after its last commit) would
+hold that connection while it waits for the second thread, so a burst of
+requests can take every pooled connection while the threads that would
+free them wait for one.
+
+Routers use this class (APIRouter(route_class=SessionReleasingRoute)); it
+releases the connection of every Session the endpoint was given as soon as
+the endpoint returns, in the endpoint's own thread (see release_connection
+in config/database.py).
+"""
+
+import functools
+import inspect
+from typing import Any, Callable
+
+from fastapi.routing import APIRoute
+from sqlalchemy.orm import Session
+
+from ..config.database import release_connection
+
+
+class SessionReleasingRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        if not inspect.iscoroutinefunction(endpoint):
+            endpoint = _releasing_sessions(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _releasing_sessions(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a sync endpoint; functools.wraps keeps its signature for FastAPI"""
+
+    @functools.wraps(endpoint)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            for value in kwargs.values():
+                if isinstance(value, Session):
+                    release_connection(value)
+
+    return wrapper
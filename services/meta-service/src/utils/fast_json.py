@@ -0,0 +1,53 @@
+"""
+Fast JSON responses for Meta Portal.
+
+FastAPI serializes a route's return value in two passes: response_model
+validation, then jsonable_encoder, which walks every value before the
+response class encodes it again. List endpoints that already hold plain
+rows can skip both and write the rows straight to JSON bytes here.
+
+Uses orjson when it is installed and the standard library json module
+otherwise; both produce the same output for the values rows contain
+(str, int, float, bool, None, date and datetime as ISO 8601).
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from fastapi import Response
+from sqlalchemy.engine import Result
+
+try:
+    import orjson
+except ImportError:  # optional dependency, see requirements.txt
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content as compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def rows_to_dicts(result: Result) -> List[Dict[str, Any]]:
+    """Rows of a column SELECT as dicts keyed by column label"""
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+
+def json_response(content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    A ready-made JSON response
+    FastAPI returns Response objects as they are, so neither response_model
+    validation nor jsonable_encoder runs; the route's response_model still
+    documents the shape.
+    """
+    return Response(content=dumps(content), status_code=status_code, headers=headers, media_type="application/json")
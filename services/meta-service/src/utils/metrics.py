@@ -0,0 +1,319 @@
+"""
+Prometheus-compatible metrics for Meta Portal.
+
+A small in-process registry that renders the Prometheus text exposition
+format. Label sets are created up front (per route at the first request,
+per status class, per queue status), so recording a request costs a
+dictionary lookup and a few integer additions; no metric objects are
+allocated on the request path.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Request latency buckets in seconds
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Pool checkout waits are usually microseconds unless the pool is exhausted
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+STATUS_CLASSES = ("1xx", "2xx", "3xx", "4xx", "5xx")
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+# ==========================================
+# METRIC TYPES
+# ==========================================
+
+class _CounterValue:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeValue(_CounterValue):
+    __slots__ = ()
+
+    def set(self, value: float):
+        self.value = value
+
+    def dec(self, amount: float = 1):
+        with self._lock:
+            self.value -= amount
+
+
+class _HistogramValue:
+    __slots__ = ("bounds", "bucket_counts", "sum", "count", "_lock")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.bucket_counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.bucket_counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+
+class Metric:
+    """
+    A named metric with a fixed set of label names
+    labels() returns the child for a label tuple, creating it only the
+    first time; hot paths should keep a reference to the child instead.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _label_text(self, values: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in list(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values, child) -> List[str]:
+        return [f"{self.name}{self._label_text(values)} {_format(child.value)}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterValue()
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeValue()
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def _render_child(self, values, child) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), child.bucket_counts):
+            cumulative += bucket_count
+            le = "+Inf" if bound == float("inf") else _format(bound)
+            bucket_label = f'le="{le}"'
+            lines.append(f"{self.name}_bucket{self._label_text(values, bucket_label)} {cumulative}")
+        lines.append(f"{self.name}_sum{self._label_text(values)} {_format(child.sum)}")
+        lines.append(f"{self.name}_count{self._label_text(values)} {child.count}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+# ==========================================
+# REGISTRY
+# ==========================================
+
+class MetricsRegistry:
+    """Holds metrics and scrape-time collectors and renders them as text"""
+
+    def __init__(self):
+        self._metrics: List[Metric] = []
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Register a function that refreshes gauges right before each scrape"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# HTTP
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route and status class", ("method", "route", "status")
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route")
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled"
+))
+
+# Database
+db_pool_checkout_wait_seconds = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled database connection", buckets=POOL_WAIT_BUCKETS
+))
+db_pool_checked_out = registry.register(Gauge(
+    "db_pool_checked_out_connections", "Database connections currently checked out"
+))
+
+# Email
+email_queue_depth = registry.register(Gauge(
+    "email_queue_depth", "Email queue entries waiting or being sent, as counted by each process",
+    ("status", "process")
+))
+
+# Uploads and resumes
+upload_bytes_total = registry.register(Counter(
+    "upload_bytes_total", "Bytes of files accepted by uploads", ("kind",)
+))
+uploads_total = registry.register(Counter(
+    "uploads_total", "Files accepted by uploads", ("kind",)
+))
+resumes_processed_total = registry.register(Counter(
+    "resumes_processed_total", "Uploaded resumes by processing outcome", ("outcome",)
+))
+
+
+# ==========================================
+# INSTRUMENTATION
+# ==========================================
+
+class _RouteMetrics:
+    """Preallocated children for one (endpoint, method)"""
+
+    __slots__ = ("by_status_class", "duration")
+
+    def __init__(self, method: str, route: str):
+        self.by_status_class = [http_requests_total.labels(method, route, status) for status in STATUS_CLASSES]
+        self.duration = http_request_duration_seconds.labels(method, route)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts, latency and in-flight requests
+    Every route's label set is allocated on the first request, so the
+    per-request work is a dict lookup plus counter updates.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._routes: Optional[Dict[Tuple[object, str], _RouteMetrics]] = None
+        self._unmatched = _RouteMetrics("*", "(unmatched)")
+        self._in_flight = http_requests_in_flight.labels()
+
+    def preallocate(self, app):
+        """Create label sets for every route of the application"""
+        routes = {}
+        for route in app.routes:
+            # Starlette records the matched endpoint (or mounted app) in scope["endpoint"]
+            endpoint = getattr(route, "endpoint", None) or getattr(route, "app", None)
+            for method in getattr(route, "methods", None) or ("GET", "HEAD"):
+                routes[(endpoint, method)] = _RouteMetrics(method, route.path or "/")
+        self._routes = routes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if self._routes is None and "app" in scope:
+            self.preallocate(scope["app"])
+
+        status_code = 500
+        start = time.perf_counter()
+        self._in_flight.inc()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self._in_flight.dec()
+            route = self._routes.get((scope.get("endpoint"), scope["method"]), self._unmatched)
+            route.duration.observe(time.perf_counter() - start)
+            route.by_status_class[min(max(status_code // 100, 1), 5) - 1].inc()
+
+
+def instrument_pool(engine):
+    """
+    Time connection checkouts on the engine's pool
+    SQLAlchemy has no event for checkout wait, so the pool's connect() is
+    wrapped; checkouts that do not wait cost one extra perf_counter pair.
+    """
+    pool = engine.pool
+    if getattr(pool, "_metrics_instrumented", False):
+        return
+    connect = pool.connect
+    wait = db_pool_checkout_wait_seconds.labels()
+
+    def timed_connect():
+        start = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            wait.observe(time.perf_counter() - start)
+
+    pool.connect = timed_connect
+    pool._metrics_instrumented = True
+    registry.add_collector(lambda: db_pool_checked_out.set(pool.checkedout()))
@@ -5,17 +5,71 @@ This module provides helper functions for enforcing data isolation
 between companies in the multi-tenant system.
 """
 
-from sqlalchemy.orm import Session, Query
-from sqlalchemy import and_
-from typing import Optional, Type, TypeVar
+from sqlalchemy.orm import Session, Query, with_loader_criteria
+from sqlalchemy import and_, event
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Optional, Set, Type, TypeVar
 from src.models.user import User
 from src.models.job import Job
-from src.models.application import Application
+from src.models.application import Application, ApplicationStatusChange
 from src.models.company import Company
 
 # Generic type for model classes
 ModelType = TypeVar('ModelType')
 
+# Models scoped automatically in tenant sessions (see set_tenant_context)
+TENANT_MODELS = (User, Job, Application, ApplicationStatusChange)
+
+# Session.info key holding the company a session is restricted to
+TENANT_INFO_KEY = "tenant_company_id"
+
+
+def set_tenant_context(
+    db: Session,
+    company_id: Optional[int],
+    user_is_admin: bool = False
+) -> Session:
+    """
+    Restrict every ORM query on this session to one company.
+    
+    Once set, SELECTs (including lazy loads) and ORM UPDATE/DELETE statements
+    on TENANT_MODELS get a "company_id = :company_id" predicate, so routes
+    cannot forget the filter and queries can use the company_id indexes.
+    Follows the same rules as filter_by_company: super admins (admins
+    without a company) are not restricted.
+    
+    Args:
+        db: Database session
+        company_id: The user's company ID
+        user_is_admin: Whether the user is an admin
+    
+    Returns:
+        The same session, for use as a dependency
+    """
+    if company_id is None and user_is_admin:
+        db.info.pop(TENANT_INFO_KEY, None)
+    else:
+        db.info[TENANT_INFO_KEY] = company_id
+    return db
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _apply_tenant_criteria(execute_state):
+    """Add the session's tenant predicate to ORM statements"""
+    if TENANT_INFO_KEY not in execute_state.session.info:
+        return
+    if execute_state.is_column_load or execute_state.is_relationship_load:
+        # Criteria from the originating query are propagated to these loads
+        return
+    if not (execute_state.is_select or execute_state.is_update or execute_state.is_delete):
+        return
+    
+    company_id = execute_state.session.info[TENANT_INFO_KEY]
+    execute_state.statement = execute_state.statement.options(*(
+        with_loader_criteria(model, model.company_id == company_id, include_aliases=True)
+        for model in TENANT_MODELS
+    ))
+
 
 def filter_by_company(
     query: Query,
@@ -71,33 +125,106 @@ def ensure_company_access(
     Raises:
         HTTPException: If record not found or access denied
     """
-    from fastapi import HTTPException, status
-    
-    # Get the record
-    record = db.query(model).filter(model.id == record_id).first()
+    # One keyed query: the record is only found if it belongs to the company
+    record = _scoped_query(db, model, company_id, user_is_admin).filter(model.id == record_id).first()
     
     if not record:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"{model.__name__} not found"
-        )
-    
-    # Check company access
-    if hasattr(record, 'company_id'):
-        # Super admins can access all records
-        if company_id is None and user_is_admin:
-            return record
-        
-        # Company users can only access their company's records
-        if record.company_id != company_id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,  # Return 404 instead of 403 for security
-                detail=f"{model.__name__} not found"
-            )
+        raise _not_found(model)
     
     return record
 
 
+class TenantLoader:
+    """
+    Batching, per-request get-or-404 for company-scoped records.
+    
+    IDs collected with prime() (or passed to load_many()) are fetched in one
+    "WHERE id IN (...)" query per model, with the same company filtering as
+    ensure_company_access. Every result, misses included, is memoized, so
+    create one loader per request (see get_tenant_loader in routes/user.py).
+    
+    Example:
+        loader.prime(Job, [a.job_id for a in applications])
+        jobs = loader.load_many(Job, [a.job_id for a in applications])
+        job = loader.get_or_404(Job, job_id)  # no query, already loaded
+    """
+    
+    # IDs per IN (...) query, well below SQLite's bound parameter limit
+    BATCH_SIZE = 500
+    
+    def __init__(self, db: Session, company_id: Optional[int], user_is_admin: bool = False):
+        self.db = db
+        self.company_id = company_id
+        self.user_is_admin = user_is_admin
+        self._records: Dict[Type, Dict[int, Any]] = defaultdict(dict)
+        self._pending: Dict[Type, Set[int]] = defaultdict(set)
+    
+    def prime(self, model: Type[ModelType], ids: Iterable[Optional[int]]) -> "TenantLoader":
+        """Queue IDs to be fetched with the next load of this model"""
+        cached = self._records[model]
+        self._pending[model].update(record_id for record_id in ids if record_id is not None and record_id not in cached)
+        return self
+    
+    def load_many(self, model: Type[ModelType], ids: Iterable[Optional[int]]) -> Dict[int, ModelType]:
+        """Records by ID; IDs that do not exist or belong to another company are left out"""
+        ids = [record_id for record_id in ids if record_id is not None]
+        self.prime(model, ids)
+        self._fetch(model)
+        cached = self._records[model]
+        return {record_id: cached[record_id] for record_id in ids if cached[record_id] is not None}
+    
+    def load(self, model: Type[ModelType], record_id: Optional[int]) -> Optional[ModelType]:
+        return self.load_many(model, [record_id]).get(record_id)
+    
+    def get_or_404(self, model: Type[ModelType], record_id: int) -> ModelType:
+        record = self.load(model, record_id)
+        if record is None:
+            raise _not_found(model)
+        return record
+    
+    def get_many_or_404(self, model: Type[ModelType], ids: Iterable[int]) -> Dict[int, ModelType]:
+        """Like load_many, but all IDs must be accessible"""
+        ids = list(ids)
+        records = self.load_many(model, ids)
+        if len(records) < len(set(ids)):
+            raise _not_found(model)
+        return records
+    
+    def _fetch(self, model: Type[ModelType]):
+        pending = sorted(self._pending.pop(model, ()))
+        cached = self._records[model]
+        for start in range(0, len(pending), self.BATCH_SIZE):
+            batch = pending[start:start + self.BATCH_SIZE]
+            query = _scoped_query(self.db, model, self.company_id, self.user_is_admin)
+            for record in query.filter(model.id.in_(batch)):
+                cached[record.id] = record
+            for record_id in batch:
+                cached.setdefault(record_id, None)
+
+
+def _scoped_query(
+    db: Session,
+    model: Type[ModelType],
+    company_id: Optional[int],
+    user_is_admin: bool
+) -> Query:
+    """db.query(model) restricted to the company, unless the session already is"""
+    query = db.query(model)
+    if TENANT_INFO_KEY in db.info:  # Tenant sessions add the predicate themselves
+        return query
+    return filter_by_company(query, model, company_id, user_is_admin)
+
+
+def _not_found(model: Type[ModelType]):
+    from fastapi import HTTPException, status
+    
+    # 404 rather than 403 for other companies' records, so ids are not revealed
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"{model.__name__} not found"
+    )
+
+
 def get_company_stats(db: Session, company_id: int) -> dict:
     """
     Get statistics for a specific company.
@@ -196,8 +323,9 @@ def auto_set_company_id(
         return
     
     # If we have a source model/ID, inherit from there
+    # (Session.get returns an already loaded source without another query)
     if source_model and source_id and hasattr(source_model, 'company_id'):
-        source_record = db.query(source_model).filter(source_model.id == source_id).first()
+        source_record = db.get(source_model, source_id)
         if source_record and hasattr(source_record, 'company_id'):
             setattr(record, 'company_id', source_record.company_id)
             return
@@ -0,0 +1,180 @@
+"""
+Sampling profiler for Meta Portal.
+
+A background thread snapshots every thread's stack with
+sys._current_frames() at a fixed interval and counts identical stacks.
+The result is written in the collapsed-stack format read by flamegraph.pl,
+speedscope and similar tools ("frame;frame;frame count" per line).
+
+Nothing is hooked into the interpreter, so the cost while running is one
+stack walk per thread per interval and nothing at all while stopped.
+"""
+
+import hmac
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilerConfig:
+    """Profiler settings"""
+
+    # Upper bound for an on-demand profile
+    MAX_SECONDS = int(os.getenv("PROFILER_MAX_SECONDS", "60"))
+
+    # Sampling interval (10 ms = 100 samples per second per thread)
+    DEFAULT_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", "10"))
+
+    # Secret that enables per-request profiling via the X-Profile header (disabled when empty)
+    HEADER_TOKEN = os.getenv("PROFILER_HEADER_TOKEN", "")
+
+    # Finished profiles kept for download
+    KEEP_PROFILES = int(os.getenv("PROFILER_KEEP_PROFILES", "20"))
+
+
+# Leaf frames in these modules mean the thread is idle (waiting on a lock,
+# a queue or the event loop selector)
+IDLE_MODULES = ("threading.py", "selectors.py", "queue.py")
+
+
+class SamplingProfiler:
+    """Samples all thread stacks on a background thread until stopped"""
+
+    def __init__(self, interval_ms: float = None, include_idle: bool = False):
+        self.interval = (interval_ms or ProfilerConfig.DEFAULT_INTERVAL_MS) / 1000
+        self.include_idle = include_idle
+        self.stacks: Counter = Counter()
+        self.sample_count = 0
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+        self._labels: Dict[object, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+        return self
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        thread_names = {}
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            if frames.keys() - thread_names.keys():
+                thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in frames.items():
+                if ident == own_ident:
+                    continue
+                if not self.include_idle and frame.f_code.co_filename.endswith(IDLE_MODULES):
+                    continue
+                self.stacks[self._collapse(thread_names.get(ident, str(ident)), frame)] += 1
+            self.sample_count += 1
+
+    def _collapse(self, thread_name: str, frame) -> str:
+        labels = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = f"{os.path.basename(code.co_filename)}:{code.co_name}"
+            labels.append(label)
+            frame = frame.f_back
+        labels.append(thread_name)
+        return ";".join(reversed(labels))
+
+    def collapsed(self) -> str:
+        """Profile in collapsed-stack format, heaviest stacks first"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+# Only one profiler runs at a time, whether on demand or per request
+_active_lock = threading.Lock()
+
+# Recently finished profiles, by id
+_recent_profiles: "OrderedDict[str, str]" = OrderedDict()
+_recent_lock = threading.Lock()
+
+
+def start_profiler(interval_ms: float = None, include_idle: bool = False) -> Optional[SamplingProfiler]:
+    """Start a profiler, or return None if one is already running"""
+    if not _active_lock.acquire(blocking=False):
+        return None
+    try:
+        return SamplingProfiler(interval_ms, include_idle).start()
+    except Exception:
+        _active_lock.release()
+        raise
+
+
+def finish_profiler(profiler: SamplingProfiler, profile_id: str = None) -> str:
+    """Stop a profiler started with start_profiler and keep its output; returns the profile id"""
+    try:
+        profiler.stop()
+    finally:
+        _active_lock.release()
+    profile_id = profile_id or uuid.uuid4().hex[:12]
+    with _recent_lock:
+        _recent_profiles[profile_id] = profiler.collapsed()
+        while len(_recent_profiles) > ProfilerConfig.KEEP_PROFILES:
+            _recent_profiles.popitem(last=False)
+    logger.info(f"Profile {profile_id}: {profiler.sample_count} samples over {profiler.duration:.2f}s")
+    return profile_id
+
+
+def get_profile(profile_id: str) -> Optional[str]:
+    with _recent_lock:
+        return _recent_profiles.get(profile_id)
+
+
+class ProfilingMiddleware:
+    """
+    Per-request opt-in profiling
+    A request carrying "X-Profile: <PROFILER_HEADER_TOKEN>" is profiled while
+    it runs; the response carries X-Profile-Id, and the collapsed stacks can
+    then be downloaded from /api/admin/monitoring/profiles/{id}. Samples
+    cover every busy thread, so profile quiet workers for clean results.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ProfilerConfig.HEADER_TOKEN:
+            await self.app(scope, receive, send)
+            return
+
+        requested = next((value for name, value in scope["headers"] if name == b"x-profile"), None)
+        if requested is None or not hmac.compare_digest(requested, ProfilerConfig.HEADER_TOKEN.encode()):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = start_profiler()
+        profile_id = uuid.uuid4().hex[:12]
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                header = (b"x-profile-id", profile_id.encode()) if profiler else (b"x-profile-status", b"busy")
+                message = {**message, "headers": list(message.get("headers", [])) + [header]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            if profiler is not None:
+                finish_profiler(profiler, profile_id)
@@ -0,0 +1,202 @@
+"""
+SQL query instrumentation for Meta Portal.
+
+Counts the statements each request issues and how long they take, using
+SQLAlchemy cursor events. Results are returned as a Server-Timing header,
+aggregated per route, and statements slower than the configured threshold
+are logged.
+"""
+
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsConfig:
+    """Query instrumentation settings"""
+
+    # Statements slower than this are logged with their route
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+
+    # Longest statement text kept for logs and the slowest-statement report
+    MAX_STATEMENT_LENGTH = int(os.getenv("SLOW_QUERY_MAX_STATEMENT_LENGTH", "500"))
+
+
+class RequestQueryStats:
+    """Statement count and database time for one request"""
+
+    __slots__ = ("_route", "_resolve_route", "query_count", "total_ms", "slowest_ms", "slowest_statement")
+
+    def __init__(self, route: str = None, resolve_route: Callable[[], Optional[str]] = None):
+        self._route = route
+        self._resolve_route = resolve_route
+        self.query_count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    @property
+    def route(self) -> Optional[str]:
+        """Route name, resolved on first use once routing has happened"""
+        if self._route is None and self._resolve_route is not None:
+            self._route = self._resolve_route()
+        return self._route
+
+    def record(self, statement: str, elapsed_ms: float):
+        self.query_count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+
+    def server_timing(self) -> str:
+        """Format as a Server-Timing header value"""
+        return (
+            f'db;dur={self.total_ms:.2f};desc="{self.query_count} queries", '
+            f"db-slowest;dur={self.slowest_ms:.2f}"
+        )
+
+
+# Stats of the request being handled (copied into threadpool workers by Starlette)
+_current_request_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("current_request_stats", default=None)
+
+
+class RouteQueryStats:
+    """Thread-safe per-route aggregates of request query stats"""
+
+    def __init__(self):
+        self._routes: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stats: RequestQueryStats):
+        with self._lock:
+            name = stats.route or "(unmatched)"
+            route = self._routes.get(name)
+            if route is None:
+                route = self._routes[name] = {
+                    "requests": 0,
+                    "queries": 0,
+                    "db_ms": 0.0,
+                    "max_queries": 0,
+                    "max_db_ms": 0.0,
+                    "slowest_ms": 0.0,
+                    "slowest_statement": None
+                }
+            route["requests"] += 1
+            route["queries"] += stats.query_count
+            route["db_ms"] += stats.total_ms
+            route["max_queries"] = max(route["max_queries"], stats.query_count)
+            route["max_db_ms"] = max(route["max_db_ms"], stats.total_ms)
+            if stats.slowest_ms > route["slowest_ms"]:
+                route["slowest_ms"] = stats.slowest_ms
+                route["slowest_statement"] = stats.slowest_statement
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-route aggregates, busiest routes (by total DB time) first"""
+        with self._lock:
+            routes = {name: dict(values) for name, values in self._routes.items()}
+        for values in routes.values():
+            values["avg_queries"] = round(values["queries"] / values["requests"], 2)
+            values["avg_db_ms"] = round(values["db_ms"] / values["requests"], 2)
+            values["db_ms"] = round(values["db_ms"], 2)
+            values["max_db_ms"] = round(values["max_db_ms"], 2)
+            values["slowest_ms"] = round(values["slowest_ms"], 2)
+        return dict(sorted(routes.items(), key=lambda item: item[1]["db_ms"], reverse=True))
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+# Global per-route aggregates
+route_query_stats = RouteQueryStats()
+
+
+# ==========================================
+# SQLALCHEMY HOOKS
+# ==========================================
+
+def install_query_hooks(engine: Engine):
+    """Time every statement executed on the engine"""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get("query_start_times")
+    if not start_times:
+        return
+    elapsed_ms = (time.perf_counter() - start_times.pop()) * 1000
+    statement = statement[:QueryStatsConfig.MAX_STATEMENT_LENGTH]
+
+    stats = _current_request_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+
+    if elapsed_ms >= QueryStatsConfig.SLOW_QUERY_THRESHOLD_MS:
+        route = (stats.route or "(unmatched)") if stats is not None else "(no request)"
+        logger.warning(f"Slow query ({elapsed_ms:.1f} ms) on {route}: {statement}")
+
+
+# ==========================================
+# MIDDLEWARE
+# ==========================================
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware that collects query stats per request
+    Adds a Server-Timing header and feeds route_query_stats. Written as plain
+    ASGI (not BaseHTTPMiddleware) so streaming responses pass through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._route_paths: Optional[Dict[Any, str]] = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats(resolve_route=lambda: self._route_name(scope))
+        token = _current_request_stats.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_request_stats.reset(token)
+            route_query_stats.add(stats)
+
+    def _route_name(self, scope) -> Optional[str]:
+        """Method plus route template (e.g. 'GET /api/jobs/{job_id}') for the request"""
+        if "endpoint" not in scope:
+            # Not routed yet (or no route matched)
+            return None
+        if self._route_paths is None and "app" in scope:
+            self._route_paths = {}
+            for route in scope["app"].routes:
+                target = getattr(route, "endpoint", None) or getattr(route, "app", None)
+                self._route_paths[target] = route.path or "/"
+        path = (self._route_paths or {}).get(scope.get("endpoint"), "(unmatched)")
+        return f"{scope['method']} {path}"
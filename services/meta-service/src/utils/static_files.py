@@ -0,0 +1,60 @@
+"""
+Static file serving for Meta Portal.
+
+StaticFiles that serves precompressed variants (file.js.br / file.js.gz,
+written by frontend/meta-ui/build_assets.py) to clients that accept them,
+and sets Cache-Control: content-hashed files (name.<hash>.ext) never change
+and are cached for a year without revalidation; everything else is
+revalidated with its ETag/Last-Modified, so unchanged files cost a 304.
+"""
+
+import os
+import re
+from mimetypes import guess_type
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from .compression import accepted_encodings
+
+# name.<8+ hex digits>.ext, as produced by build_assets.py
+HASHED_FILENAME = re.compile(r"\.[0-9a-f]{8,}\.[A-Za-z0-9]+$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Precompressed variant suffix per Content-Encoding
+VARIANT_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles with .br/.gz variants and long-lived caching of hashed files"""
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        response = None
+        for encoding in accepted_encodings(request_headers):
+            variant = f"{full_path}{VARIANT_SUFFIXES[encoding]}"
+            try:
+                variant_stat = os.stat(variant)
+            except OSError:
+                continue
+            response = FileResponse(
+                variant, status_code=status_code, stat_result=variant_stat, method=scope["method"],
+                media_type=guess_type(str(full_path))[0] or "text/plain"
+            )
+            response.headers["Content-Encoding"] = encoding
+            break
+        if response is None:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, method=scope["method"])
+        if any(os.path.isfile(f"{full_path}{suffix}") for suffix in VARIANT_SUFFIXES.values()):
+            response.headers.append("Vary", "Accept-Encoding")
+
+        response.headers["Cache-Control"] = (
+            IMMUTABLE_CACHE_CONTROL if HASHED_FILENAME.search(os.path.basename(full_path)) else REVALIDATE_CACHE_CONTROL
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Tests that go through the app use a scratch database, never databases/meta.db
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='meta-tests-'), 'test.db')}"
+
+from src.config.database import Base, SessionLocal, init_db  # noqa: E402
+import src.models  # noqa: F401,E402  (register all tables on Base.metadata)
+from src.models import (  # noqa: E402
+    Application, ApplicationStageLatency, ApplicationStatsBucket, ApplicationStatusChange, Company, Job, User
+)
+from src.models.email import Email, EmailQueue  # noqa: E402
+from src.services.auth import create_access_token  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def app_database():
+    """Schema for the app's own engine (the app only creates it at startup)"""
+    init_db()
+
+
+@pytest.fixture
+def db_session():
+    """Fresh in-memory database per test, isolated from databases/meta.db."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def tenant_db():
+    """Session on the app's database for seeding; removes every seeded company's rows afterwards"""
+    from src.services.email_service import email_service
+
+    email_service.template_engine._compiled_cache.clear()  # template ids from other test databases may repeat here
+    db = SessionLocal()
+    yield db
+    db.rollback()
+    company_ids = [company_id for (company_id,) in db.query(Company.id).filter(Company.slug.like("tenant-%"))]
+    email_ids = db.query(Email.id).filter(Email.company_id.in_(company_ids))
+    db.query(EmailQueue).filter(EmailQueue.email_id.in_(email_ids.scalar_subquery())).delete(synchronize_session=False)
+    db.query(Email).filter(Email.company_id.in_(company_ids)).delete(synchronize_session=False)
+    for model in (ApplicationStatsBucket, ApplicationStageLatency, ApplicationStatusChange):
+        db.query(model).filter(model.company_id.in_(company_ids)).delete(synchronize_session=False)
+    for model in (Application, Job, User, Company):
+        column = Company.id if model is Company else model.company_id
+        db.query(model).filter(column.in_(company_ids)).delete(synchronize_session=False)
+    db.commit()
+    db.close()
+
+
+@pytest.fixture
+def seed_company(tenant_db):
+    """
+    Creates a company with an admin, two jobs and `applicants` users who
+    each applied to the first job; returns their ids and auth headers
+    """
+    def seed(applicants: int = 1):
+        db = tenant_db
+        suffix = uuid.uuid4().hex[:8]
+        company = Company(name=f"Tenant {suffix}", slug=f"tenant-{suffix}", is_active=True)
+        db.add(company)
+        db.flush()
+        admin = User(email=f"admin-{suffix}@example.com", password_hash="x", first_name="Admin", last_name=suffix,
+                     phone="1", company_id=company.id, is_admin=True)
+        users = [
+            User(email=f"user-{index}-{suffix}@example.com", password_hash="x", first_name="User",
+                 last_name=str(index), phone="1", company_id=company.id)
+            for index in range(applicants)
+        ]
+        job = Job(title="Engineer", location="Remote", description="d", company_id=company.id)
+        spare_job = Job(title="Designer", location="Remote", description="d", company_id=company.id)
+        db.add_all([admin, *users, job, spare_job])
+        db.flush()
+        db.add_all([
+            Application(user_id=user.id, job_id=job.id, company_id=company.id, cover_letter="c")
+            for user in users
+        ])
+        db.commit()
+
+        def headers(user):
+            token = create_access_token({"sub": user.email, "company_id": company.id, "user_id": user.id,
+                                         "is_admin": user.is_admin})
+            return {"Authorization": f"Bearer {token}"}
+
+        return {
+            "company_id": company.id,
+            "company_name": company.name,
+            "user_id": users[0].id if users else None,
+            "job_id": job.id,
+            "spare_job_id": spare_job.id,
+            "headers": headers(admin),
+            "user_headers": headers(users[0]) if users else None,
+        }
+
+    return seed
@@ -0,0 +1,338 @@
+-- Schema of a database created by Base.metadata.create_all at the baseline
+-- commit (d35987f), before Alembic. Frozen: do not regenerate from today's models.
+
+CREATE TABLE users (
+	id INTEGER NOT NULL,
+	company_id INTEGER,
+	email VARCHAR(255) NOT NULL,
+	password_hash VARCHAR(255) NOT NULL,
+	first_name VARCHAR(100) NOT NULL,
+	last_name VARCHAR(100) NOT NULL,
+	phone VARCHAR(20) NOT NULL,
+	bio VARCHAR(500),
+	skills VARCHAR(500),
+	experience VARCHAR(1000),
+	education VARCHAR(500),
+	linkedin_url VARCHAR(255),
+	github_url VARCHAR(255),
+	created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+	updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP),
+	is_active BOOLEAN NOT NULL,
+	is_admin BOOLEAN NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(company_id) REFERENCES companies (id)
+);
+CREATE UNIQUE INDEX ix_users_email ON users (email);
+CREATE INDEX ix_users_id ON users (id);
+CREATE INDEX ix_users_company_id ON users (company_id);
+CREATE TABLE companies (
+	id INTEGER NOT NULL,
+	name VARCHAR(200) NOT NULL,
+	domain VARCHAR(100),
+	slug VARCHAR(50) NOT NULL,
+	description TEXT,
+	industry VARCHAR(100),
+	website VARCHAR(255),
+	headquarters VARCHAR(200),
+	size VARCHAR(50),
+	settings JSON,
+	admin_user_id INTEGER,
+	is_active BOOLEAN NOT NULL,
+	created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+	updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP),
+	PRIMARY KEY (id),
+	FOREIGN KEY(admin_user_id) REFERENCES users (id)
+);
+CREATE UNIQUE INDEX ix_companies_domain ON companies (domain);
+CREATE INDEX ix_companies_id ON companies (id);
+CREATE UNIQUE INDEX ix_companies_slug ON companies (slug);
+CREATE UNIQUE INDEX ix_companies_name ON companies (name);
+CREATE TABLE jobs (
+	id INTEGER NOT NULL,
+	company_id INTEGER,
+	title VARCHAR(200) NOT NULL,
+	department VARCHAR(100),
+	location VARCHAR(100) NOT NULL,
+	job_type VARCHAR(50) NOT NULL,
+	experience_level VARCHAR(50),
+	salary_min INTEGER,
+	salary_max INTEGER,
+	description TEXT NOT NULL,
+	requirements TEXT,
+	posted_date DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+	is_active BOOLEAN NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(company_id) REFERENCES companies (id)
+);
+CREATE INDEX ix_jobs_id ON jobs (id);
+CREATE INDEX ix_jobs_company_id ON jobs (company_id);
+CREATE INDEX ix_jobs_title ON jobs (title);
+CREATE TABLE email_templates (
+	id INTEGER NOT NULL,
+	name VARCHAR(100) NOT NULL,
+	display_name VARCHAR(200) NOT NULL,
+	description TEXT,
+	subject_template VARCHAR(500) NOT NULL,
+	html_content TEXT,
+	text_content TEXT NOT NULL,
+	variables JSON,
+	category VARCHAR(50),
+	language VARCHAR(10) NOT NULL,
+	company_id INTEGER,
+	is_system_template BOOLEAN NOT NULL,
+	is_active BOOLEAN NOT NULL,
+	version INTEGER NOT NULL,
+	usage_count INTEGER NOT NULL,
+	last_used_at DATETIME,
+	created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+	updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+	created_by INTEGER,
+	updated_by INTEGER,
+	PRIMARY KEY (id),
+	FOREIGN KEY(company_id) REFERENCES companies (id),
+	FOREIGN KEY(created_by) REFERENCES users (id),
+	FOREIGN KEY(updated_by) REFERENCES users (id)
+);
+CREATE INDEX ix_email_templates_company_id ON email_templates (company_id);
+CREATE INDEX ix_email_templates_category ON email_templates (category);
+CREATE INDEX ix_email_templates_id ON email_templates (id);
+CREATE UNIQUE INDEX ix_email_templates_name ON email_templates (name);
+CREATE TABLE email_preferences (
+	id INTEGER NOT NULL,
+	user_id INTEGER NOT NULL,
+	job_application_confirmations BOOLEAN NOT NULL,
+	application_status_updates BOOLEAN NOT NULL,
+	new_job_notifications BOOLEAN NOT NULL,
+	marketing_emails BOOLEAN NOT NULL,
+	system_notifications BOOLEAN NOT NULL,
+	digest_frequency VARCHAR(20) NOT NULL,
+	preferred_time VARCHAR(5),
+	backup_email VARCHAR(255),
+	sms_notifications BOOLEAN NOT NULL,
+	phone_number VARCHAR(20),
+	created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+	updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(user_id) REFERENCES users (id)
+);
+CREATE INDEX ix_email_preferences_id ON email_preferences (id);
+CREATE UNIQUE INDEX ix_email_preferences_user_id ON email_preferences (user_id);
+CREATE TABLE file_uploads (
+	id INTEGER NOT NULL,
+	user_id INTEGER NOT NULL,
+	company_id INTEGER,
+	filename VARCHAR(500) NOT NULL,
+	original_name VARCHAR(500) NOT NULL,
+	file_size INTEGER NOT NULL,
+	mime_type VARCHAR(200) NOT NULL,
+	file_extension VARCHAR(10) NOT NULL,
+	file_hash VARCHAR(64) NOT NULL,
+	storage_backend VARCHAR(5) NOT NULL,
+	storage_path VARCHAR(1000) NOT NULL,
+	storage_bucket VARCHAR(200),
+	storage_key VARCHAR(1000),
+	upload_status VARCHAR(9) NOT NULL,
+	upload_progress INTEGER NOT NULL,
+	chunk_count INTEGER NOT NULL,
+	chunks_uploaded INTEGER NOT NULL,
+	virus_scan_status VARCHAR(8) NOT NULL,
+	virus_scan_result TEXT,
+	virus_scan_date DATETIME,
+	processing_logs JSON,
+	file_metadata JSON,
+	access_level VARCHAR(7) NOT NULL,
+	download_count INTEGER NOT NULL,
+	last_accessed DATETIME,
+	upload_ip VARCHAR(45),
+	user_agent VARCHAR(500),
+	upload_session_id VARCHAR(100),
+	expires_at DATETIME,
+	is_temporary BOOLEAN NOT NULL,
+	is_active BOOLEAN NOT NULL,
+	created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+	updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(user_id) REFERENCES users (id),
+	FOREIGN KEY(company_id) REFERENCES companies (id)
+);
+CREATE INDEX ix_file_uploads_id ON file_uploads (id);
+CREATE INDEX ix_file_uploads_virus_scan_status ON file_uploads (virus_scan_status);
+CREATE UNIQUE INDEX ix_file_uploads_file_hash ON file_uploads (file_hash);
+CREATE INDEX ix_file_uploads_user_id ON file_uploads (user_id);
+CREATE INDEX ix_file_uploads_upload_status ON file_uploads (upload_status);
+CREATE INDEX ix_file_uploads_company_id ON file_uploads (company_id);
+CREATE INDEX ix_file_uploads_upload_session_id ON file_uploads (upload_session_id);
+CREATE TABLE applications (
+	id INTEGER NOT NULL,
+	user_id INTEGER NOT NULL,
+	job_id INTEGER NOT NULL,
+	company_id INTEGER,
+	cover_letter TEXT NOT NULL,
+	additional_info TEXT,
+	status VARCHAR(50) NOT NULL,
+	applied_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+	updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP),
+	PRIMARY KEY (id),
+	FOREIGN KEY(user_id) REFERENCES users (id),
+	FOREIGN KEY(job_id) REFERENCES jobs (id),
+	FOREIGN KEY(company_id) REFERENCES companies (id)
+);
+CREATE INDEX ix_applications_company_id ON applications (company_id);
+CREATE INDEX ix_applications_id ON applications (id);
+CREATE TABLE file_access_logs (
+	id INTEGER NOT NULL,
+	file_upload_id INTEGER NOT NULL,
+	access_type VARCHAR(50) NOT NULL,
+	user_id INTEGER,
+	ip_address VARCHAR(45),
+	user_agent VARCHAR(500),
+	referer VARCHAR(500),
+	response_status INTEGER NOT NULL,
+	bytes_served INTEGER,
+	response_time_ms INTEGER,
+	accessed_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(file_upload_id) REFERENCES file_uploads (id),
+	FOREIGN KEY(user_id) REFERENCES users (id)
+);
+CREATE INDEX ix_file_access_logs_file_upload_id ON file_access_logs (file_upload_id);
+CREATE INDEX ix_file_access_logs_access_type ON file_access_logs (access_type);
+CREATE INDEX ix_file_access_logs_id ON file_access_logs (id);
+CREATE INDEX ix_file_access_logs_user_id ON file_access_logs (user_id);
+CREATE TABLE emails (
+	id INTEGER NOT NULL,
+	recipient_email VARCHAR(255) NOT NULL,
+	recipient_name VARCHAR(255),
+	sender_email VARCHAR(255) NOT NULL,
+	sender_name VARCHAR(255),
+	subject VARCHAR(500) NOT NULL,
+	html_content TEXT,
+	text_content TEXT,
+	template_name VARCHAR(100),
+	template_data JSON,
+	status VARCHAR(9) NOT NULL,
+	priority VARCHAR(6) NOT NULL,
+	scheduled_at DATETIME,
+	sent_at DATETIME,
+	delivered_at DATETIME,
+	opened_at DATETIME,
+	failed_reason TEXT,
+	retry_count INTEGER NOT NULL,
+	max_retries INTEGER NOT NULL,
+	company_id INTEGER,
+	user_id INTEGER,
+	application_id INTEGER,
+	job_id INTEGER,
+	tracking_enabled BOOLEAN NOT NULL,
+	tracking_id VARCHAR(100),
+	external_message_id VARCHAR(255),
+	created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+	updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+	created_by INTEGER,
+	PRIMARY KEY (id),
+	FOREIGN KEY(company_id) REFERENCES companies (id),
+	FOREIGN KEY(user_id) REFERENCES users (id),
+	FOREIGN KEY(application_id) REFERENCES applications (id),
+	FOREIGN KEY(job_id) REFERENCES jobs (id),
+	FOREIGN KEY(created_by) REFERENCES users (id)
+);
+CREATE INDEX ix_emails_recipient_email ON emails (recipient_email);
+CREATE INDEX ix_emails_template_name ON emails (template_name);
+CREATE INDEX ix_emails_application_id ON emails (application_id);
+CREATE INDEX ix_emails_id ON emails (id);
+CREATE INDEX ix_emails_status ON emails (status);
+CREATE INDEX ix_emails_company_id ON emails (company_id);
+CREATE INDEX ix_emails_user_id ON emails (user_id);
+CREATE UNIQUE INDEX ix_emails_tracking_id ON emails (tracking_id);
+CREATE INDEX ix_emails_job_id ON emails (job_id);
+CREATE TABLE resumes (
+	id INTEGER NOT NULL,
+	file_upload_id INTEGER NOT NULL,
+	user_id INTEGER NOT NULL,
+	company_id INTEGER,
+	application_id INTEGER,
+	status VARCHAR(11) NOT NULL,
+	processing_started_at DATETIME,
+	processing_completed_at DATETIME,
+	processing_duration_ms INTEGER,
+	extracted_text TEXT,
+	parsed_data JSON,
+	skills JSON,
+	experience_years INTEGER,
+	education_level VARCHAR(100),
+	certifications JSON,
+	languages JSON,
+	completeness_score FLOAT,
+	quality_score FLOAT,
+	keywords JSON,
+	candidate_name VARCHAR(200),
+	candidate_email VARCHAR(255),
+	candidate_phone VARCHAR(50),
+	candidate_location VARCHAR(200),
+	is_primary BOOLEAN NOT NULL,
+	is_active BOOLEAN NOT NULL,
+	version INTEGER NOT NULL,
+	parsing_config JSON,
+	ai_analysis_enabled BOOLEAN NOT NULL,
+	view_count INTEGER NOT NULL,
+	download_count INTEGER NOT NULL,
+	last_viewed DATETIME,
+	created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+	updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(file_upload_id) REFERENCES file_uploads (id),
+	FOREIGN KEY(user_id) REFERENCES users (id),
+	FOREIGN KEY(company_id) REFERENCES companies (id),
+	FOREIGN KEY(application_id) REFERENCES applications (id)
+);
+CREATE INDEX ix_resumes_application_id ON resumes (application_id);
+CREATE UNIQUE INDEX ix_resumes_file_upload_id ON resumes (file_upload_id);
+CREATE INDEX ix_resumes_user_id ON resumes (user_id);
+CREATE INDEX ix_resumes_status ON resumes (status);
+CREATE INDEX ix_resumes_company_id ON resumes (company_id);
+CREATE INDEX ix_resumes_id ON resumes (id);
+CREATE TABLE email_queue (
+	id INTEGER NOT NULL,
+	email_id INTEGER NOT NULL,
+	queue_name VARCHAR(50) NOT NULL,
+	priority_score INTEGER NOT NULL,
+	execute_after DATETIME NOT NULL,
+	started_at DATETIME,
+	completed_at DATETIME,
+	status VARCHAR(20) NOT NULL,
+	worker_id VARCHAR(100),
+	processing_time_ms INTEGER,
+	error_message TEXT,
+	retry_after DATETIME,
+	created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+	updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(email_id) REFERENCES emails (id)
+);
+CREATE INDEX ix_email_queue_id ON email_queue (id);
+CREATE INDEX ix_email_queue_execute_after ON email_queue (execute_after);
+CREATE INDEX ix_email_queue_queue_name ON email_queue (queue_name);
+CREATE INDEX ix_email_queue_status ON email_queue (status);
+CREATE INDEX ix_email_queue_email_id ON email_queue (email_id);
+CREATE INDEX ix_email_queue_priority_score ON email_queue (priority_score);
+CREATE TABLE resume_processing_logs (
+	id INTEGER NOT NULL,
+	resume_id INTEGER NOT NULL,
+	step_name VARCHAR(100) NOT NULL,
+	step_status VARCHAR(50) NOT NULL,
+	started_at DATETIME NOT NULL,
+	completed_at DATETIME,
+	duration_ms INTEGER,
+	result_data JSON,
+	error_message TEXT,
+	error_trace TEXT,
+	processor_version VARCHAR(50),
+	processor_config JSON,
+	created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(resume_id) REFERENCES resumes (id)
+);
+CREATE INDEX ix_resume_processing_logs_resume_id ON resume_processing_logs (resume_id);
+CREATE INDEX ix_resume_processing_logs_step_name ON resume_processing_logs (step_name);
+CREATE INDEX ix_resume_processing_logs_step_status ON resume_processing_logs (step_status);
+CREATE INDEX ix_resume_processing_logs_id ON resume_processing_logs (id);
@@ -0,0 +1,59 @@
+import csv
+import gzip
+import io
+import json
+import sqlite3
+
+import httpx
+import pytest
+
+from src.config.database import engine
+from src.main import app
+from src.models import Application
+from src.services.export_service import ExportConfig, applications_export_query, stream_export
+
+
+@pytest.mark.asyncio
+async def test_exports_stream_only_own_company(monkeypatch, seed_company):
+    monkeypatch.setattr(ExportConfig, "PAGE_SIZE", 2)
+    monkeypatch.setattr(ExportConfig, "CHUNK_BYTES", 64)
+    own = seed_company(applicants=5)
+    seed_company(applicants=3)
+    company_id, company_name, headers = own["company_id"], own["company_name"], own["headers"]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/api/admin/applications/export", headers=headers)
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(resp.text)))
+        assert len(rows) == 5
+        assert {row["company_name"] for row in rows} == {company_name}
+
+        resp = await client.get("/api/admin/users/export", params={"format": "ndjson", "gzip": "true"}, headers=headers)
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/gzip"
+        users = [json.loads(line) for line in gzip.decompress(resp.content).decode().splitlines()]
+        assert len(users) == 6  # admin + applicants
+        assert {user["company_id"] for user in users} == {company_id}
+        assert sorted(user["application_count"] for user in users) == [0, 1, 1, 1, 1, 1]
+
+
+def test_export_does_not_block_writers_between_pages(monkeypatch, seed_company):
+    monkeypatch.setattr(ExportConfig, "PAGE_SIZE", 2)
+    monkeypatch.setattr(ExportConfig, "CHUNK_BYTES", 1)  # one chunk per page
+    own = seed_company(applicants=5)
+    chunks = stream_export(applications_export_query(own["company_id"], False), Application.id, "csv")
+    first = next(chunks)
+
+    # A client is still downloading; a writer must not wait for it
+    writer = sqlite3.connect(engine.url.database, timeout=0.1)
+    try:
+        writer.execute("UPDATE applications SET status = status WHERE company_id = ?", (own["company_id"],))
+        writer.commit()
+    finally:
+        writer.close()
+
+    rows = list(csv.DictReader(io.StringIO((first + b"".join(chunks)).decode())))
+    assert len(rows) == 5
+    assert [int(row["id"]) for row in rows] == sorted(int(row["id"]) for row in rows)
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from src.main import app
+from src.models import Application, User
+from src.services.application_history_service import application_history
+from src.services.application_stats_service import application_stats_buckets
+
+
+@pytest.mark.asyncio
+async def test_application_funnel_and_trends_from_buckets(tenant_db, seed_company):
+    own = seed_company()
+    other = seed_company()
+    application_stats_buckets.rebuild(tenant_db)  # backfills the seeded applications
+    own_app = tenant_db.query(Application.id).filter(Application.job_id == own["job_id"]).scalar()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.patch(f"/api/admin/applications/{own_app}/status", json={"status": "in_review"}, headers=own["headers"])
+        assert resp.status_code == 200
+        resp = await client.patch("/api/admin/applications/status", headers=own["headers"], json={
+            "status": "interview", "application_ids": [own_app], "notify": False
+        })
+        assert resp.json()["counts"] == {"updated": 1}
+
+        resp = await client.get("/api/admin/analytics/funnel", headers=own["headers"])
+        funnel = resp.json()
+        assert funnel["received"] == 1
+        assert {stage["status"]: stage["count"] for stage in funnel["stages"]} == {
+            "submitted": 1, "in_review": 1, "interview": 1, "accepted": 0, "rejected": 0
+        }
+        assert funnel["time_to_first_review"]["reviewed"] == 1
+
+        resp = await client.get("/api/admin/analytics/funnel", params={"job_id": own["spare_job_id"]}, headers=own["headers"])
+        assert resp.json()["received"] == 0
+
+        resp = await client.get("/api/admin/analytics/trends", params={"days": 7}, headers=own["headers"])
+        trend = resp.json()["trend"]
+        assert len(trend) == 7
+        assert trend[-1]["received"] == 1
+        assert trend[-1]["status_changes"] == {"in_review": 1, "interview": 1}
+
+        resp = await client.get("/api/admin/analytics/funnel", headers=other["headers"])
+        assert resp.json()["received"] == 1
+        assert resp.json()["transitions"] == []
+
+    # The backfill only knows current statuses: one change straight to "interview"
+    application_stats_buckets.rebuild(tenant_db)
+    funnel = application_stats_buckets.get_funnel(tenant_db, own["company_id"])
+    assert funnel["transitions"] == [{"from": "submitted", "to": "interview", "count": 1}]
+    assert funnel["time_to_first_review"]["reviewed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_status_changes_are_logged_with_stage_times(tenant_db, seed_company):
+    own = seed_company()
+    application = tenant_db.query(Application).filter(Application.job_id == own["job_id"]).one()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for new_status in ("in_review", "interview"):
+            resp = await client.patch(f"/api/admin/applications/{application.id}/status", json={"status": new_status},
+                                      headers=own["headers"])
+            assert resp.status_code == 200
+
+        resp = await client.get(f"/api/admin/applications/{application.id}/history", headers=own["headers"])
+        history = resp.json()["history"]
+        assert [(change["from_status"], change["to_status"]) for change in history] == [
+            ("submitted", "in_review"), ("in_review", "interview")
+        ]
+        assert all(change["hours_in_stage"] is not None for change in history)
+
+        resp = await client.get("/api/admin/analytics/stage-times", headers=own["headers"])
+        assert [(stage["from"], stage["to"], stage["count"]) for stage in resp.json()["stages"]] == [
+            ("submitted", "in_review", 1), ("in_review", "interview", 1)
+        ]
+
+    # Percentiles come from the histogram: three moves after 1.5h, 3h and 3 days
+    applied_at = datetime.utcnow() - timedelta(days=5)
+    moves = []
+    for index, hours in enumerate((1.5, 3, 72)):
+        applicant = User(email=f"mover-{index}-{own['user_id']}@example.com", password_hash="x", first_name="M",
+                         last_name="M", phone="1", company_id=own["company_id"])
+        tenant_db.add(applicant)
+        tenant_db.flush()
+        moved = Application(user_id=applicant.id, job_id=own["spare_job_id"], company_id=own["company_id"],
+                            cover_letter="c", applied_at=applied_at, updated_at=applied_at)
+        tenant_db.add(moved)
+        moves.append((moved, applied_at + timedelta(hours=hours)))
+    tenant_db.flush()
+    for moved, moved_at in moves:
+        application_history.record_transitions(tenant_db, [moved], "rejected", now=moved_at)
+    tenant_db.commit()
+
+    (stage,) = application_history.get_stage_times(tenant_db, own["company_id"], own["spare_job_id"], days=7)
+    assert (stage["from"], stage["to"], stage["count"]) == ("submitted", "rejected", 3)
+    assert 2 <= stage["median_hours"] <= 4
+    assert stage["avg_hours"] == 25.5
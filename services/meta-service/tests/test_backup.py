@@ -0,0 +1,68 @@
+import sqlite3
+
+import pytest
+
+from src.services.backup_service import BackupService, BackupConfig, BackupError
+
+
+def test_snapshot_and_point_in_time_restore(tmp_path, monkeypatch):
+    monkeypatch.setattr(BackupConfig, "WAL_SHIPPING", True)
+    monkeypatch.setattr(BackupConfig, "PAGES_PER_STEP", 16)
+    monkeypatch.setattr(BackupConfig, "STEP_PAUSE_MS", 0)
+
+    database_path = str(tmp_path / "app.db")
+    app = sqlite3.connect(database_path, isolation_level=None)
+    app.execute("PRAGMA journal_mode=WAL")
+    app.execute("PRAGMA wal_autocheckpoint=0")
+    app.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+    app.executemany("INSERT INTO notes (body) VALUES (?)", [("x" * 200,)] * 2000)
+
+    service = BackupService(database_path=database_path, backup_dir=str(tmp_path / "backups"))
+    manifest = service.create_backup()
+    assert manifest["steps"] > 1  # copied in increments
+    assert manifest["verified"]["row_counts"] == {"notes": 2000}
+    assert manifest["compressed_bytes"] < manifest["database_bytes"]
+
+    # Writes after the snapshot are recovered from shipped WAL copies
+    app.executemany("INSERT INTO notes (body) VALUES (?)", [("y",)] * 10)
+    assert service.ship_wal()["shipped"]
+    app.executemany("INSERT INTO notes (body) VALUES (?)", [("z",)] * 10)
+    assert service.ship_wal()["shipped"]
+    app.close()
+
+    assert service.restore(manifest["name"], str(tmp_path / "base.db"))["row_counts"] == {"notes": 2000}
+    assert service.restore(manifest["name"], str(tmp_path / "pit1.db"), wal_copy=1)["row_counts"] == {"notes": 2010}
+    assert service.restore(manifest["name"], str(tmp_path / "latest.db"), wal_copy=-1)["row_counts"] == {"notes": 2020}
+    with pytest.raises(BackupError):
+        service.restore(manifest["name"], str(tmp_path / "latest.db"))
+
+
+def test_backup_routes_are_for_super_admins_only(tmp_path, monkeypatch, tenant_db, seed_company):
+    import asyncio
+    import httpx
+    from src.main import app
+    from src.models import User
+    from src.services.auth import create_access_token
+    from src.services.backup_service import backup_service
+
+    monkeypatch.setattr(backup_service, "_backup_dir", str(tmp_path))
+    company_admin = seed_company(applicants=0)["headers"]
+    super_admin = User(email="backup-super-admin@example.com", password_hash="x", first_name="S", last_name="A",
+                       phone="1", is_admin=True, company_id=None)
+    tenant_db.add(super_admin)
+    tenant_db.commit()
+    token = create_access_token({"sub": super_admin.email, "company_id": None, "user_id": super_admin.id, "is_admin": True})
+
+    async def call(method, path, headers):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return (await client.request(method, path, headers=headers)).status_code
+
+    try:
+        # Snapshots hold every company's data
+        for method, path in (("GET", "/api/admin/backups"), ("POST", "/api/admin/backups"), ("POST", "/api/admin/backups/wal")):
+            assert asyncio.run(call(method, path, company_admin)) == 403
+        assert asyncio.run(call("GET", "/api/admin/backups", {"Authorization": f"Bearer {token}"})) == 200
+    finally:
+        tenant_db.delete(super_admin)
+        tenant_db.commit()
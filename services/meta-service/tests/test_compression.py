@@ -0,0 +1,124 @@
+import asyncio
+import gzip
+import json
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+
+from src.utils.compression import CompressionMiddleware
+from src.utils.static_files import PrecompressedStaticFiles
+
+ROWS = [{"id": index, "title": "Software Engineer", "location": "Remote"} for index in range(200)]
+
+
+def _client(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_compresses_large_dynamic_responses_only():
+    async def stream():
+        for row in ROWS:
+            yield (json.dumps(row) + "\n").encode()
+
+    app = Starlette(routes=[
+        Route("/large", lambda request: JSONResponse(ROWS)),
+        Route("/small", lambda request: JSONResponse({"ok": True})),
+        Route("/export.gz", lambda request: Response(gzip.compress(json.dumps(ROWS).encode()), media_type="application/gzip")),
+        Route("/stream", lambda request: StreamingResponse(stream(), media_type="application/x-ndjson")),
+    ])
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    async with _client(app) as client:
+        resp = await client.get("/large", headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["content-encoding"] == "gzip"
+        assert int(resp.headers["content-length"]) < len(json.dumps(ROWS)) / 5
+        assert resp.json() == ROWS
+
+        resp = await client.get("/large", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in resp.headers
+
+        resp = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in resp.headers
+
+        # Already gzip data is not compressed again
+        resp = await client.get("/export.gz", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in resp.headers
+        assert json.loads(gzip.decompress(resp.content)) == ROWS
+
+        resp = await client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["content-encoding"] == "gzip"
+        assert [json.loads(line) for line in resp.text.splitlines()] == ROWS
+
+
+@pytest.mark.asyncio
+async def test_static_files_serve_precompressed_and_cache_hashed_names(tmp_path):
+    script = b"console.log('meta');\n" * 200
+    (tmp_path / "app.0123456789.js").write_bytes(script)
+    (tmp_path / "app.0123456789.js.gz").write_bytes(gzip.compress(script))
+    (tmp_path / "index.html").write_text("<html></html>")
+
+    app = Starlette(routes=[Mount("/", PrecompressedStaticFiles(directory=str(tmp_path), html=True))])
+    app.add_middleware(CompressionMiddleware)
+
+    async with _client(app) as client:
+        resp = await client.get("/app.0123456789.js", headers={"Accept-Encoding": "gzip, br;q=0"})
+        assert resp.headers["content-encoding"] == "gzip"
+        assert resp.headers["content-type"].startswith(("application/javascript", "text/javascript"))
+        assert resp.headers["cache-control"] == "public, max-age=31536000, immutable"
+        assert resp.headers["vary"] == "Accept-Encoding"
+        assert resp.content == script
+
+        resp = await client.get("/app.0123456789.js", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in resp.headers
+        assert int(resp.headers["content-length"]) == len(script)
+
+        resp = await client.get("/", headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["cache-control"] == "no-cache"
+        resp = await client.get("/", headers={"If-None-Match": resp.headers["etag"]})
+        assert resp.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_event_stream_is_sent_uncompressed_event_by_event(seed_company):
+    from src.main import app as meta_app
+    from src.services.email_events import email_event_bus
+
+    own = seed_company()
+    async with _client(meta_app) as client:
+        resp = await client.post("/api/admin/email-queue/stream-token", headers=own["headers"])
+        token = resp.json()["token"]
+
+    # Driven at the ASGI level: the stream never ends, and each event must
+    # reach the client while it is still open
+    messages = asyncio.Queue()
+    disconnected = asyncio.Event()
+
+    async def receive():
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": "/api/admin/email-queue/stream", "raw_path": b"/api/admin/email-queue/stream", "root_path": "",
+        "query_string": f"token={token}".encode(), "client": ("test", 1), "server": ("test", 80),
+        "headers": [(b"host", b"test"), (b"accept-encoding", b"gzip, br")],
+    }
+    stream = asyncio.create_task(meta_app(scope, receive, messages.put))
+    try:
+        start = await asyncio.wait_for(messages.get(), 5)
+        assert start["status"] == 200
+        assert b"content-encoding" not in dict(start["headers"])
+
+        snapshot = await asyncio.wait_for(messages.get(), 5)
+        assert json.loads(snapshot["body"].decode().removeprefix("data: "))["type"] == "snapshot"
+
+        email_event_bus.publish({"type": "queued", "count": 1})
+        event = await asyncio.wait_for(messages.get(), 5)
+        assert json.loads(event["body"].decode().removeprefix("data: ")) == {"type": "queued", "count": 1}
+    finally:
+        disconnected.set()
+        await asyncio.wait_for(stream, 5)
@@ -0,0 +1,244 @@
+from src.models.email import Email, EmailTemplate, EmailQueue, EmailBatch, EmailStatus
+from src.services.email_service import email_service, EmailConfig
+
+
+def _make_template(db, name="bulk_announcement"):
+    template = EmailTemplate(
+        name=name,
+        display_name="Bulk announcement",
+        subject_template="Hello {{ recipient_email }}",
+        html_content="<p>{{ message }}</p>",
+        text_content="{{ message }}",
+        is_active=True,
+    )
+    db.add(template)
+    db.commit()
+    return template
+
+
+def test_bulk_batch_queues_every_recipient_in_chunks(db_session, monkeypatch):
+    monkeypatch.setattr(EmailConfig, "BULK_CHUNK_SIZE", 100)
+    template = _make_template(db_session)
+    recipients = [f"user{i}@example.com" for i in range(250)]
+
+    batch = email_service.create_bulk_batch(db_session, template.name, len(recipients))
+    email_service.queue_bulk_emails(
+        db_session, batch.batch_id, recipients,
+        template_name=template.name, template_data={"message": "Hi"},
+    )
+
+    db_session.refresh(batch)
+    assert batch.status == "completed"
+    assert batch.emails_queued == 250
+    assert db_session.query(Email).filter(Email.batch_id == batch.batch_id).count() == 250
+    assert db_session.query(EmailQueue).count() == 250
+
+    email = db_session.query(Email).filter(Email.recipient_email == "user7@example.com").one()
+    assert email.subject == "Hello user7@example.com"
+    assert email.status == EmailStatus.PENDING
+
+    progress = email_service.get_bulk_batch_progress(db_session, batch)
+    assert progress["pending"] == 250
+    assert progress["sent"] == 0
+
+    db_session.refresh(template)
+    assert template.usage_count == 250
+
+
+def test_bulk_batch_with_missing_template_is_marked_failed(db_session):
+    batch = email_service.create_bulk_batch(db_session, "does_not_exist", 1)
+    email_service.queue_bulk_emails(
+        db_session, batch.batch_id, ["a@example.com"], template_name="does_not_exist"
+    )
+
+    batch = db_session.query(EmailBatch).filter(EmailBatch.batch_id == batch.batch_id).one()
+    assert batch.status == "failed"
+    assert "not found" in batch.error_message
+    assert db_session.query(Email).count() == 0
+
+
+def test_compiled_template_cache_follows_template_version(db_session):
+    engine = email_service.template_engine
+    template = _make_template(db_session, name="cached_template")
+
+    first = engine.get_compiled_template(template)
+    assert engine.get_compiled_template(template) is first
+
+    template.subject_template = "Updated {{ recipient_email }}"
+    template.version += 1
+    db_session.commit()
+    subject, _, _ = engine.render_template_from_db(template, {"recipient_email": "a@b.c", "message": "x"})
+    assert subject == "Updated a@b.c"
+
+    engine.invalidate_template(template.id)
+    assert (template.id, template.version) not in engine._compiled_cache
+
+
+def _make_user(db, email, frequency="immediate", preferred_time=None, **preferences):
+    from src.models.user import User
+    from src.models.email import EmailPreference
+
+    user = User(email=email, password_hash="x", first_name="Test", last_name="User", phone="1")
+    db.add(user)
+    db.flush()
+    db.add(EmailPreference(
+        user_id=user.id, digest_frequency=frequency, preferred_time=preferred_time, **preferences
+    ))
+    db.commit()
+    return user
+
+
+def test_digest_users_get_one_email_per_window(db_session):
+    from datetime import timedelta
+    from src.models.email import EmailDigestItem
+    from src.services.digest_service import digest_scheduler, Notification
+
+    _make_template(db_session, name="application_status_update")
+    daily = _make_user(db_session, "daily@example.com", "daily", "09:00")
+    instant = _make_user(db_session, "instant@example.com")
+    opted_out = _make_user(db_session, "quiet@example.com", application_status_updates=False)
+
+    notifications = [
+        Notification(user.id, "application_status_update", {"message": f"update {i}"}, "application_status_updates")
+        for user in (daily, instant, opted_out)
+        for i in range(3)
+    ]
+    result = digest_scheduler.notify_users(db_session, notifications)
+    db_session.commit()
+    assert result == {"immediate": 3, "digested": 3, "skipped": 3}
+    assert db_session.query(Email).filter(Email.recipient_email == "instant@example.com").count() == 3
+
+    # Buffered items are not due until the next 09:00 slot has passed
+    created_at = db_session.query(EmailDigestItem).first().created_at
+    before_slot = digest_scheduler.latest_slot("daily", "09:00", created_at)
+    assert digest_scheduler.run_due_digests(db_session, now=created_at)["emails"] == 0
+
+    next_slot = before_slot + timedelta(days=1)
+    result = digest_scheduler.run_due_digests(db_session, now=next_slot)
+    assert result == {"users": 1, "items": 3, "emails": 1}
+
+    digest = db_session.query(Email).filter(Email.recipient_email == "daily@example.com").one()
+    assert digest.subject == "Your daily update: 3 notifications"
+    assert "update 2" in digest.text_content
+    assert db_session.query(EmailDigestItem).filter(EmailDigestItem.digest_email_id.is_(None)).count() == 0
+
+
+def test_weekly_slot_falls_on_configured_weekday():
+    from datetime import datetime
+    from src.services.digest_service import digest_scheduler
+
+    wednesday = datetime(2025, 11, 5, 12, 0)
+    slot = digest_scheduler.latest_slot("weekly", "08:30", wednesday)
+    assert slot == datetime(2025, 11, 3, 8, 30)  # previous Monday
+    assert digest_scheduler.latest_slot("immediate", None, wednesday) == wednesday
+
+
+
+def test_queue_monitor_counts_and_publishes_enqueued_emails(db_session, monkeypatch):
+    import asyncio
+    from src.services import email_service as email_service_module
+    from src.services.email_events import EventBus, EmailQueueMonitor
+
+    monitor = EmailQueueMonitor(EventBus())
+    monkeypatch.setattr(email_service_module, "email_queue_monitor", monitor)
+    monitor.load(db_session)
+
+    def enqueue(count):
+        email_service.enqueue_emails(db_session, [
+            {"recipient_email": f"live{i}@example.com", "subject": "Hi", "text_content": "Hi"}
+            for i in range(count)
+        ])
+
+    async def scenario():
+        subscriber = monitor.bus.subscribe()
+        # Nothing is published for a transaction that rolls back, or before it commits
+        enqueue(2)
+        db_session.rollback()
+        enqueue(3)
+        assert subscriber.empty()
+        db_session.commit()
+        monitor.transition("queued", "processing", email_id=1)
+        return [await asyncio.wait_for(subscriber.get(), 1) for _ in range(2)], subscriber.empty()
+
+    (queued, processing), drained = asyncio.run(scenario())
+    assert queued["type"] == "queued" and queued["count"] == 3
+    assert queued["counts"]["queued"] == 3
+    assert processing["counts"] == {"queued": 2, "processing": 1, "completed": 0, "failed": 0}
+    assert drained
+
+
+def test_queue_stream_only_accepts_stream_tokens(db_session):
+    import asyncio
+    import httpx
+    import pytest
+    from fastapi import HTTPException
+    from src.main import app
+    from src.models.user import User
+    from src.routes.email import QUEUE_STREAM_TOKEN_AUDIENCE
+    from src.services.auth import create_access_token, create_scoped_token
+    from src.utils.auth import get_current_user, get_user_from_scoped_token
+
+    admin = User(email="stream-admin@example.com", password_hash="x", first_name="A", last_name="A", phone="1", is_admin=True)
+    db_session.add(admin)
+    db_session.commit()
+    claims = {"sub": admin.email, "user_id": admin.id}
+    stream_token = create_scoped_token(claims, QUEUE_STREAM_TOKEN_AUDIENCE, 60)
+    access_token = create_access_token(claims)
+
+    assert get_user_from_scoped_token(stream_token, QUEUE_STREAM_TOKEN_AUDIENCE, db_session).id == admin.id
+    for check in (
+        lambda: get_current_user(stream_token, db_session),  # not an access token
+        lambda: get_user_from_scoped_token(stream_token, "other-purpose", db_session),
+        lambda: get_user_from_scoped_token(create_scoped_token(claims, QUEUE_STREAM_TOKEN_AUDIENCE, -1), QUEUE_STREAM_TOKEN_AUDIENCE, db_session),
+    ):
+        with pytest.raises(HTTPException) as rejected:
+            check()
+        assert rejected.value.status_code == 401
+
+    async def open_stream():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/api/admin/email-queue/stream", params={"token": access_token})
+
+    assert asyncio.run(open_stream()).status_code == 401
+
+
+def test_stats_rollups_follow_creates_and_transitions(db_session, monkeypatch):
+    import asyncio
+    from src.models.email import EmailStatsRollup
+    from src.services.email_stats_service import email_stats_rollups
+
+    monkeypatch.setattr(email_service.smtp_sender, "send_email", lambda data: data["recipient_email"] != "bad@example.com")
+    email_service.enqueue_emails(db_session, [
+        {"recipient_email": address, "subject": "Hi", "text_content": "Hi", "template_name": "welcome", "company_id": 3}
+        for address in ("a@example.com", "b@example.com", "bad@example.com")
+    ] + [
+        # No company or template: NULL and '' share one rollup row
+        {"recipient_email": "c@example.com", "subject": "Hi", "text_content": "Hi", "template_name": name, "company_id": None}
+        for name in (None, "")
+    ])
+    db_session.commit()
+
+    for email in db_session.query(Email).all():
+        asyncio.run(email_service._send_email_now(db_session, email))
+
+    stats = email_service.get_email_stats(db_session, company_id=3, days=7)
+    assert stats["total_emails"] == 3
+    assert stats["sent_emails"] == 2
+    assert stats["failed_emails"] == 1
+    assert stats["pending_emails"] == 0
+    assert stats["emails_last_24h"] == 3
+    assert stats["popular_templates"] == [{"name": "welcome", "usage_count": 3}]
+    assert email_service.get_email_stats(db_session, company_id=4)["total_emails"] == 0
+
+    # A rebuild from the emails table yields the same rollups
+    incremental = sorted(
+        (r.granularity, r.bucket_start, r.company_id, r.template_name, r.status.value, r.email_count)
+        for r in db_session.query(EmailStatsRollup).filter(EmailStatsRollup.email_count != 0)
+    )
+    email_stats_rollups.rebuild(db_session)
+    rebuilt = sorted(
+        (r.granularity, r.bucket_start, r.company_id, r.template_name, r.status.value, r.email_count)
+        for r in db_session.query(EmailStatsRollup)
+    )
+    assert rebuilt == incremental
@@ -0,0 +1,26 @@
+import httpx
+import pytest
+
+from src.main import app
+from src.schemas import JobRead
+
+
+@pytest.mark.asyncio
+async def test_list_endpoints_write_rows_as_json(seed_company):
+    own = seed_company()
+    seed_company()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/api/jobs/", params={"company_id": own["company_id"]})
+        assert resp.status_code == 200
+        jobs = [JobRead.model_validate(job) for job in resp.json()]  # same shape as response_model
+        assert {job.id for job in jobs} == {own["job_id"], own["spare_job_id"]}
+        assert all(job.company.startswith("Tenant ") for job in jobs)
+
+        resp = await client.get("/api/admin/users", headers=own["headers"])
+        users = {user["id"]: user for user in resp.json()}
+        assert len(users) == 2
+        assert users[own["user_id"]]["application_count"] == 1
+        assert users[own["user_id"]]["latest_application"] is not None
+        assert users[own["user_id"]]["full_name"].startswith("User ")
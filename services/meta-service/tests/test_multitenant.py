@@ -0,0 +1,205 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from src.config.database import SessionLocal, engine
+from src.main import app
+from src.models import Application, ApplicationStatusChange, Job
+from src.models.email import Email, EmailTemplate
+from src.services.application_status_service import application_status_service
+from src.utils.multitenant import TenantLoader, set_tenant_context
+
+
+def test_tenant_session_scopes_queries_and_bulk_writes(tenant_db, seed_company):
+    own = seed_company()
+    other = seed_company()
+
+    db = set_tenant_context(SessionLocal(), own["company_id"])
+    try:
+        assert {job.company_id for job in db.query(Job)} == {own["company_id"]}
+        assert db.get(Job, other["job_id"]) is None
+        assert db.query(Application).join(Job).count() == 1
+        updated = db.query(Job).filter(Job.id.in_([own["job_id"], other["job_id"]])).update(
+            {Job.is_active: False}, synchronize_session=False
+        )
+        db.commit()
+        assert updated == 1
+    finally:
+        db.close()
+
+    assert tenant_db.get(Job, other["job_id"]).is_active
+
+
+def test_tenant_loader_batches_and_memoizes(seed_company):
+    own = seed_company()
+    other = seed_company()
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    db = SessionLocal()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        loader = TenantLoader(db, own["company_id"], user_is_admin=True)
+        loader.prime(Job, [own["job_id"], other["job_id"]])
+        jobs = loader.load_many(Job, [own["job_id"], own["spare_job_id"], other["job_id"]])
+        assert set(jobs) == {own["job_id"], own["spare_job_id"]}
+        assert len(statements) == 1
+
+        assert loader.get_or_404(Job, own["job_id"]) is jobs[own["job_id"]]
+        with pytest.raises(HTTPException) as missing:
+            loader.get_or_404(Job, other["job_id"])
+        assert missing.value.status_code == 404
+        assert len(statements) == 1  # hits and misses are memoized
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+        db.close()
+
+
+@pytest.mark.asyncio
+async def test_admin_routes_cannot_reach_other_companies(tenant_db, seed_company):
+    own = seed_company()
+    other = seed_company()
+    headers = own["headers"]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.delete(f"/api/admin/jobs/{other['spare_job_id']}", headers=headers)
+        assert resp.status_code == 404
+        resp = await client.patch(f"/api/admin/jobs/{other['job_id']}/status", json={"is_active": False}, headers=headers)
+        assert resp.status_code == 404
+        resp = await client.get(f"/api/admin/users/{other['user_id']}", headers=headers)
+        assert resp.status_code == 404
+
+        resp = await client.get("/api/admin/jobs/analytics", headers=headers)
+        assert resp.status_code == 200
+        analytics = resp.json()
+        assert analytics["total_jobs"] == 2
+        assert {job["id"] for job in analytics["top_jobs"]} == {own["job_id"], own["spare_job_id"]}
+
+        resp = await client.get("/api/admin/stats", headers=headers)
+        assert resp.json()["total_applications"] == 1
+
+        resp = await client.get("/api/admin/applications", headers=headers)
+        assert [app["user"]["id"] for app in resp.json()] == [own["user_id"]]
+        resp = await client.get("/api/admin/jobs", headers=headers)
+        assert {job["id"]: job["application_count"] for job in resp.json()} == {own["job_id"]: 1, own["spare_job_id"]: 0}
+
+        resp = await client.delete(f"/api/admin/jobs/{own['spare_job_id']}", headers=headers)
+        assert resp.status_code == 200
+
+    tenant_db.expire_all()
+    assert tenant_db.get(Job, other["spare_job_id"]) is not None
+    assert tenant_db.get(Job, other["job_id"]).is_active
+
+
+@pytest.mark.asyncio
+async def test_bulk_status_update_validates_transitions(tenant_db, seed_company):
+    own = seed_company()
+    other = seed_company()
+    closed = Application(user_id=own["user_id"], job_id=own["spare_job_id"], company_id=own["company_id"],
+                         cover_letter="c", status="accepted")
+    template = EmailTemplate(name="application_status_update", display_name="Status",
+                             subject_template="{{ job_title }}: {{ new_status }}", text_content="{{ user_name }}")
+    tenant_db.add_all([closed, template])
+    tenant_db.commit()
+    own_app = tenant_db.query(Application.id).filter(Application.job_id == own["job_id"]).scalar()
+    other_app = tenant_db.query(Application.id).filter(Application.job_id == other["job_id"]).scalar()
+
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.patch("/api/admin/applications/status", headers=own["headers"], json={
+                "status": "in_review", "application_ids": [own_app, closed.id, other_app]
+            })
+            assert resp.status_code == 200
+            body = resp.json()
+            assert [result["result"] for result in body["results"]] == ["updated", "invalid_transition", "not_found"]
+            assert body["notifications"]["immediate"] == 1
+
+            resp = await client.patch("/api/admin/applications/status", headers=own["headers"], json={
+                "status": "interview", "filter": {"status": "in_review"}, "notify": False
+            })
+            assert resp.json()["counts"] == {"updated": 1}
+
+            resp = await client.patch("/api/admin/applications/status", headers=own["headers"], json={"status": "hired", "application_ids": [own_app]})
+            assert resp.status_code == 400
+
+            # The single-application endpoint follows the same transition rules
+            resp = await client.patch(f"/api/admin/applications/{closed.id}/status", json={"status": "submitted"}, headers=own["headers"])
+            assert resp.status_code == 400
+            resp = await client.patch(f"/api/admin/applications/{other_app}/status", json={"status": "in_review"}, headers=own["headers"])
+            assert resp.status_code == 404
+
+        tenant_db.expire_all()
+        assert tenant_db.get(Application, own_app).status == "interview"
+        assert tenant_db.get(Application, other_app).status == "submitted"
+        assert tenant_db.get(Application, closed.id).status == "accepted"
+        assert tenant_db.query(ApplicationStatusChange).filter(ApplicationStatusChange.application_id == closed.id).count() == 0
+        assert tenant_db.query(Email).filter(Email.application_id == own_app).count() == 1
+    finally:
+        tenant_db.delete(template)
+        tenant_db.commit()
+
+
+def test_bulk_status_update_skips_rows_changed_after_select(tenant_db, seed_company):
+    own = seed_company()
+    application_id = tenant_db.query(Application.id).filter(Application.job_id == own["job_id"]).scalar()
+
+    moved = []
+
+    def concurrent_review(conn, cursor, statement, *args):
+        # Another request moves the application on between the SELECT and the UPDATE
+        if statement.startswith("UPDATE applications") and not moved:
+            moved.append(application_id)
+            conn.connection.dbapi_connection.execute(
+                "UPDATE applications SET status = 'in_review' WHERE id = ?", (application_id,)
+            )
+
+    event.listen(engine, "before_cursor_execute", concurrent_review)
+    try:
+        (result,) = application_status_service.bulk_update(
+            tenant_db, None, "interview", application_ids=[application_id], notify=False
+        )["results"]
+    finally:
+        event.remove(engine, "before_cursor_execute", concurrent_review)
+
+    # in_review -> interview is allowed too, but the change read as submitted -> interview is not logged
+    assert result["result"] == "conflict"
+    assert tenant_db.query(ApplicationStatusChange).filter(ApplicationStatusChange.application_id == application_id).count() == 0
+
+
+@pytest.mark.asyncio
+async def test_apply_accepts_one_of_concurrent_duplicates(tenant_db, seed_company):
+    own = seed_company()
+    other = seed_company()
+    template = EmailTemplate(name="job_application_confirmation", display_name="Confirmation",
+                             subject_template="Applied: {{ job_title }}", text_content="{{ user_name }}")
+    tenant_db.add(template)
+    tenant_db.commit()
+    body = {"job_id": own["spare_job_id"], "cover_letter": "c", "additional_info": None}
+
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            responses = await asyncio.gather(*(
+                client.post("/api/applications/", json=body, headers=own["user_headers"]) for _ in range(5)
+            ))
+            assert sorted(resp.status_code for resp in responses) == [200, 400, 400, 400, 400]
+            created = next(resp.json() for resp in responses if resp.status_code == 200)
+            assert created["status"] == "submitted"
+
+            resp = await client.post("/api/applications/", json={**body, "job_id": other["spare_job_id"]},
+                                     headers=own["user_headers"])
+            assert resp.status_code == 404
+
+        assert tenant_db.query(Application).filter(Application.job_id == own["spare_job_id"]).count() == 1
+        email = tenant_db.query(Email).filter(Email.application_id == created["id"]).one()
+        assert email.subject == "Applied: Designer"
+    finally:
+        tenant_db.delete(template)
+        tenant_db.commit()
@@ -0,0 +1,65 @@
+import httpx
+import pytest
+from sqlalchemy import event
+
+from src.config.database import engine
+from src.main import app
+from src.models import Application
+from src.services.my_applications_service import MyApplicationsConfig, MyApplicationsService
+
+
+@pytest.mark.asyncio
+async def test_my_applications_joined_paginated_and_invalidated(tenant_db, seed_company):
+    own = seed_company()
+    tenant_db.add(Application(user_id=own["user_id"], job_id=own["spare_job_id"], company_id=own["company_id"], cover_letter="c"))
+    tenant_db.commit()
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        if "FROM applications" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.get("/api/applications/me", params={"limit": 1}, headers=own["user_headers"])
+            assert resp.status_code == 200
+            assert resp.headers["x-total-count"] == "2"
+            (first,) = resp.json()
+            assert first["job"]["company"].startswith("Tenant ")
+            assert len(statements) == 1  # applications, jobs and companies in one query
+
+            resp = await client.get("/api/applications/me", params={"limit": 1}, headers=own["user_headers"])
+            assert resp.json() == [first]
+            assert len(statements) == 1  # served from the cache
+
+            resp = await client.patch(f"/api/admin/applications/{first['id']}/status", json={"status": "interview"},
+                                      headers=own["headers"])
+            assert resp.status_code == 200
+            resp = await client.get("/api/applications/me", params={"limit": 1}, headers=own["user_headers"])
+            assert resp.json()[0]["status"] == "interview"
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+
+def test_my_applications_cache_stays_bounded(monkeypatch):
+    monkeypatch.setattr(MyApplicationsConfig, "CACHE_USERS", 2)
+    service = MyApplicationsService()
+    reads = []
+
+    def query_page(db, user_id, limit, offset):
+        reads.append(user_id)
+        if user_id == 4:
+            service.invalidate([4])  # changed while its page was being read
+        return b"[]", 0
+
+    monkeypatch.setattr(service, "_query_page", query_page)
+    for user_id in (1, 2, 3):
+        service.get_page(None, user_id, None, 10, 0)
+    service.invalidate([1, 2, 3, 5])
+    assert len(service._users) == 2  # invalidation keeps no per-user entries beyond the cache
+
+    service.get_page(None, 4, None, 10, 0)
+    service.get_page(None, 4, None, 10, 0)
+    assert reads == [1, 2, 3, 4, 4]  # a page read before an invalidation is not cached
@@ -0,0 +1,138 @@
+import logging
+
+import httpx
+import pytest
+from fastapi import FastAPI, Depends
+from sqlalchemy import text
+
+from src.utils.query_stats import (
+    install_query_hooks, QueryStatsMiddleware, QueryStatsConfig, route_query_stats
+)
+
+
+@pytest.mark.asyncio
+async def test_query_stats_header_route_aggregates_and_slow_log(db_session, monkeypatch, caplog):
+    install_query_hooks(db_session.get_bind())
+    route_query_stats.reset()
+
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    def get_session():
+        yield db_session
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int, db=Depends(get_session)):
+        for _ in range(3):
+            db.execute(text("SELECT 1")).all()
+        return {"id": item_id}
+
+    monkeypatch.setattr(QueryStatsConfig, "SLOW_QUERY_THRESHOLD_MS", 0)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        with caplog.at_level(logging.WARNING, logger="src.utils.query_stats"):
+            response = await client.get("/items/1")
+        await client.get("/items/2")
+
+    assert response.status_code == 200
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert 'desc="3 queries"' in response.headers["server-timing"]
+    assert "Slow query" in caplog.text and "GET /items/{item_id}" in caplog.text
+
+    route = route_query_stats.snapshot()["GET /items/{item_id}"]
+    assert route["requests"] == 2
+    assert route["queries"] == 6
+    assert route["slowest_statement"] == "SELECT 1"
+
+
+@pytest.mark.asyncio
+async def test_metrics_middleware_records_route_template_and_status_class():
+    from src.utils.metrics import MetricsMiddleware, registry
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/widgets/{widget_id}")
+    def read_widget(widget_id: int):
+        return {"id": widget_id}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        await client.get("/widgets/1")
+        await client.get("/widgets/2")
+        await client.get("/widgets/not-a-number")
+
+    exposition = registry.render()
+    assert 'http_requests_total{method="GET",route="/widgets/{widget_id}",status="2xx"} 2' in exposition
+    assert 'http_requests_total{method="GET",route="/widgets/{widget_id}",status="4xx"} 1' in exposition
+    assert 'http_request_duration_seconds_count{method="GET",route="/widgets/{widget_id}"} 3' in exposition
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/widgets/{widget_id}",le="+Inf"} 3' in exposition
+
+
+def test_readiness_downgrades_email_checks_unless_worker_runs_here(monkeypatch):
+    from src.services.email_service import EmailConfig, email_service
+    from src.services.health_service import HealthChecker, HealthConfig
+
+    checker = HealthChecker()
+    monkeypatch.setattr(checker, "check_database", lambda: {"healthy": True, "latency_ms": 1.0})
+    monkeypatch.setattr(checker, "check_upload_disk", lambda: {"healthy": True, "free_mb": 1024, "writable": True})
+    monkeypatch.setattr(checker, "check_email_queue", lambda: {"healthy": True, "lag_seconds": 0})
+    monkeypatch.setattr(email_service.smtp_sender, "consecutive_failures", HealthConfig.SMTP_MAX_CONSECUTIVE_FAILURES)
+
+    monkeypatch.setattr(EmailConfig, "WORKER_ENABLED", False)
+    result = checker.run_checks()
+    assert result["status"] == "ready"
+    assert result["checks"]["smtp"]["status"] == "warn"
+
+    monkeypatch.setattr(EmailConfig, "WORKER_ENABLED", True)
+    result = checker.run_checks()
+    assert result["status"] == "unready"
+    assert result["checks"]["smtp"]["status"] == "fail"
+
+    monkeypatch.setattr(checker, "check_database", lambda: 1 / 0)
+    assert checker.run_checks()["checks"]["database"]["status"] == "fail"
+
+
+def _spin(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampling_profiler_collapses_busy_thread_stacks():
+    import threading
+    from src.utils.profiler import start_profiler, finish_profiler, get_profile
+
+    stop = threading.Event()
+    worker = threading.Thread(target=_spin, args=(stop,), name="busy-worker")
+    worker.start()
+    profiler = start_profiler(interval_ms=2)
+    assert start_profiler() is None  # one profile at a time
+    try:
+        stop.wait(0.2)
+    finally:
+        profile_id = finish_profiler(profiler)
+        stop.set()
+        worker.join()
+
+    lines = get_profile(profile_id).splitlines()
+    busy = [line for line in lines if line.startswith("busy-worker;")]
+    assert busy and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("test_observability.py:_spin" in line for line in busy)
+
+
+@pytest.mark.asyncio
+async def test_profile_header_requires_token(monkeypatch):
+    from src.utils.profiler import ProfilerConfig, ProfilingMiddleware, get_profile
+
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+
+    @app.get("/slow")
+    def slow():
+        return {"ok": True}
+
+    monkeypatch.setattr(ProfilerConfig, "HEADER_TOKEN", "s3cret")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        ignored = await client.get("/slow", headers={"X-Profile": "wrong"})
+        profiled = await client.get("/slow", headers={"X-Profile": "s3cret"})
+
+    assert "x-profile-id" not in ignored.headers
+    assert get_profile(profiled.headers["x-profile-id"]) is not None
@@ -0,0 +1,125 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Schema of databases created before Alembic, frozen at the baseline revision
+BASELINE_SCHEMA = Path(__file__).parent / "fixtures" / "baseline_schema.sql"
+
+# Cold-start budget for `import src.main`; override on slow CI machines
+IMPORT_BUDGET_SECONDS = float(os.getenv("IMPORT_BUDGET_SECONDS", "3.0"))
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import src.main
+elapsed = time.perf_counter() - start
+from src.services.email_service import email_service
+from src.services.file_upload_service import file_upload_service
+print(json.dumps({
+    "seconds": elapsed,
+    "jinja2_loaded": "jinja2" in sys.modules,
+    "email_initialized": "template_engine" in vars(email_service) or "smtp_sender" in vars(email_service),
+    "uploads_initialized": "storage_manager" in vars(file_upload_service),
+}))
+"""
+
+
+def test_app_import_is_cheap(tmp_path):
+    database_file = tmp_path / "import.db"
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{database_file}"}
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE], cwd=SERVICE_DIR, env=env,
+        capture_output=True, text=True, check=True
+    )
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+
+    # Importing must not create the database, the upload tree or the email subsystem
+    assert not database_file.exists()
+    assert not probe["jinja2_loaded"]
+    assert not probe["email_initialized"]
+    assert not probe["uploads_initialized"]
+    assert probe["seconds"] < IMPORT_BUDGET_SECONDS, f"import src.main took {probe['seconds']:.2f}s"
+
+
+def test_init_db_migrates_legacy_database(tmp_path, monkeypatch):
+    from sqlalchemy import create_engine, text
+
+    from src.config.database import Base, init_db
+    from src.utils.backfill import BackfillConfig
+
+    # A pre-Alembic database: the frozen baseline schema (not today's models),
+    # with duplicate applications and tenant ids unset
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        connection.connection.executescript(BASELINE_SCHEMA.read_text())
+        connection.exec_driver_sql("INSERT INTO companies (id, name, slug, is_active) VALUES (7, 'Acme', 'acme', 1)")
+        connection.exec_driver_sql(
+            "INSERT INTO users (id, email, password_hash, first_name, last_name, phone, is_admin, is_active) "
+            "VALUES (1, 'admin@example.com', 'x', 'A', 'A', '1', 1, 1), (2, 'user@example.com', 'x', 'U', 'U', '1', 0, 1)"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO jobs (id, company_id, title, location, job_type, description, is_active) "
+            "VALUES (1, 7, 'Engineer', 'Remote', 'Full-time', 'd', 1), (2, NULL, 'Designer', 'Remote', 'Full-time', 'd', 1)"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO applications (id, user_id, job_id, cover_letter, status) "
+            "VALUES (1, 2, 1, 'c', 'submitted'), (2, 2, 2, 'c', 'submitted'), (3, 2, 1, 'c', 'submitted')"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO emails (id, recipient_email, sender_email, subject, text_content, template_name, status, priority, retry_count, max_retries, tracking_enabled, application_id) "
+            "VALUES (1, 'user@example.com', 'noreply@example.com', 's', 't', 'welcome', 'SENT', 'NORMAL', 0, 3, 0, 3), "
+            "(2, 'user@example.com', 'noreply@example.com', 's', 't', NULL, 'SENT', 'NORMAL', 0, 3, 0, NULL), "
+            "(3, 'user@example.com', 'noreply@example.com', 's', 't', '', 'SENT', 'NORMAL', 0, 3, 0, NULL)"
+        )
+
+    # One row per batch, so the backfill runs as several committed batches
+    monkeypatch.setattr(BackfillConfig, "BATCH_SIZE", 1)
+    monkeypatch.setattr(BackfillConfig, "PAUSE_MS", 0)
+    init_db(engine)
+
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT version_num FROM alembic_version")).scalar() == "0009"
+        default_id = connection.execute(text("SELECT id FROM companies WHERE slug = 'default'")).scalar()
+        assert connection.execute(text("SELECT admin_user_id FROM companies WHERE id = :id"), {"id": default_id}).scalar() == 1
+        assert connection.execute(text("SELECT id, company_id FROM users ORDER BY id")).all() == [(1, default_id), (2, default_id)]
+        assert connection.execute(text("SELECT id, company_id FROM jobs ORDER BY id")).all() == [(1, 7), (2, default_id)]
+        # Applications follow their job's company; the duplicate is merged into the first one
+        assert connection.execute(text("SELECT id, company_id FROM applications ORDER BY id")).all() == [(1, 7), (2, default_id)]
+        assert connection.execute(text("SELECT application_id FROM emails WHERE id = 1")).scalar() == 1
+        assert connection.execute(text("SELECT remote_options FROM jobs WHERE id = 1")).scalar() == "On-site"
+        # Existing emails are counted in the statistics rollups, added up
+        # across batches (NULL and '' templates share a row)
+        assert connection.execute(text(
+            "SELECT template_name, status, email_count FROM email_stats_rollups "
+            "WHERE granularity = 'day' ORDER BY template_name"
+        )).all() == [("", "SENT", 2), ("welcome", "SENT", 1)]
+
+    # Every table, column, index and foreign key of the models exists after the upgrade
+    fresh = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    Base.metadata.create_all(bind=fresh)
+    migrated, expected = _schema(engine), _schema(fresh)
+    assert migrated.keys() == expected.keys()
+    for table, parts in expected.items():
+        assert migrated[table] == parts, table
+    engine.dispose()
+    fresh.dispose()
+
+
+def _schema(engine):
+    """Column, index and foreign key names per table (alembic_version left out)"""
+    from sqlalchemy import inspect
+
+    inspector = inspect(engine)
+    return {
+        table: (
+            {column["name"] for column in inspector.get_columns(table)},
+            {index["name"] for index in inspector.get_indexes(table)},
+            {(tuple(key["constrained_columns"]), key["referred_table"]) for key in inspector.get_foreign_keys(table)},
+        )
+        for table in inspector.get_table_names()
+        if table != "alembic_version"
+    }